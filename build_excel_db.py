@@ -23,11 +23,11 @@ def main(voice_file_names_path: Path, excel_input_path: Path, repl_input_dir: Pa
         repl_file = repl_input_dir / jsonfile.name
         if repl_file.exists():
             if cfg.get("applyvoicecn", False):
-                out_file = apply_replacements(jsonfile, repl_file)
+                out_file = apply_replacements(jsonfile, repl_file, record_type=packer.record_type(jsonfile.stem))
                 if jsonfile.stem not in ["ScenarioScriptExcel", "VoiceExcel"]:
                     packer.repackjson2db(out_file, output_filepath)
             else:
-                out_file = apply_replacements(jsonfile, repl_file, skip_fields=["VoiceId"])
+                out_file = apply_replacements(jsonfile, repl_file, skip_fields=["VoiceId"], record_type=packer.record_type(jsonfile.stem))
                 packer.repackjson2db(out_file, output_filepath)
     if cfg.get("applyvoicecn", False):
         temp_dir = source_dir / "temp"
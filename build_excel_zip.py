@@ -7,6 +7,7 @@ from zipfile import ZipFile
 from extractor import TablesExtractor
 from repacker import TableRepackerImpl
 from lib.encryption import zip_password
+from lib.structure import Record, record_to_json, to_records
 import shutil
 from collections import defaultdict
 
@@ -15,9 +16,12 @@ def normalize(s):
         return s.replace("‘", "'").replace("’", "'").replace("“", '"').replace("”", '"')
     return s
 
-def apply_replacements(input_filepath: Path, replacements_filepath: Path, skip_fields=[]) -> Path:
+def apply_replacements(input_filepath: Path, replacements_filepath: Path, skip_fields=[], record_type: type[Record] | None = None) -> Path:
     with open(input_filepath, "r", encoding="utf8") as inp_f:
         data = json.loads(inp_f.read())
+    if record_type is not None:
+        # Rows are held as records while replacing, which takes far less memory than dicts.
+        to_records(data, record_type)
     with open(replacements_filepath, "r", encoding="utf8") as repl_f:
         replacements = json.loads(repl_f.read())
     print(f"loading replacements from {replacements_filepath}")
@@ -69,7 +73,7 @@ def apply_replacements(input_filepath: Path, replacements_filepath: Path, skip_f
     out_path.parent.mkdir(parents=True, exist_ok=True)
         
     with open(out_path, "wb") as out_f:
-        out_f.write(json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode())
+        out_f.write(json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=record_to_json).encode())
         return out_path
 
 
@@ -95,7 +99,7 @@ def main(excel_input_path: Path, repl_input_dir: Path, output_filepath: Path) ->
             target_file = temp_extract_path / f"{file.stem.lower()}.bytes"
             repl_file = repl_input_dir / file.name
             if repl_file.exists():
-                out_file = apply_replacements(file, repl_file)
+                out_file = apply_replacements(file, repl_file, record_type=packer.record_type(file.stem))
                 new_content = packer.repackExcelZipJson(out_file)
                 if out_file.exists():
                     out_file.unlink()
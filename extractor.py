@@ -6,14 +6,19 @@ import os
 import time
 from multiprocessing import Queue, freeze_support
 from os import path
+from typing import Iterable
 
-from lib.compiler import CompileToPython, CSParser
+from lib.compiler import CompileToPython, CSParser, prune_types
+from lib.metadata import MetadataParser, is_metadata
+from lib.schema import SCHEMA_FILE, write_schema
+from lib.structure import FlatDataTypes
 from lib.console import ProgressBar, bar_increase, bar_text, notice
 from utils.util import TaskManager
 from xtractor.bundle import BundleExtractor
 from xtractor.table import TableExtractor
 import importlib
-from lib.encryption import xor_with_key
+import io
+from lib.encryption import KEY_STORE_FILE, XorStream, load_key_store, preload_struct_keys, write_key_store
 from utils.config import Config
 
 class BundlesExtractor:
@@ -46,13 +51,15 @@ class BundlesExtractor:
                     p.kill()
 
 class TablesExtractor(TableExtractor):
-    def __init__(self, EXTRACT_DIR, TABLE_FOLDER) -> None:
+    def __init__(self, EXTRACT_DIR, TABLE_FOLDER, STREAM_JSON: bool = False) -> None:
+        """STREAM_JSON writes table JSON straight from the schema IR, see TableExtractor."""
         self.TABLE_FOLDER = TABLE_FOLDER
         self.TABLE_EXTRACT_FOLDER = path.join(EXTRACT_DIR, "Table")
         super().__init__(
             self.TABLE_FOLDER,
             self.TABLE_EXTRACT_FOLDER,
             f"{EXTRACT_DIR}.FlatData",
+            STREAM_JSON,
         )
 
     def __extract_worker(self, task_manager: TaskManager) -> None:
@@ -79,20 +86,59 @@ class TablesExtractor(TableExtractor):
                 e_task.import_tasks(table_files)
                 e_task.run(e_task)
 
-def compile_python(DUMP_CS_FILE_PATH, EXTRACT_DIR) -> None:
-    """Compile python callable module from dump file"""
+def create_parser(DUMP_CS_FILE_PATH) -> CSParser:
+    """Parse FlatData types from a dump.cs, or from a global-metadata.dat without dumping il2cpp."""
+    if is_metadata(DUMP_CS_FILE_PATH):
+        print("Parsing global-metadata.dat...")
+        return MetadataParser(DUMP_CS_FILE_PATH)
     print("Parsing dump.cs...")
-    parser = CSParser(DUMP_CS_FILE_PATH)
+    return CSParser(DUMP_CS_FILE_PATH, os.cpu_count() or 1)
+
+def compile_python(DUMP_CS_FILE_PATH, EXTRACT_DIR, KEY_PREFIX_SIZES: dict[str, int] | None = None, TYPES_PER_MODULE: int = 1, DIRECT_DECODERS: bool = False, DIRECT_PACKERS: bool = False, ROOT_TABLES: Iterable[str] | None = None, RECORD_CLASSES: bool = False) -> None:
+    """Compile python callable module from dump file, or straight from global-metadata.dat.
+
+    The metadata does not describe the Nullable<T> types of nested table fields,
+    which are then left out, so a dump.cs gives the complete schema.
+
+    KEY_PREFIX_SIZES optionally maps table names, usually the largest ones, to the
+    keystream prefix length to precompute into the key store. TYPES_PER_MODULE above
+    1 consolidates the types into that many per module instead of one file each.
+    DIRECT_DECODERS generates a dump wrapper decoding the FlatBuffer bytes itself,
+    and DIRECT_PACKERS a repack wrapper writing them itself. The schema IR read by
+    SchemaCodec is written next to the manifest. ROOT_TABLES, names or glob patterns
+    like EXCEL_ROOTS, limits generation to those structs and the types they refer to.
+    RECORD_CLASSES makes dumps return slotted records instead of dicts.
+    """
+    parser = create_parser(DUMP_CS_FILE_PATH)
     enums = parser.parse_enum()
     structs = parser.parse_struct()
+    if ROOT_TABLES is not None:
+        enums, structs = prune_types(enums, structs, ROOT_TABLES)
+        print(f"Kept {len(enums)} enums and {len(structs)} structs reachable from root tables.")
     
     print("Generating flatbuffer python dump files...")
-    compiler = CompileToPython(enums, structs, path.join(EXTRACT_DIR, "FlatData"))
-    compiler.create_enum_files()
-    compiler.create_struct_files()
-    compiler.create_module_file()
-    compiler.create_dump_dict_file()
-    compiler.create_repack_dict_file()
+    compiler = CompileToPython(enums, structs, path.join(EXTRACT_DIR, "FlatData"), TYPES_PER_MODULE, DIRECT_DECODERS, DIRECT_PACKERS, RECORD_CLASSES)
+    compiler.create_files(os.cpu_count() or 1)
+    compiler.remove_stale_files()
+    compiler.report_schema_diff()
+    compiler.write_manifest()
+    write_schema(path.join(EXTRACT_DIR, "FlatData", SCHEMA_FILE), enums, structs)
+
+    print("Writing key store...")
+    write_key_store(
+        path.join(EXTRACT_DIR, "FlatData", KEY_STORE_FILE),
+        (struct.name for struct in structs),
+        prefix_sizes=KEY_PREFIX_SIZES,
+    )
+
+def compile_schema(DUMP_CS_FILE_PATH, SCHEMA_FILE_PATH, ROOT_TABLES: Iterable[str] | None = None) -> None:
+    """Parse dump file, or global-metadata.dat, into the schema IR only, for a SchemaCodec without generated code."""
+    parser = create_parser(DUMP_CS_FILE_PATH)
+    enums = parser.parse_enum()
+    structs = parser.parse_struct()
+    if ROOT_TABLES is not None:
+        enums, structs = prune_types(enums, structs, ROOT_TABLES)
+    write_schema(SCHEMA_FILE_PATH, enums, structs)
 class TableExtractorImpl:
     def __init__(self, flat_data_module_name):
         try:
@@ -100,10 +146,9 @@ class TableExtractorImpl:
             self.dump_wrapper_lib = importlib.import_module(
                 f"{flat_data_module_name}.dump_wrapper"
             )
-            self.lower_fb_name_modules = {
-            t_name.lower(): t_class
-            for t_name, t_class in flat_data_lib.__dict__.items()
-            }
+            self.lower_fb_name_modules = FlatDataTypes(flat_data_lib)
+            if not load_key_store(path.join(path.dirname(flat_data_lib.__file__), KEY_STORE_FILE)):
+                preload_struct_keys(self.lower_fb_name_modules.structs)
         except Exception as e:
             notice(
                 f"Cannot import FlatData module. Make sure FlatData is available in Extracted folder. {e}",
@@ -117,22 +162,27 @@ class TableExtractorImpl:
         ):
             print(f"class {file_path.stem.lower()} not found")
             return
+        is_table = flatbuffer_class.__name__.endswith("Table")
         with open(file_path, 'rb') as f:
-            data = f.read()
+            data = bytearray(os.fstat(f.fileno()).st_size)
+            if is_table and not Config.is_cn: # CN does not encrypt its Excel.zip (but does encrypt tables in sqlite3 databases such as ExcelDB.db)
+                io.BufferedReader(XorStream(flatbuffer_class.__name__, f)).readinto(data)
+            else:
+                f.readinto(data)
         obj = None
         try:
-            if flatbuffer_class.__name__.endswith("Table"):
+            if is_table:
                 try:
-                    if not Config.is_cn: # CN does not encrypt its Excel.zip (but does encrypt tables in sqlite3 databases such as ExcelDB.db)
-                        data = xor_with_key(flatbuffer_class.__name__, data)
                     flat_buffer = getattr(flatbuffer_class, "GetRootAs")(data)
                     obj = getattr(self.dump_wrapper_lib, "dump_table")(flat_buffer)
                 except Exception as e:
                     pass
             if not obj:
                 flat_buffer = getattr(flatbuffer_class, "GetRootAs")(data)
-                obj = getattr(
-                    self.dump_wrapper_lib, f"dump_{flatbuffer_class.__name__}"
+                # Dumped without password, so by the plain variant when the wrapper has one.
+                obj = (
+                    getattr(self.dump_wrapper_lib, f"dump_{flatbuffer_class.__name__}_plain", None)
+                    or getattr(self.dump_wrapper_lib, f"dump_{flatbuffer_class.__name__}")
                 )(flat_buffer)
             return obj
         except Exception as e:
@@ -0,0 +1,198 @@
+"""Accessors shared by the generated FlatData classes.
+
+A generated class declares each field with one of the factories below,
+configured with the vtable offset of the field, the kind of value and the size
+of its items, instead of carrying its own copy of the same method bodies. The
+functions they make read and build buffers exactly like the methods flatc
+generates, under the same names.
+"""
+
+from importlib import import_module
+from typing import Callable
+
+import flatbuffers
+from flatbuffers import number_types
+
+
+class FlatBufferTable:
+    """Base of the generated FlatData classes."""
+
+    __slots__ = ("_tab",)
+
+    @classmethod
+    def GetRootAs(cls, buf, offset=0):
+        n = flatbuffers.encode.Get(flatbuffers.packer.uoffset, buf, offset)
+        x = cls()
+        x.Init(buf, n + offset)
+        return x
+
+    def Init(self, buf, pos):
+        self._tab = flatbuffers.table.Table(buf, pos)
+
+
+def _flags(flag: str):
+    return getattr(number_types, f"{flag}Flags")
+
+
+def _type_loader(type_name: str) -> Callable[[type], type]:
+    """Look up a referred type in the package of the owning class, on first use.
+
+    The lookup goes through the package so its registry caches the type there.
+    Importing the type module itself would instead bind that module to the
+    type name in the package, hiding the type from every later lookup. Going
+    through the package also finds types sharing a consolidated module.
+    """
+    loaded = None
+
+    def load(owner: type) -> type:
+        nonlocal loaded
+        if loaded is None:
+            package = owner.__module__.rpartition(".")[0]
+            loaded = getattr(import_module(package), type_name)
+        return loaded
+
+    return load
+
+
+def _length(offset: int):
+    def length(self):
+        o = self._tab.Offset(offset)
+        if o != 0:
+            return self._tab.VectorLen(o)
+        return 0
+
+    return length
+
+
+def _is_none(offset: int):
+    def is_none(self):
+        return self._tab.Offset(offset) == 0
+
+    return is_none
+
+
+def scalar(offset: int, flag: str):
+    """Getter of a scalar or enum field."""
+    flags = _flags(flag)
+
+    def getter(self):
+        o = self._tab.Offset(offset)
+        if o != 0:
+            return self._tab.Get(flags, o + self._tab.Pos)
+        return 0
+
+    return getter
+
+
+def scalar_list(offset: int, flag: str, size: int) -> tuple:
+    """Item getter, NumPy view, length and absence of a list of scalars or enums."""
+    flags = _flags(flag)
+
+    def item(self, j):
+        o = self._tab.Offset(offset)
+        if o != 0:
+            return self._tab.Get(flags, self._tab.Vector(o) + j * size)
+        return 0
+
+    def as_numpy(self):
+        o = self._tab.Offset(offset)
+        if o != 0:
+            return self._tab.GetVectorAsNumpy(flags, o)
+        return 0
+
+    return item, as_numpy, _length(offset), _is_none(offset)
+
+
+def string(offset: int):
+    """Getter of a string field, as its raw bytes."""
+
+    def getter(self):
+        o = self._tab.Offset(offset)
+        if o != 0:
+            return self._tab.String(o + self._tab.Pos)
+        return None
+
+    return getter
+
+
+def string_list(offset: int) -> tuple:
+    """Item getter, length and absence of a list of strings."""
+
+    def item(self, j):
+        o = self._tab.Offset(offset)
+        if o != 0:
+            return self._tab.String(self._tab.Vector(o) + j * 4)
+        return ""
+
+    return item, _length(offset), _is_none(offset)
+
+
+def table(offset: int, type_name: str):
+    """Getter of a table referred by a field."""
+    load = _type_loader(type_name)
+
+    def getter(self):
+        o = self._tab.Offset(offset)
+        if o != 0:
+            obj = load(type(self))()
+            obj.Init(self._tab.Bytes, self._tab.Indirect(o + self._tab.Pos))
+            return obj
+        return None
+
+    return getter
+
+
+def inline(offset: int, type_name: str):
+    """Getter of a field of a type not generated, read in place."""
+    load = _type_loader(type_name)
+
+    def getter(self):
+        o = self._tab.Offset(offset)
+        if o != 0:
+            obj = load(type(self))()
+            obj.Init(self._tab.Bytes, o + self._tab.Pos)
+            return obj
+        return None
+
+    return getter
+
+
+def table_list(offset: int, size: int, type_name: str) -> tuple:
+    """Item getter, length and absence of a list of tables."""
+    load = _type_loader(type_name)
+
+    def item(self, j):
+        o = self._tab.Offset(offset)
+        if o != 0:
+            obj = load(type(self))()
+            obj.Init(self._tab.Bytes, self._tab.Indirect(self._tab.Vector(o) + j * size))
+            return obj
+        return None
+
+    return item, _length(offset), _is_none(offset)
+
+
+def start(field_count: int) -> staticmethod:
+    return staticmethod(lambda builder: builder.StartObject(field_count))
+
+
+def end() -> staticmethod:
+    return staticmethod(lambda builder: builder.EndObject())
+
+
+def add_scalar(slot: int, flag: str) -> staticmethod:
+    """Builder function adding a scalar or enum field."""
+    prepend = getattr(flatbuffers.Builder, f"Prepend{flag}Slot")
+    return staticmethod(lambda builder, value: prepend(builder, slot, value, 0))
+
+
+def add_offset(slot: int) -> staticmethod:
+    """Builder function adding a string, table or vector field by its offset."""
+    return staticmethod(lambda builder, value: builder.PrependUOffsetTRelativeSlot(slot, value, 0))
+
+
+def start_vector(size: int, alignment: int) -> staticmethod:
+    """Builder function starting a vector field."""
+    return staticmethod(
+        lambda builder, numElems: builder.StartVector(size, numElems, alignment)
+    )
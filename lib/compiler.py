@@ -1,8 +1,18 @@
 """Compiler will parse CSharp dump file to convert to python callable code."""
 
+import hashlib
+import io
+import json
+import mmap
 import os
+import py_compile
 import re
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
+from fnmatch import fnmatchcase
+from importlib.util import cache_from_source
+from itertools import repeat
+from typing import Iterable, Iterator
 
 from lib.structure import EnumMember, EnumType, Property, StructTable
 from lib.console import notice
@@ -12,6 +22,7 @@ from utils.util import TemplateString, Utils
 class DataSize(Enum):
     bool = 1
     byte = 1
+    sbyte = 1
     ubyte = 1
     short = 2
     ushort = 2
@@ -40,6 +51,21 @@ class DataFlag(Enum):
     double = "Float64"
 
 
+class DataFormat(Enum):
+    bool = "?"
+    byte = "b"
+    sbyte = "b"
+    ubyte = "B"
+    short = "h"
+    ushort = "H"
+    int = "i"
+    uint = "I"
+    long = "q"
+    ulong = "Q"
+    float = "f"
+    double = "d"
+
+
 class ConvertFlag(Enum):
     short = "convert_short"
     ushort = "convert_ushort"
@@ -66,7 +92,7 @@ class String:
     """Basic function structure.\n\nArgs: func_name, args, annotaion"""
 
     WRAPPER_BASE = """from enum import IntEnum
-from lib.encryption import convert_short, convert_ushort, convert_int, convert_long, convert_float, convert_double, convert_string, convert_uint, convert_ulong, create_key
+from lib.encryption import convert_short, convert_ushort, convert_int, convert_long, convert_float, convert_double, convert_string, convert_uint, convert_ulong, convert_column, convert_strings, create_key
 import inspect\n
 def dump_table(table_instance) -> list:
     excel_name = table_instance.__class__.__name__.removesuffix("Table")
@@ -74,10 +100,10 @@ def dump_table(table_instance) -> list:
     dump_func = next(
         f
         for n, f in inspect.getmembers(current_module, inspect.isfunction)
-        if n.removeprefix("dump_") == excel_name
+        if n.removeprefix("dump_") == f"{excel_name}_columns"
     )
     password = create_key(excel_name.removesuffix("Excel"))
-    return [dump_func(table_instance.DataList(j), password) for j in range(table_instance.DataListLength())]\n
+    return dump_func([table_instance.DataList(j) for j in range(table_instance.DataListLength())], password)\n
 """
     """Wrapper basic structure."""
 
@@ -95,6 +121,12 @@ def dump_table(table_instance) -> list:
     WRAPPER_PASSWD_CONVERTION = TemplateString("%s(%s, password)")
     """Wrap the data has password.\n\nArgs: type_convert_method, getter"""
 
+    WRAPPER_NUMPY_GETTER = TemplateString("excel_instance.%sAsNumpy()")
+    """Wrap call FlatData method reading a scalar list as a NumPy view.\n\nArgs: prop_name"""
+
+    WRAPPER_NUMPY_LIST = TemplateString("%s if excel_instance.%sLength() else []")
+    """Wrap a scalar list converted at once.\n\nArgs: convertion, prop_name"""
+
     WRAPPER_ENUM_CONVERTION = TemplateString("%s(%s).name")
     """Wrap prop of enum type.\n\nArgs: enum_name, convertion"""
 
@@ -112,268 +144,554 @@ def dump_%s(excel_instance, password: bytes = b"") -> dict:
     )
     """Wrapper func.\n\nArgs: struct_name, dict_items"""
 
-    WRAPPER_INT_ENUM = TemplateString("class %s(IntEnum):")
-    """Wrapper enum class.\n\nArgs: enum_name"""
+    WRAPPER_PLAIN_FUNC = TemplateString(
+        """
+def dump_%s_plain(excel_instance) -> dict:
+    return {\n%s    }
+"""
+    )
+    """Wrapper func of unencrypted data, such as database rows, converting nothing.\n\nArgs: struct_name, dict_items"""
 
-    # MODULE_IMPORT = TemplateString("from %s import %s")
-    # """From module import name.\n\nArgs: module_name, component_name"""
+    WRAPPER_PLAIN_STRING = TemplateString('(%s or b"").decode()')
+    """Decode a string of unencrypted data like convert_string does without password.\n\nArgs: getter"""
 
-    LOCAL_IMPORT = TemplateString("from .%s import %s")
-    """From .module import name.\n\nArgs: local_module_name, component_name"""
+    WRAPPER_PLAIN_DUMP = TemplateString("dump_%s_plain(%s)")
+    """Dump a nested table of unencrypted data.\n\nArgs: struct_name, getter"""
 
-    FB_BASIC_CLASS = TemplateString(
+    WRAPPER_COLUMN_GETTER = TemplateString(
+        "[excel_instance.%s() for excel_instance in records]"
+    )
+    """Wrap call FlatData method on every record.\n\nArgs: prop_name"""
+
+    WRAPPER_COLUMN_CONVERTION = TemplateString('convert_column(%s, password, "%s")')
+    """Wrap a column has password.\n\nArgs: column_getter, data_type"""
+
+    WRAPPER_COLUMN_STRING_CONVERTION = TemplateString("convert_strings(%s, password)")
+    """Wrap a column of string.\n\nArgs: column_getter"""
+
+    WRAPPER_COLUMN_ENUM_CONVERTION = TemplateString("[%s(value).name for value in %s]")
+    """Wrap a column of enum type.\n\nArgs: enum_name, column_convertion"""
+
+    WRAPPER_COLUMN_PER_RECORD = TemplateString(
+        "[%s for excel_instance in records]"
+    )
+    """Wrap a column converted one record at a time.\n\nArgs: convertion|getter"""
+
+    WRAPPER_COLUMN_ASSIGNMENT = TemplateString("    c_%s = %s\n")
+    """Assign a converted column.\n\nArgs: prop_name, column"""
+
+    WRAPPER_COLUMN_KV = TemplateString('"%s": c_%s[i], ')
+    """Pick a record value from its column.\n\nArgs: prop_name, prop_name"""
+
+    WRAPPER_COLUMNS_FUNC = TemplateString(
         """
-import flatbuffers
-from flatbuffers.compat import import_numpy
-np = import_numpy()\n
-class %s:
-    __slots__ = ['_tab']\n
-    @classmethod
-    def GetRootAs(cls, buf, offset=0):
-        n = flatbuffers.encode.Get(flatbuffers.packer.uoffset, buf, offset)
-        x = %s()
-        x.Init(buf, n + offset)
-        return x\n
-    def Init(self, buf, pos):
-        self._tab = flatbuffers.table.Table(buf, pos)\n
+def dump_%s_columns(records: list, password: bytes = b"") -> list:
+%s    return [{%s} for i in range(len(records))]
 """
     )
-    """FlatBuffer basic class.\n\nArgs: struct_name, struct_name"""
+    """Wrapper func converting a whole DataList field by field.\n\nArgs: struct_name, column_assignments, dict_items"""
 
-    FB_NON_SCALAR_LIST_CLASS_METHODS = TemplateString(
+    WRAPPER_RECORD_IMPORT = "from . import records as _records\n"
+    """Import of the record classes returned instead of dicts."""
+
+    WRAPPER_RECORD_ARG = TemplateString("%s,\n")
+    """Pass a converted prop to a record.\n\nArgs: convertion|getter"""
+
+    WRAPPER_RECORD_FUNC = TemplateString(
         """
-    def %s(self, j):
-        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(%d))
-        if o != 0:
-            x = self._tab.Vector(o)
-            x += flatbuffers.number_types.UOffsetTFlags.py_type(j) * %d
-            x = self._tab.Indirect(x)
-            from .%s import %s
-            obj = %s()
-            obj.Init(self._tab.Bytes, x)
-            return obj
-        return None\n
-    def %sLength(self):
-        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(%d))
-        if o != 0:
-            return self._tab.VectorLen(o)
-        return 0\n
-    def %sIsNone(self):
-        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(%d))
-        return o == 0\n
+def dump_%s(excel_instance, password: bytes = b"") -> _records.%s:
+    return _records.%s(\n%s    )
 """
     )
-    """FlatBuffer method for list is a non-scalar type(ptr).\n\nArgs: prop_name, field_index_offset, type_alignment_size, prop_type, prop_type, prop_type, prop_name, field_index_offset, prop_name, field_index_offset"""
+    """Wrapper func returning a record.\n\nArgs: struct_name, struct_name, struct_name, record_args"""
 
-    FB_SCALAR_LIST_CLASS_METHODS = TemplateString(
+    WRAPPER_RECORD_PLAIN_FUNC = TemplateString(
         """
-    def %s(self, j):
-        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(%d))
-        if o != 0:
-            a = self._tab.Vector(o)
-            return self._tab.Get(flatbuffers.number_types.%sFlags, a + flatbuffers.number_types.UOffsetTFlags.py_type(j * %d))
-        return 0\n
-    def %sAsNumpy(self):
-        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(%d))
-        if o != 0:
-            return self._tab.GetVectorAsNumpy(flatbuffers.number_types.%sFlags, o)
-        return 0\n
-    def %sLength(self):
-        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(%d))
-        if o != 0:
-            return self._tab.VectorLen(o)
-        return 0\n
-    def %sIsNone(self):
-        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(%d))
-        return o == 0\n
+def dump_%s_plain(excel_instance) -> _records.%s:
+    return _records.%s(\n%s    )
 """
     )
-    """FlatBuffer method for list is a scalar type.\n\nArgs: prop_name, field_index_offset, data_type_flag, type_alignment_size, prop_name, field_index_offset, data_type_flag, prop_name, field_index_offset, prop_name, field_index_offset"""
+    """Wrapper func of unencrypted data returning a record.\n\nArgs: struct_name, struct_name, struct_name, record_args"""
 
-    FB_SCALAR_PROPERTY_CLASS_METHODS = TemplateString(
+    WRAPPER_RECORD_COLUMNS_FUNC = TemplateString(
         """
-    def %s(self):
-        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(%d))
-        if o != 0:
-            return self._tab.Get(flatbuffers.number_types.%sFlags, o + self._tab.Pos)
-        return 0\n
+def dump_%s_columns(records: list, password: bytes = b"") -> list:
+%s    return %s
 """
     )
-    """FlatBuffer method for scalar type property.\n\nArgs: prop_name, field_index_offset, data_type_flag"""
+    """Wrapper func converting a whole DataList to records field by field.\n\nArgs: struct_name, column_assignments, records"""
 
-    FB_STRING_LIST_CLASS_METHODS = TemplateString(
+    WRAPPER_RECORD_MAP = TemplateString("list(map(_records.%s, %s))")
+    """Build the record of every row from its columns.\n\nArgs: struct_name, columns"""
+
+    WRAPPER_RECORD_EACH = TemplateString("[_records.%s() for _ in records]")
+    """Build the record of every row of a struct without dumped fields.\n\nArgs: struct_name"""
+
+    WRAPPER_INT_ENUM = TemplateString("class %s(IntEnum):")
+    """Wrapper enum class.\n\nArgs: enum_name"""
+
+    WRAPPER_DIRECT_BASE = """from struct import Struct
+from lib.encryption import convert_short, convert_ushort, convert_int, convert_long, convert_float, convert_double, convert_string, convert_uint, convert_ulong, convert_column, convert_strings, create_key
+from lib.layout import DATA_LIST_FIELDS, field_offsets, flatten, read_bool, read_byte, read_double, read_float, read_int, read_long, read_sbyte, read_short, read_ubyte, read_uint, read_ulong, read_uoffset, read_ushort, scalars, split, string, strings, tables
+
+
+def dump_table(table_instance) -> list:
+    dump_columns, key_name = DUMP_TABLES[table_instance.__class__.__name__]
+    buf, pos = memoryview(table_instance._tab.Bytes), table_instance._tab.Pos
+    (offset,) = field_offsets(buf, pos, DATA_LIST_FIELDS)
+    return dump_columns(buf, tables(buf, pos + offset) if offset else [], create_key(key_name))\n
+"""
+    """Wrapper basic structure of direct decoders."""
+
+    WRAPPER_DIRECT_ENUM_NAMES = TemplateString("_ENUM_%s = {%s}\n")
+    """Name of each value of an enum, the first defined one for aliases.\n\nArgs: enum_name, value_names"""
+
+    WRAPPER_DIRECT_OFFSET = TemplateString("o%d")
+    """Offset of a field in a decoded table.\n\nArgs: field_index"""
+
+    WRAPPER_DIRECT_FIELD = TemplateString("pos + o%d")
+    """Position of a field in a decoded table.\n\nArgs: field_index"""
+
+    WRAPPER_DIRECT_SCALAR = TemplateString("read_%s(buf, %s)[0] if %s else %s")
+    """Read a scalar field.\n\nArgs: data_type, field_position, field_offset, default"""
+
+    WRAPPER_DIRECT_STRING = TemplateString("string(buf, %s) if %s else None")
+    """Read a string field.\n\nArgs: field_position, field_offset"""
+
+    WRAPPER_DIRECT_PLAIN_STRING = TemplateString('string(buf, %s).decode() if %s else ""')
+    """Read and decode a string field of an unencrypted table.\n\nArgs: field_position, field_offset"""
+
+    WRAPPER_DIRECT_TABLE = TemplateString("pos + o%d + read_uoffset(buf, pos + o%d)[0]")
+    """Position of a table referred by a field.\n\nArgs: field_index, field_index"""
+
+    WRAPPER_DIRECT_DECODE = TemplateString("_decode_%s(buf, %s, password)")
+    """Decode a nested table.\n\nArgs: struct_name, table_position"""
+
+    WRAPPER_DIRECT_LIST = TemplateString("[%s for value in %s] if %s else []")
+    """Convert every item of a list field.\n\nArgs: convertion, items, field_offset"""
+
+    WRAPPER_DIRECT_ITEMS = TemplateString("list(%s) if %s else []")
+    """Take the items of a list field as they are.\n\nArgs: items, field_offset"""
+
+    WRAPPER_DIRECT_ENUM_CONVERTION = TemplateString("_ENUM_%s[%s]")
+    """Resolve the name of an enum value.\n\nArgs: enum_name, value"""
+
+    WRAPPER_DIRECT_FUNC = TemplateString(
         """
-    def %s(self, j):
-        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(%d))
-        if o != 0:
-            a = self._tab.Vector(o)
-            return self._tab.String(a + flatbuffers.number_types.UOffsetTFlags.py_type(j * 4))
-        return ""\n
-    def %sLength(self):
-        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(%d))
-        if o != 0:
-            return self._tab.VectorLen(o)
-        return 0\n
-    def %sIsNone(self):
-        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(%d))
-        return o == 0\n
+_FIELDS_%s = Struct("<%dH")
+
+
+def _decode_%s(buf, pos: int, password: bytes) -> dict:
+    %s = field_offsets(buf, pos, _FIELDS_%s)
+    return {\n%s    }
+
+
+def dump_%s(excel_instance, password: bytes = b"") -> dict:
+    return _decode_%s(memoryview(excel_instance._tab.Bytes), excel_instance._tab.Pos, password)
 """
     )
-    """FlatBuffer method for list type is string.\n\nArgs: prop_name, field_index_offset, prop_name, field_index_offset, prop_name, field_index_offset"""
+    """Direct decoder of a table and its wrapper func.\n\nArgs: struct_name, field_count, struct_name, field_offsets, struct_name, dict_items, struct_name, struct_name"""
 
-    FB_STRING_PROPERTY_CLASS_METHODS = TemplateString(
+    WRAPPER_DIRECT_PLAIN_FUNC = TemplateString(
         """
-    def %s(self):
-        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(%d))
-        if o != 0:
-            return self._tab.String(o + self._tab.Pos)
-        return None\n
+
+def _decode_%s_plain(buf, pos: int) -> dict:
+    %s = field_offsets(buf, pos, _FIELDS_%s)
+    return {\n%s    }
+
+
+def dump_%s_plain(excel_instance) -> dict:
+    return _decode_%s_plain(memoryview(excel_instance._tab.Bytes), excel_instance._tab.Pos)
 """
     )
-    """FlatBuffer method for string type property.\n\nArgs: prop_name, field_index_offset"""
+    """Direct decoder of an unencrypted table and its wrapper func.\n\nArgs: struct_name, field_offsets, struct_name, dict_items, struct_name, struct_name"""
+
+    WRAPPER_DIRECT_PLAIN_DECODE = TemplateString("_decode_%s_plain(buf, %s)")
+    """Decode a nested unencrypted table.\n\nArgs: struct_name, table_position"""
 
-    FB_STRUCT_PROPERTY_CLASS_METHODS = TemplateString(
+    WRAPPER_DIRECT_COLUMN_INIT = TemplateString("    c_%s = []\n")
+    """Start a column.\n\nArgs: prop_name"""
+
+    WRAPPER_DIRECT_COLUMN_APPEND = TemplateString("        c_%s.append(%s)\n")
+    """Add the field of one record to its column.\n\nArgs: prop_name, value"""
+
+    WRAPPER_DIRECT_COLUMN_ENUM_CONVERTION = TemplateString("[_ENUM_%s[value] for value in %s]")
+    """Resolve the names of a column of enum values.\n\nArgs: enum_name, column_convertion"""
+
+    WRAPPER_DIRECT_COLUMN_FLATTEN = TemplateString("flatten(c_%s)")
+    """Items of a list column of every record as one column.\n\nArgs: prop_name"""
+
+    WRAPPER_DIRECT_COLUMN_SPLIT = TemplateString("split(%s, c_%s)")
+    """Cut a converted list column back into records.\n\nArgs: column_convertion, prop_name"""
+
+    WRAPPER_DIRECT_COLUMNS_FUNC = TemplateString(
         """
-    def %s(self):
-        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(%d))
-        if o != 0:
-            x = self._tab.Indirect(o + self._tab.Pos)
-            from .%s import %s
-            obj = %s()
-            obj.Init(self._tab.Bytes, x)
-            return obj
-        return None\n
+
+def _dump_%s_columns(buf, records: list, password: bytes) -> list:
+%s    for pos in records:
+        %s = field_offsets(buf, pos, _FIELDS_%s)
+%s%s    return [{%s} for i in range(len(records))]
 """
     )
-    """FlatBuffer method for struct type property.\n\nArgs: prop_name, field_index_offset, prop_type, prop_type, prop_type"""
+    """Direct decoder of a whole DataList converting it field by field.\n\nArgs: struct_name, column_inits, field_offsets, struct_name, column_appends, column_assignments, dict_items"""
 
-    FB_ISOLATED_PROPERTY_CLASS_METHODS = TemplateString(
+    WRAPPER_DIRECT_RECORD_FUNC = TemplateString(
         """
-    def %s(self):
-        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(%d))
-        if o != 0:
-            from .%s import %s
-            obj = %s()
-            obj.Init(self._tab.Bytes, o + self._tab.Pos)
-            return obj
-        return None\n
+_FIELDS_%s = Struct("<%dH")
+
+
+def _decode_%s(buf, pos: int, password: bytes) -> _records.%s:
+    %s = field_offsets(buf, pos, _FIELDS_%s)
+    return _records.%s(\n%s    )
+
+
+def dump_%s(excel_instance, password: bytes = b"") -> _records.%s:
+    return _decode_%s(memoryview(excel_instance._tab.Bytes), excel_instance._tab.Pos, password)
 """
     )
-    """FlatBuffer method for non-scalar type property(ptr).\n\nArgs: prop_name, field_index_offset, prop_type, prop_type, prop_type"""
+    """Direct decoder of a table returning a record, and its wrapper func.\n\nArgs: struct_name, field_count, struct_name, struct_name, field_offsets, struct_name, struct_name, record_args, struct_name, struct_name, struct_name"""
 
-    FB_LIST_AND_NON_SCALAR_PROPERTY_FUNCTION = TemplateString(
+    WRAPPER_DIRECT_RECORD_PLAIN_FUNC = TemplateString(
         """
-    @staticmethod
-    def Add%s(builder, %s): builder.PrependUOffsetTRelativeSlot(%d, flatbuffers.number_types.UOffsetTFlags.py_type(%s), 0)
-    @staticmethod
-    def Start%sVector(builder, numElems): return builder.StartVector(%d, numElems, %d)\n
+
+def _decode_%s_plain(buf, pos: int) -> _records.%s:
+    %s = field_offsets(buf, pos, _FIELDS_%s)
+    return _records.%s(\n%s    )
+
+
+def dump_%s_plain(excel_instance) -> _records.%s:
+    return _decode_%s_plain(memoryview(excel_instance._tab.Bytes), excel_instance._tab.Pos)
 """
     )
-    """FlatBuffer function for list and non-scalar property.\n\nArgs: prop_name, prop_name, field_index_in_struct, prop_name, prop_name, element_size, size_alignment"""
+    """Direct decoder of an unencrypted table returning a record, and its wrapper func.\n\nArgs: struct_name, struct_name, field_offsets, struct_name, struct_name, record_args, struct_name, struct_name, struct_name"""
 
-    FB_STRING_AND_STRUCT_PROPERTY_FUNCTION = TemplateString(
+    WRAPPER_DIRECT_RECORD_COLUMNS_FUNC = TemplateString(
         """
-    @staticmethod
-    def Add%s(builder, %s): builder.PrependUOffsetTRelativeSlot(%d, flatbuffers.number_types.UOffsetTFlags.py_type(%s), 0)
+
+def _dump_%s_columns(buf, records: list, password: bytes) -> list:
+%s    for pos in records:
+        %s = field_offsets(buf, pos, _FIELDS_%s)
+%s%s    return %s
 """
     )
-    """FlatBuffer function for string property.\n\nArgs: prop_name, prop_name, field_index_in_struct, prop_name"""
+    """Direct decoder of a whole DataList to records.\n\nArgs: struct_name, column_inits, field_offsets, struct_name, column_appends, column_assignments, records"""
+
+    WRAPPER_DIRECT_TABLES = TemplateString("\n\nDUMP_TABLES = {\n%s}\n")
+    """Columns decoder and key name of each table.\n\nArgs: table_entries"""
+
+    WRAPPER_DIRECT_TABLE_ENTRY = TemplateString('    "%s": (_dump_%s_columns, "%s"),\n')
+    """Entry of a table.\n\nArgs: table_name, struct_name, key_name"""
+
+    WRAPPER_DIRECT_PACK_BASE = """from lib.layout import create_offsets, create_string, create_vector, end_object, reserve, write_bool, write_byte, write_double, write_float, write_int, write_long, write_sbyte, write_short, write_ubyte, write_uint, write_ulong, write_uoffset, write_ushort
+"""
+    """Imports of packers writing FlatBuffer tables directly."""
+
+    WRAPPER_DIRECT_ENUM_VALUES = TemplateString("_VALUES_%s = {%s}\n")
+    """Value of each name of an enum.\n\nArgs: enum_name, name_values"""
+
+    # MODULE_IMPORT = TemplateString("from %s import %s")
+    # """From module import name.\n\nArgs: module_name, component_name"""
+
+    LOCAL_IMPORT = TemplateString("from .%s import %s")
+    """From .module import name.\n\nArgs: local_module_name, component_name"""
+
+    LAZY_MODULE_BASE = """\"\"\"FlatData types, each imported from its module on first access.\"\"\"
+
+from importlib import import_module
+
+"""
+
+    LAZY_MODULE_ENTRY = TemplateString('    "%s": "%s",\n')
+    """Registry entry of a type.\n\nArgs: component_name, local_module_name"""
+
+    LAZY_MODULE_GETATTR = """
+
+def __getattr__(name: str):
+    if name not in TYPES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{TYPES[name]}", __name__), name)
+    # Later lookups find the type without calling __getattr__ again.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | TYPES.keys())
+"""
+
+    RECORDS_BASE = """\"\"\"Slotted record of each FlatData struct, holding the fields its dump gives.\"\"\"
+
+from lib.structure import Record
+"""
 
-    FB_SCALAR_PROPERTY_FUNCTION = TemplateString(
+    RECORD_CLASS = TemplateString(
         """
-    @staticmethod
-    def Add%s(builder, %s): builder.Prepend%sSlot(%d, %s, 0)\n
+
+class %s(Record):
+    __slots__ = (%s)
 """
     )
-    """FlatBuffer function for scalar property.\n\nArgs: prop_name, prop_name, data_type_flag, field_index_in_struct, prop_name"""
+    """Record class of a struct.\n\nArgs: struct_name, field_names"""
 
-    FB_START_AND_END_FUNCTION = TemplateString(
+    RECORD_INIT = TemplateString(
         """
-    @staticmethod
-    def Start(builder): builder.StartObject(%d)
-    @staticmethod
-    def End(builder): return builder.EndObject()\n
+    def __init__(self, %s) -> None:
+%s"""
+    )
+    """Set every field of a record.\n\nArgs: args, field_assignments"""
+
+    RECORD_FIELD_ASSIGNMENT = TemplateString("        self.%s = %s\n")
+    """Set a field of a record.\n\nArgs: prop_name, prop_name"""
+
+    FB_IMPORTS = """
+from lib.accessor import FlatBufferTable, add_offset, add_scalar, end, inline, scalar, scalar_list, start, start_vector, string, string_list, table, table_list
+"""
+    """Imports of a module of FlatBuffer classes."""
+
+    FB_BASIC_CLASS = TemplateString(
+        """
+
+class %s(FlatBufferTable):
+    __slots__ = ()\n
 """
     )
-    """FlatBuffer basic call function to start and end.\n\nArgs: prop_count"""
+    """FlatBuffer basic class.\n\nArgs: struct_name"""
 
+    FB_NON_SCALAR_LIST_CLASS_METHODS = TemplateString(
+        '    %s, %sLength, %sIsNone = table_list(%d, %d, "%s")\n'
+    )
+    """FlatBuffer method for list is a non-scalar type(ptr).\n\nArgs: prop_name, prop_name, prop_name, field_index_offset, type_alignment_size, prop_type"""
 
-class Re:
-    struct = re.compile(
-        r"""\s*struct (.{0,128}?) :.{0,128}?IFlatbufferObject.{0,128}?
-\s*\{
-(.+?)
-\s*\}
-""",
-        re.M | re.S,
+    FB_SCALAR_LIST_CLASS_METHODS = TemplateString(
+        '    %s, %sAsNumpy, %sLength, %sIsNone = scalar_list(%d, "%s", %d)\n'
     )
-    """Get structure name and its field."""
+    """FlatBuffer method for list is a scalar type.\n\nArgs: prop_name, prop_name, prop_name, prop_name, field_index_offset, data_type_flag, type_alignment_size"""
 
-    struct_property = re.compile(r"""public (?:FlatData\.)?(.+?)\?? (.+?) { get(?: => default)?; }""")
-    """Get property type and name in field."""
+    FB_SCALAR_PROPERTY_CLASS_METHODS = TemplateString('    %s = scalar(%d, "%s")\n')
+    """FlatBuffer method for scalar type property.\n\nArgs: prop_name, field_index_offset, data_type_flag"""
 
-    enum = re.compile(
-        r"""
-public\s+enum\s+(.{1,128}?)\s*//\s*TypeDefIndex:\s*\d+\s*
-\{\s*
-(.*?)
-\s*\}
-        """,
-        re.M | re.S | re.X,
+    FB_STRING_LIST_CLASS_METHODS = TemplateString(
+        "    %s, %sLength, %sIsNone = string_list(%d)\n"
     )
+    """FlatBuffer method for list type is string.\n\nArgs: prop_name, prop_name, prop_name, field_index_offset"""
+
+    FB_STRING_PROPERTY_CLASS_METHODS = TemplateString("    %s = string(%d)\n")
+    """FlatBuffer method for string type property.\n\nArgs: prop_name, field_index_offset"""
+
+    FB_STRUCT_PROPERTY_CLASS_METHODS = TemplateString('    %s = table(%d, "%s")\n')
+    """FlatBuffer method for struct type property.\n\nArgs: prop_name, field_index_offset, prop_type"""
+
+    FB_ISOLATED_PROPERTY_CLASS_METHODS = TemplateString('    %s = inline(%d, "%s")\n')
+    """FlatBuffer method for non-scalar type property(ptr).\n\nArgs: prop_name, field_index_offset, prop_type"""
+
+    FB_LIST_AND_NON_SCALAR_PROPERTY_FUNCTION = TemplateString(
+        "    Add%s = add_offset(%d)\n    Start%sVector = start_vector(%d, %d)\n"
+    )
+    """FlatBuffer function for list and non-scalar property.\n\nArgs: prop_name, field_index_in_struct, prop_name, element_size, size_alignment"""
+
+    FB_STRING_AND_STRUCT_PROPERTY_FUNCTION = TemplateString("    Add%s = add_offset(%d)\n")
+    """FlatBuffer function for string property.\n\nArgs: prop_name, field_index_in_struct"""
+
+    FB_SCALAR_PROPERTY_FUNCTION = TemplateString('    Add%s = add_scalar(%d, "%s")\n')
+    """FlatBuffer function for scalar property.\n\nArgs: prop_name, field_index_in_struct, data_type_flag"""
+
+    FB_START_AND_END_FUNCTION = TemplateString("    Start = start(%d)\n    End = end()\n")
+    """FlatBuffer basic call function to start and end.\n\nArgs: prop_count"""
+
+
+class Re:
+    struct_property = re.compile(r"""public (?:FlatData\.)?(.+?)\?? (.+?) { get(?: => default)?; }""")
+    """Get property type and name in field."""
 
-    """Get value, type of enum and enum field."""
     enum_member = re.compile(r"(.+?) = (-?\d+)")
     """Get member name, value in enum."""
 
     table_data_type = re.compile(r"public (.+?)\? DataList\(int j\) => default;")
 
+    struct_list_method = re.compile(r"public (?:FlatData\.)?(.+?)\?? (\w+)\(int j\) => default;")
+    """Get element type and name of list accessor in field."""
 
-class CSParser:
-    def __init__(self, file_path: str) -> None:
-        with open(file_path, "rt", encoding="utf8") as file:
-            self.data = file.read()
-            start_token = "namespace FlatData"
-            start_idx = self.data.find(start_token)
-
-            if start_idx == -1:
-                self.flatdata_part = ""
-                return
+    type_header = re.compile(
+        rb"^(?:[ \t]*\[[^\n]*\]\n)*[ \t]*(?:[\w]+ )*?(class|struct|enum|interface) ([^\s:{]+)([^\n]*)\n\s*\{",
+        re.M,
+    )
+    """Get kind, name and the rest of header of a type, after its attributes and up to its opening brace."""
 
-            brace_idx = self.data.find("{", start_idx)
-            if brace_idx == -1:
-                self.flatdata_part = ""
-                return
+    type_end = re.compile(rb"\n[ \t]*\}")
+    """Find the line closing a type body."""
 
-            index = brace_idx
-            open_braces = 1
+    namespace_end = re.compile(rb"\n\}")
+    """Find the line closing a namespace block."""
 
-            while index < len(self.data) - 1 and open_braces > 0:
-                index += 1
-                if self.data[index] == "{":
-                    open_braces += 1
-                elif self.data[index] == "}":
-                    open_braces -= 1
+    flatdata_comment = re.compile(rb"// Namespace: FlatData\r?\n")
+    """Find the comment marking a type of FlatData namespace."""
 
-            self.flatdata_part = self.data[start_idx:index + 1]
 
-    def parse_enum(self) -> list[EnumType]:
-        """Extract enum from cs."""
-        enums = []
-        for enum_name, content in Re.enum.findall(self.flatdata_part):
-            if "." in enum_name:
+CHUNKS_PER_WORKER = 4
+"""Chunks of types given to each worker of a pool, so uneven chunks still balance out."""
+
+EXCEL_ROOTS = ("*Excel", "*ExcelTable")
+"""Root patterns matching every table of Excel.zip and every DB schema."""
+
+
+def _parse_cs_types(
+    file_path: str, types: list[tuple[str, str, int, int]]
+) -> tuple[list[EnumType], list[StructTable]]:
+    """Parse a chunk of types of a dump in a worker process."""
+    parser = CSParser(file_path, types=types)
+    return parser.enums, parser.structs
+
+
+_EMITTER: "CompileToPython"
+"""Compiler of a worker process emitting modules."""
+
+
+def _init_emitter(compiler: "CompileToPython") -> None:
+    global _EMITTER
+    _EMITTER = compiler
+
+
+def _emit(method: str, start: int, stop: int | None) -> None:
+    """Run one module creating method of the worker compiler."""
+    if method in ("create_enum_files", "create_struct_files"):
+        getattr(_EMITTER, method)(start, stop)
+    else:
+        getattr(_EMITTER, method)()
+
+
+class CSParser:
+    """Parse the FlatData types of a dump.cs file in one pass.
+
+    The dump is memory-mapped and only types inside the ``namespace FlatData``
+    block, or marked by ``// Namespace: FlatData`` comments when there is no such
+    block, are decoded and parsed. Type bodies are skipped by finding their
+    closing line instead of walking them character by character.
+
+    With more than one worker, the types are split into contiguous chunks of about
+    the same size, parsed in a process pool and merged back in order.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        workers: int = 1,
+        types: list[tuple[str, str, int, int]] | None = None,
+    ) -> None:
+        """Args:
+            file_path (str): Path of dump.cs.
+            workers (int, optional): Number of processes parsing types. Defaults to 1.
+            types (list | None, optional): Only parse these (kind, name, start, end) types, as found by a parent parser.
+        """
+        self.enums: list[EnumType] = []
+        self.structs: list[StructTable] = []
+        if not os.path.getsize(file_path):
+            return
+        with open(file_path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if types is None:
+            types = list(self.__find_types())
+        if workers <= 1 or len(types) <= 1:
+            self.__parse_types(types)
+            return
+
+        chunk_size = (types[-1][3] - types[0][2]) // (workers * CHUNKS_PER_WORKER) + 1
+        chunks: list[list[tuple[str, str, int, int]]] = [[]]
+        chunk_start = types[0][2]
+        for type_span in types:
+            if chunks[-1] and type_span[2] - chunk_start >= chunk_size:
+                chunks.append([])
+                chunk_start = type_span[2]
+            chunks[-1].append(type_span)
+
+        with ProcessPoolExecutor(workers) as executor:
+            for enums, structs in executor.map(_parse_cs_types, repeat(file_path), chunks):
+                self.enums += enums
+                self.structs += structs
+
+    def __find_types(self) -> Iterator[tuple[str, str, int, int]]:
+        """Find the kind, name and body span of every FlatData enum and struct."""
+        start_idx = self.data.find(b"namespace FlatData")
+        if start_idx != -1:
+            brace_idx = self.data.find(b"{", start_idx)
+            if brace_idx == -1:
+                return
+            namespace_end = Re.namespace_end.search(self.data, brace_idx)
+            end_idx = namespace_end.start() if namespace_end else len(self.data)
+            position = brace_idx + 1
+            while header := Re.type_header.search(self.data, position, end_idx):
+                position, type_span = self.__find_type(header)
+                if type_span:
+                    yield type_span
+        else:
+            position = 0
+            while comment := Re.flatdata_comment.search(self.data, position):
+                position = comment.end()
+                if header := Re.type_header.match(self.data, position):
+                    position, type_span = self.__find_type(header)
+                    if type_span:
+                        yield type_span
+
+    def __find_type(
+        self, header: re.Match
+    ) -> tuple[int, tuple[str, str, int, int] | None]:
+        """Get the index after a type body, and its span if it is a FlatData enum or struct."""
+        kind, name, rest = (group.decode("utf8") for group in header.groups())
+        body_start = header.end()
+        body_end = Re.type_end.search(self.data, body_start)
+        end_idx = body_end.start() if body_end else len(self.data)
+        position = body_end.end() if body_end else end_idx
+        if kind == "enum" and "TypeDefIndex" in rest:
+            return position, (kind, name, body_start, end_idx)
+        if kind == "struct" and rest.startswith(" :") and "IFlatbufferObject" in rest:
+            return position, (kind, name, body_start, end_idx)
+        return position, None
+
+    def __parse_types(self, types: list[tuple[str, str, int, int]]) -> None:
+        for kind, name, body_start, end_idx in types:
+            content = self.data[body_start:end_idx].decode("utf8")
+            if kind == "enum":
+                self.__parse_enum(name, content)
+            else:
+                self.__parse_struct(name, content)
+
+    def __parse_enum(self, enum_name: str, content: str) -> None:
+        if "." in enum_name:
+            return
+
+        enum_members = []
+        for name, value in Re.enum_member.findall(content):
+            enum_members.append(EnumMember(name.strip(), value))
+
+        self.enums.append(EnumType(enum_name, "int", enum_members))
+
+    def __parse_struct(self, struct_name: str, struct_data: str) -> None:
+        # Element type of every list accessor, found once for the whole body.
+        list_types: dict[str, str] = {}
+        for list_type, list_name in Re.struct_list_method.findall(struct_data):
+            list_types.setdefault(list_name, list_type)
+
+        struct_properties = []
+        for prop in Re.struct_property.finditer(struct_data):
+            prop_type = prop.group(1)
+            prop_name = prop.group(2)
+
+            if "ByteBuffer" in prop_name:
                 continue
 
-            enum_members = []
-            for name, value in Re.enum_member.findall(content):
-                enum_members.append(EnumMember(name.strip(), value))
+            struct_properties.append(
+                self.__parse_struct_property(prop_type, prop_name, list_types)
+            )
 
-            enums.append(EnumType(enum_name, "int", enum_members))
+        if struct_properties:
+            self.structs.append(StructTable(struct_name, struct_properties))
 
-        return enums
+    def parse_enum(self) -> list[EnumType]:
+        """Extract enum from cs."""
+        return list(self.enums)
 
     def __parse_struct_property(
-        self, prop_type: str, prop_name: str, prop_data: str
+        self, prop_type: str, prop_name: str, list_types: dict[str, str]
     ) -> Property:
         """Extract struct from cs."""
         # Has list in struct if there have its length property.
@@ -383,12 +701,8 @@ class CSParser:
 
         if len(prop_name) > 6 and prop_name.endswith("Length"):
             list_name = prop_name.removesuffix("Length")
-            re_type_of_list = re.search(
-                rf"public (?:FlatData\.)?(.+?)\?? {list_name}\(int j\) => default;", prop_data
-            )  # Get object type in list.
 
-            if re_type_of_list:
-                list_type = re_type_of_list.group(1)
+            if list_type := list_types.get(list_name):  # Get object type in list.
                 prop_is_list = True
 
                 list_type = list_type.removeprefix("Nullable<").removesuffix(">")
@@ -399,25 +713,7 @@ class CSParser:
 
     def parse_struct(self) -> list[StructTable]:
         """从数据中提取结构体"""
-        structs = []
-        # struct name, field
-        for struct_name, struct_data in Re.struct.findall(self.data):
-            struct_properties = []
-            for prop in Re.struct_property.finditer(struct_data):
-                prop_type = prop.group(1)
-                prop_name = prop.group(2)
-
-                if "ByteBuffer" in prop_name:
-                    continue
-
-                if extracted_property := self.__parse_struct_property(
-                    prop_type, prop_name, struct_data
-                ):
-                    struct_properties.append(extracted_property)
-
-            if struct_properties:
-                structs.append(StructTable(struct_name, struct_properties))
-        structs = [struct for struct in structs if not struct.name.endswith("ExcelTable")]
+        structs = [struct for struct in self.structs if not struct.name.endswith("ExcelTable")]
         for struct in tuple(structs):
             if not struct.name.endswith("Excel"):
                 continue
@@ -425,28 +721,307 @@ class CSParser:
         return structs
 
 
+def prune_types(
+    enums: list[EnumType], structs: list[StructTable], roots: Iterable[str]
+) -> tuple[list[EnumType], list[StructTable]]:
+    """Keep only the types reachable from root structs.
+
+    Args:
+        enums (list[EnumType]): Parsed enums.
+        structs (list[StructTable]): Parsed structs.
+        roots (Iterable[str]): Names or glob patterns of root structs, like EXCEL_ROOTS.
+
+    Returns:
+        tuple[list[EnumType], list[StructTable]]: Enums and structs referred by a
+        root, directly or through other structs, in their original order.
+    """
+    structs_by_name: dict[str, list[StructTable]] = {}
+    for struct in structs:
+        structs_by_name.setdefault(struct.name, []).append(struct)
+    roots = tuple(roots)
+    pending = [
+        name for name in structs_by_name if any(fnmatchcase(name, root) for root in roots)
+    ]
+    reached = set(pending)
+    while pending:
+        for struct in structs_by_name[pending.pop()]:
+            for prop in struct.properties:
+                if prop.data_type in reached:
+                    continue
+                reached.add(prop.data_type)
+                if prop.data_type in structs_by_name:
+                    pending.append(prop.data_type)
+    return (
+        [enum for enum in enums if enum.name in reached],
+        [struct for struct in structs if struct.name in reached],
+    )
+
+
 class CompileToPython:
+    """Generate the FlatData package.
+
+    A manifest of a fingerprint per type is kept next to the generated modules.
+    Only modules of types whose definition, or the kind of the types they refer
+    to, changed since the last run are generated again, and no module is
+    rewritten when its content is the same, so their bytecode caches stay valid.
+
+    Each type gets its own module by default. With types_per_module above 1 the
+    types are consolidated into a few large modules instead, so a cold import of
+    the package stats and loads far fewer files. Bytecode of every written module
+    is compiled at generation time either way.
+
+    With direct_decoders, the dump wrapper decodes the FlatBuffer bytes itself
+    instead of going through the generated accessors, producing the same dicts.
+    With direct_packers, the repack wrapper writes tables into the buffer of the
+    Builder itself, producing the same bytes.
+
+    With record_classes, a records module gets a slotted class per struct, and
+    dumps return those records instead of dicts. They hold the same fields in
+    far less memory, read and write like the dicts, and convert back to them.
+    """
+
     DUMP_WRAPPER_NAME = "dump_wrapper"
+    RECORDS_NAME = "records"
+    MANIFEST_NAME = "manifest.json"
 
     def __init__(
-        self, enums: list[EnumType], structs: list[StructTable], extract_dir: str
+        self,
+        enums: list[EnumType],
+        structs: list[StructTable],
+        extract_dir: str,
+        types_per_module: int = 1,
+        direct_decoders: bool = False,
+        direct_packers: bool = False,
+        record_classes: bool = False,
     ) -> None:
         self.enums = enums
         self.structs = structs
         self.extract_dir = extract_dir
+        self.types_per_module = types_per_module
+        self.direct_decoders = direct_decoders
+        self.direct_packers = direct_packers
+        self.record_classes = record_classes
+        self.enum_modules = self.__group_modules(self.enums, "_enums")
+        self.struct_modules = self.__group_modules(self.structs, "_structs")
+        self.module_names = {
+            Utils.convert_name_to_available(type_.name): module_name
+            for module_name, types in self.enum_modules + self.struct_modules
+            for type_ in types
+        }
+        self.symbols = self.__create_symbols()
+        self.enums_by_name = {enum.name: enum for enum in self.enums}
+        self.structs_by_name = {struct.name : struct for struct in self.structs}
+        self.manifest = self.__create_manifest()
+        self.previous_manifest = self.__load_manifest()
+        previous_types = self.previous_manifest.get("types", {})
+        self.changed_types = {
+            key
+            for key, definition in self.manifest["types"].items()
+            if previous_types.get(key, {}).get("fingerprint") != definition["fingerprint"]
+        }
+        self.removed_types = previous_types.keys() - self.manifest["types"].keys()
+
+    def __group_modules(self, types: list, prefix: str) -> list[tuple[str, list]]:
+        """Split types into modules, one module per type unless consolidated."""
+        if self.types_per_module <= 1:
+            return [(Utils.convert_name_to_available(type_.name), [type_]) for type_ in types]
+        return [
+            (f"{prefix}_{index:03d}", types[start : start + self.types_per_module])
+            for index, start in enumerate(range(0, len(types), self.types_per_module))
+        ]
+
+    def __get_module_name(self, type_name: str) -> str:
+        """Get the module defining a type, or the type name for types not generated."""
+        return self.module_names.get(Utils.convert_name_to_available(type_name), type_name)
+
+    def __create_manifest(self) -> dict:
+        """Fingerprint every type, with the compiler source so template changes regenerate all."""
+        with open(__file__, "rb") as file:
+            compiler_hash = hashlib.sha1(file.read()).hexdigest()
+
+        types: dict[str, dict] = {}
+        for enum in self.enums:
+            members = [[member.name, member.value] for member in enum.members]
+            types[f"enum:{enum.name}"] = {
+                "fingerprint": self.__fingerprint([compiler_hash, enum.underlying_type, members]),
+                "members": members,
+            }
+        for struct in self.structs:
+            fields = [[prop.name, prop.data_type, prop.is_list] for prop in struct.properties]
+            # The generated accessors differ by whether a field refers to a struct or an enum.
+            dependencies = []
+            for prop in struct.properties:
+                prop_data = self.__type_in_struct_or_num(prop.data_type)
+                if isinstance(prop_data, EnumType):
+                    dependencies.append(f"enum:{prop_data.underlying_type}")
+                elif isinstance(prop_data, StructTable):
+                    dependencies.append(f"struct:{self.__get_module_name(prop.data_type)}")
+                else:
+                    dependencies.append(self.__get_module_name(prop.data_type))
+            types[f"struct:{struct.name}"] = {
+                "fingerprint": self.__fingerprint([compiler_hash, fields, dependencies]),
+                "fields": fields,
+            }
+        modules = {
+            module_name: [f"{kind}:{type_.name}" for type_ in types_]
+            for kind, type_modules in (("enum", self.enum_modules), ("struct", self.struct_modules))
+            for module_name, types_ in type_modules
+        }
+        options = {
+            "direct_decoders": self.direct_decoders,
+            "direct_packers": self.direct_packers,
+            "record_classes": self.record_classes,
+        }
+        return {"types": types, "modules": modules, "options": options}
+
+    @staticmethod
+    def __fingerprint(definition: list) -> str:
+        return hashlib.sha1(json.dumps(definition).encode("utf8")).hexdigest()
+
+    def __load_manifest(self) -> dict:
+        manifest_path = os.path.join(self.extract_dir, self.MANIFEST_NAME)
+        if not os.path.isfile(manifest_path):
+            return {}
+        try:
+            with open(manifest_path, "rt", encoding="utf8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def write_manifest(self) -> None:
+        """Save fingerprints of the generated types for the next run."""
+        os.makedirs(self.extract_dir, exist_ok=True)
+        with open(
+            os.path.join(self.extract_dir, self.MANIFEST_NAME), "wt", encoding="utf8"
+        ) as file:
+            json.dump(self.manifest, file, ensure_ascii=False)
+
+    def __need_module(self, module_name: str) -> bool:
+        """Whether a type module has to be generated again."""
+        keys = self.manifest["modules"][module_name]
+        return (
+            any(key in self.changed_types for key in keys)
+            or self.previous_manifest.get("modules", {}).get(module_name) != keys
+            or not os.path.isfile(os.path.join(self.extract_dir, f"{module_name}.py"))
+        )
 
-    def __type_in_struct_or_num(
-        self, prop_type: str, structs: list[StructTable], enums: list[EnumType]
-    ) -> StructTable | EnumType | None:
-        for enum in enums:
-            if prop_type == enum.name and enum.underlying_type in DataFlag.__members__:
-                return enum
+    def __need_package_module(self, module_name: str) -> bool:
+        """Whether a module covering every type has to be generated again."""
+        return self.__has_changes() or not os.path.isfile(
+            os.path.join(self.extract_dir, f"{module_name}.py")
+        )
 
-        for struct in structs:
-            if prop_type == struct.name:
-                return struct
+    def __write_module(self, module_name: str, content: str) -> None:
+        """Write a module and compile its bytecode, only if its content changed."""
+        file_path = os.path.join(self.extract_dir, f"{module_name}.py")
+        if os.path.isfile(file_path):
+            with open(file_path, "rt", encoding="utf8") as file:
+                if file.read() == content:
+                    return
+        with open(file_path, "wt", encoding="utf8") as file:
+            file.write(content)
+        py_compile.compile(file_path, cache_from_source(file_path), doraise=True)
+
+    def remove_stale_files(self) -> None:
+        """Delete modules of removed types, and modules left by the other output mode."""
+        module_names = set(self.manifest["modules"])
+        stale_modules = set(self.previous_manifest.get("modules", {})) - module_names
+        stale_modules |= {
+            Utils.convert_name_to_available(key.split(":", 1)[1])
+            for key in self.manifest["types"]
+        } - module_names
+        if not self.record_classes:
+            stale_modules.add(self.RECORDS_NAME)
+        for module_name in stale_modules:
+            file_path = os.path.join(self.extract_dir, f"{module_name}.py")
+            if os.path.isfile(file_path):
+                os.remove(file_path)
+            cache_path = cache_from_source(file_path)
+            if os.path.isfile(cache_path):
+                os.remove(cache_path)
+
+    def diff_schema(self) -> dict[str, list]:
+        """Compare types with the last run.
+
+        Returns:
+            dict[str, list]: Keys "added" and "removed" of type keys such as "struct:ItemExcel", and
+            "changed" of (type key, added, removed, changed) where the last three list field or member names.
+        """
+        previous_types = self.previous_manifest.get("types", {})
+        current_types = self.manifest["types"]
+        changed = []
+        for key in sorted(current_types.keys() & previous_types.keys()):
+            items_name = "members" if key.startswith("enum:") else "fields"
+            previous_items = {item[0]: item[1:] for item in previous_types[key].get(items_name, [])}
+            current_items = {item[0]: item[1:] for item in current_types[key][items_name]}
+            if previous_items == current_items:
+                continue
+            changed.append(
+                (
+                    key,
+                    [name for name in current_items if name not in previous_items],
+                    [name for name in previous_items if name not in current_items],
+                    [
+                        name
+                        for name in current_items
+                        if name in previous_items and previous_items[name] != current_items[name]
+                    ],
+                )
+            )
+        return {
+            "added": sorted(current_types.keys() - previous_types.keys()),
+            "removed": sorted(self.removed_types),
+            "changed": changed,
+        }
+
+    def report_schema_diff(self) -> None:
+        """Print the types and fields changed since the last run."""
+        if not self.previous_manifest:
+            print(f"Generated {len(self.manifest['types'])} types.")
+            return
+        diff = self.diff_schema()
+        if not (diff["added"] or diff["removed"] or diff["changed"]):
+            print("Schema has no changes.")
+            return
+        print(
+            f"Schema changes: {len(diff['added'])} added, {len(diff['removed'])} removed, "
+            f"{len(diff['changed'])} changed."
+        )
+        for key in diff["added"]:
+            print(f"  + {key}")
+        for key in diff["removed"]:
+            print(f"  - {key}")
+        for key, added, removed, changed in diff["changed"]:
+            print(f"  ~ {key}")
+            for name in added:
+                print(f"      + {name}")
+            for name in removed:
+                print(f"      - {name}")
+            for name in changed:
+                print(f"      ~ {name}")
+
+    def __has_changes(self) -> bool:
+        return bool(
+            self.changed_types
+            or self.removed_types
+            or self.manifest["modules"] != self.previous_manifest.get("modules")
+            or self.manifest["options"] != self.previous_manifest.get("options")
+        )
+
+    def __type_in_struct_or_num(self, prop_type: str) -> StructTable | EnumType | None:
+        return self.symbols.get(prop_type)
 
-        return None
+    def __create_symbols(self) -> dict[str, StructTable | EnumType]:
+        """Index types by name, the first enum of a name winning over any struct."""
+        symbols: dict[str, StructTable | EnumType] = {}
+        for struct in self.structs:
+            symbols.setdefault(struct.name, struct)
+        enum_symbols: dict[str, EnumType] = {}
+        for enum in self.enums:
+            if enum.underlying_type in DataFlag.__members__:
+                enum_symbols.setdefault(enum.name, enum)
+        symbols.update(enum_symbols)
+        return symbols
 
     def __convert_scalar_type(
         self, prop: Property, index: int, p_name: str, f_offset: int, t_size: int
@@ -454,24 +1029,14 @@ class CompileToPython:
         t_flag = DataFlag[prop.data_type].value
         if prop.is_list:
             return String.FB_SCALAR_LIST_CLASS_METHODS(
-                p_name,
-                f_offset,
-                t_flag,
-                t_size,
-                p_name,
-                f_offset,
-                t_flag,
-                p_name,
-                f_offset,
-                p_name,
-                f_offset,
+                p_name, p_name, p_name, p_name, f_offset, t_flag, t_size
             ), String.FB_LIST_AND_NON_SCALAR_PROPERTY_FUNCTION(
-                p_name, p_name, index, p_name, p_name, t_size, t_size
+                p_name, index, p_name, t_size, t_size
             )
 
         return String.FB_SCALAR_PROPERTY_CLASS_METHODS(
             p_name, f_offset, t_flag
-        ), String.FB_SCALAR_PROPERTY_FUNCTION(p_name, p_name, t_flag, index, p_name)
+        ), String.FB_SCALAR_PROPERTY_FUNCTION(p_name, index, t_flag)
 
     def __convert_string_type(
         self, prop: Property, index: int, p_name: str, f_offset: int
@@ -479,13 +1044,13 @@ class CompileToPython:
         t_size = DataSize[prop.data_type].value
         if prop.is_list:
             return String.FB_STRING_LIST_CLASS_METHODS(
-                p_name, f_offset, p_name, f_offset, p_name, f_offset
+                p_name, p_name, p_name, f_offset
             ), String.FB_LIST_AND_NON_SCALAR_PROPERTY_FUNCTION(
-                p_name, p_name, index, p_name, p_name, t_size, t_size
+                p_name, index, p_name, t_size, t_size
             )
         return String.FB_STRING_PROPERTY_CLASS_METHODS(
             p_name, f_offset
-        ), String.FB_STRING_AND_STRUCT_PROPERTY_FUNCTION(p_name, p_name, index, p_name)
+        ), String.FB_STRING_AND_STRUCT_PROPERTY_FUNCTION(p_name, index)
 
     def __convert_enum_type(
         self,
@@ -499,24 +1064,14 @@ class CompileToPython:
         t_flag = DataFlag[enum.underlying_type].value
         if prop.is_list:
             return String.FB_SCALAR_LIST_CLASS_METHODS(
-                p_name,
-                f_offset,
-                t_flag,
-                t_size,
-                p_name,
-                f_offset,
-                t_flag,
-                p_name,
-                f_offset,
-                p_name,
-                f_offset,
+                p_name, p_name, p_name, p_name, f_offset, t_flag, t_size
             ), String.FB_LIST_AND_NON_SCALAR_PROPERTY_FUNCTION(
-                p_name, p_name, index, p_name, p_name, t_size, t_size
+                p_name, index, p_name, t_size, t_size
             )
 
         return String.FB_SCALAR_PROPERTY_CLASS_METHODS(
             p_name, f_offset, t_flag
-        ), String.FB_SCALAR_PROPERTY_FUNCTION(p_name, p_name, t_flag, index, p_name)
+        ), String.FB_SCALAR_PROPERTY_FUNCTION(p_name, index, t_flag)
 
     def __convert_struct_type(
         self, prop: Property, index: int, p_name: str, f_offset: int
@@ -525,94 +1080,127 @@ class CompileToPython:
         t_size = DataSize.struct.value
         if prop.is_list:
             return String.FB_NON_SCALAR_LIST_CLASS_METHODS(
-                p_name,
-                f_offset,
-                t_size,
-                p_type,
-                p_type,
-                p_type,
-                p_name,
-                f_offset,
-                p_name,
-                f_offset,
+                p_name, p_name, p_name, f_offset, t_size, p_type
             ), String.FB_LIST_AND_NON_SCALAR_PROPERTY_FUNCTION(
-                p_name, p_name, index, p_name, p_name, t_size, t_size
+                p_name, index, p_name, t_size, t_size
             )
-        
+
         return String.FB_STRUCT_PROPERTY_CLASS_METHODS(
-            p_name,
-            f_offset,
-            p_type,
-            p_type,
-            p_type,
-        ), String.FB_STRING_AND_STRUCT_PROPERTY_FUNCTION(p_name, p_name, index, p_name)
+            p_name, f_offset, p_type
+        ), String.FB_STRING_AND_STRUCT_PROPERTY_FUNCTION(p_name, index)
 
     def __convert_isolated_type(
         self, prop: Property, index: int, p_name: str, f_offset: int, t_size: int
     ) -> tuple[str, str]:
         p_type = prop.data_type
         func = String.FB_LIST_AND_NON_SCALAR_PROPERTY_FUNCTION(
-            p_name, p_name, index, p_name, p_name, t_size, t_size
+            p_name, index, p_name, t_size, t_size
         )
         if prop.is_list:
             return (
                 String.FB_NON_SCALAR_LIST_CLASS_METHODS(
-                    p_name,
-                    f_offset,
-                    t_size,
-                    p_type,
-                    p_type,
-                    p_type,
-                    p_name,
-                    f_offset,
-                    p_name,
-                    f_offset,
+                    p_name, p_name, p_name, f_offset, t_size, p_type
                 ),
                 func,
             )
         return (
-            String.FB_ISOLATED_PROPERTY_CLASS_METHODS(
-                p_name, f_offset, p_type, p_type, p_type
-            ),
+            String.FB_ISOLATED_PROPERTY_CLASS_METHODS(p_name, f_offset, p_type),
             func,
         )
 
-    def create_enum_files(self) -> None:
-        """Convert enum to python."""
+    def create_files(self, workers: int = 1) -> None:
+        """Create every module of the package, spreading them over a process pool.
+
+        Args:
+            workers (int, optional): Number of processes. Defaults to 1.
+        """
+        if workers <= 1:
+            self.create_enum_files()
+            self.create_struct_files()
+            self.create_module_file()
+            self.create_records_file()
+            self.create_dump_dict_file()
+            self.create_repack_dict_file()
+            return
+
         os.makedirs(self.extract_dir, exist_ok=True)
-        for enum in self.enums:
-            enum_name = Utils.convert_name_to_available(enum.name)
-            with open(
-                f"{os.path.join(self.extract_dir, enum_name)}.py", "wt", encoding="utf8"
-            ) as file:
-                file.write(String.ENUM_CLASS(enum_name) + String.NEWLINE)
-                for member in enum.members:
-                    value = (
-                        int(member.value)
-                        if enum.underlying_type == "int"
-                        else member.value
-                    )
+        tasks: list[tuple[str, int, int | None]] = [
+            ("create_dump_dict_file", 0, None),
+            ("create_repack_dict_file", 0, None),
+            ("create_module_file", 0, None),
+            ("create_records_file", 0, None),
+        ]
+        for method, types in (
+            ("create_struct_files", self.struct_modules),
+            ("create_enum_files", self.enum_modules),
+        ):
+            chunk_size = len(types) // (workers * CHUNKS_PER_WORKER) + 1
+            tasks += [
+                (method, start, start + chunk_size)
+                for start in range(0, len(types), chunk_size)
+            ]
+        with ProcessPoolExecutor(workers, initializer=_init_emitter, initargs=(self,)) as executor:
+            # Surface the first error of any task.
+            for _ in executor.map(_emit, *zip(*tasks)):
+                pass
+
+    def create_enum_files(self, start: int = 0, stop: int | None = None) -> None:
+        """Convert enum to python.
+
+        Args:
+            start (int, optional): Index of the first enum module to create. Defaults to 0.
+            stop (int | None, optional): Index after the last enum module to create. Defaults to all.
+        """
+        os.makedirs(self.extract_dir, exist_ok=True)
+        for module_name, enums in self.enum_modules[start:stop]:
+            if not self.__need_module(module_name):
+                continue
+            self.__write_module(
+                module_name, String.NEWLINE.join(map(self.__convert_enum, enums))
+            )
 
-                    file.write(String.INDENT)
-                    file.write(
-                        String.VARIABLE_ASSIGNMENT(
-                            Utils.convert_name_to_available(member.name), value
-                        )
+    def __convert_enum(self, enum: EnumType) -> str:
+        enum_name = Utils.convert_name_to_available(enum.name)
+        with io.StringIO() as file:
+            file.write(String.ENUM_CLASS(enum_name) + String.NEWLINE)
+            for member in enum.members:
+                value = (
+                    int(member.value)
+                    if enum.underlying_type == "int"
+                    else member.value
+                )
+
+                file.write(String.INDENT)
+                file.write(
+                    String.VARIABLE_ASSIGNMENT(
+                        Utils.convert_name_to_available(member.name), value
                     )
-                    file.write(String.NEWLINE)
+                )
+                file.write(String.NEWLINE)
+
+            return file.getvalue()
+
+    def create_struct_files(self, start: int = 0, stop: int | None = None) -> None:
+        """Convert struct to python.
 
-    def create_struct_files(self) -> None:
-        """Convert struct to python."""
+        Args:
+            start (int, optional): Index of the first struct module to create. Defaults to 0.
+            stop (int | None, optional): Index after the last struct module to create. Defaults to all.
+        """
         os.makedirs(self.extract_dir, exist_ok=True)
-        for struct in self.structs:
-            struct_name = Utils.convert_name_to_available(struct.name)
-            function_string = String.FB_START_AND_END_FUNCTION(len(struct.properties))
-            file = open(
-                f"{os.path.join(self.extract_dir, struct_name)}.py",
-                "wt",
-                encoding="utf8",
+        for module_name, structs in self.struct_modules[start:stop]:
+            if not self.__need_module(module_name):
+                continue
+            self.__write_module(
+                module_name,
+                String.FB_IMPORTS + "".join(map(self.__convert_struct, structs)),
             )
-            file.write(String.FB_BASIC_CLASS(struct_name, struct_name))
+
+    def __convert_struct(self, struct: StructTable) -> str:
+        struct_name = Utils.convert_name_to_available(struct.name)
+        function_string = String.FB_START_AND_END_FUNCTION(len(struct.properties))
+        with io.StringIO() as file:
+            file.write(String.FB_BASIC_CLASS(struct_name))
 
             for index, prop in enumerate(struct.properties):
                 method, func = "", ""
@@ -637,9 +1225,7 @@ class CompileToPython:
                     )
 
                 # Prop type is struct or enum.
-                elif prop_data := self.__type_in_struct_or_num(
-                    prop.data_type, self.structs, self.enums
-                ):
+                elif prop_data := self.__type_in_struct_or_num(prop.data_type):
                     if isinstance(prop_data, StructTable):
                         method, func = self.__convert_struct_type(
                             prop, index, prop_name, field_offset
@@ -659,51 +1245,133 @@ class CompileToPython:
                 function_string += func
 
             if function_string:
-                file.write(String.NEWLINE * 2 + function_string)
+                file.write(String.NEWLINE + function_string)
 
-        file.close()
+            return file.getvalue()
 
     def create_module_file(self) -> None:
         """Create flatbuffer module file."""
-        with open(
-            os.path.join(self.extract_dir, "__init__.py"),
-            "wt",
-            encoding="utf8",
-        ) as file:
+        if not self.__need_package_module("__init__"):
+            return
+        with io.StringIO() as file:
+            file.write(String.LAZY_MODULE_BASE)
+            file.write("TYPES = {\n")
             for enum in self.enums:
                 enum_name = Utils.convert_name_to_available(enum.name)
-                file.write(String.LOCAL_IMPORT(enum_name, enum_name) + String.NEWLINE)
+                file.write(String.LAZY_MODULE_ENTRY(enum_name, self.module_names[enum_name]))
 
             for struct in self.structs:
                 struct_name = Utils.convert_name_to_available(struct.name)
+                file.write(String.LAZY_MODULE_ENTRY(struct_name, self.module_names[struct_name]))
+            file.write("}\n")
+            file.write('"""Module defining each type."""\n\n')
+
+            file.write("STRUCTS = (\n")
+            for struct in self.structs:
+                file.write(f'    "{Utils.convert_name_to_available(struct.name)}",\n')
+            file.write(")\n")
+            file.write('"""Names of the FlatBuffer tables."""\n')
+            file.write(String.LAZY_MODULE_GETATTR)
+
+            self.__write_module("__init__", file.getvalue())
+
+    def create_records_file(self) -> None:
+        """Create the record class of every struct, with its dumped fields in declaration order."""
+        if not self.record_classes or not self.__need_package_module(self.RECORDS_NAME):
+            return
+        with io.StringIO() as file:
+            file.write(String.RECORDS_BASE)
+            for struct in self.structs:
+                fields = self.__record_fields(struct)
                 file.write(
-                    String.LOCAL_IMPORT(struct_name, struct_name) + String.NEWLINE
+                    String.RECORD_CLASS(
+                        Utils.convert_name_to_available(struct.name),
+                        ", ".join(f'"{name}"' for name in fields) + ("," if len(fields) == 1 else ""),
+                    )
                 )
+                if fields:
+                    file.write(
+                        String.RECORD_INIT(
+                            ", ".join(fields),
+                            "".join(String.RECORD_FIELD_ASSIGNMENT(name, name) for name in fields),
+                        )
+                    )
+            self.__write_module(self.RECORDS_NAME, file.getvalue())
+
+    def __record_fields(self, struct: StructTable) -> list[str]:
+        """Names of the fields a dump gives for a struct."""
+        return [
+            prop_name
+            for prop in struct.properties
+            if self.__wrap_value(prop, prop_name := Utils.convert_name_to_available(prop.name))
+        ]
+
+    def __wrap_value(self, prop: Property, p_name: str, plain: bool = False) -> str:
+        """Convert a prop of one table, or "" if the wrapper does not dump it."""
+        if not prop.is_list:
+            return self.__wrap_prop_value(prop, p_name, plain)
+        if func := self.__wrap_numpy_list(prop, p_name, plain):
+            return func
+        func = self.__wrap_list_prop_value(prop, p_name, plain)
+        return f"[{func}]" if func else ""
+
+    @staticmethod
+    def __wrap_convertion(data_type: str, getter: str, plain: bool) -> str:
+        """Convert a value of a type having a password, which plain dumps read as is."""
+        if not plain:
+            return String.WRAPPER_PASSWD_CONVERTION(ConvertFlag[data_type].value, getter)
+        return String.WRAPPER_PLAIN_STRING(getter) if data_type == "string" else getter
+
+    @staticmethod
+    def __wrap_dump(data_name: str, getter: str, plain: bool) -> str:
+        """Dump a nested table with the variant of its parent."""
+        if plain:
+            return String.WRAPPER_PLAIN_DUMP(data_name, getter)
+        return String.WRAPPER_PASSWD_CONVERTION(f"dump_{data_name}", getter)
+
+    def __wrap_numpy_list(self, prop: Property, p_name: str, plain: bool = False) -> str:
+        """Convert a whole scalar list from its NumPy view, or "" if it is not a scalar list."""
+        getter = String.WRAPPER_NUMPY_GETTER(p_name)
+        if prop.data_type == "bool":
+            return String.WRAPPER_NUMPY_LIST(f"{getter}.tolist()", p_name)
+        if prop.data_type in ConvertFlag.__members__ and prop.data_type != "string":
+            return String.WRAPPER_NUMPY_LIST(
+                f"{getter}.tolist()" if plain else String.WRAPPER_COLUMN_CONVERTION(getter, prop.data_type),
+                p_name,
+            )
+        prop_data = self.__type_in_struct_or_num(prop.data_type)
+        if isinstance(prop_data, EnumType):
+            return String.WRAPPER_NUMPY_LIST(
+                String.WRAPPER_COLUMN_ENUM_CONVERTION(
+                    Utils.convert_name_to_available(prop_data.name),
+                    f"{getter}.tolist()"
+                    if plain
+                    else String.WRAPPER_COLUMN_CONVERTION(getter, prop_data.underlying_type),
+                ),
+                p_name,
+            )
+        return ""
 
-    def __wrap_list_prop(self, prop: Property, p_name: str) -> str:
+    def __wrap_list_prop_value(self, prop: Property, p_name: str, plain: bool = False) -> str:
         func, convertion = "", ""
         if prop.data_type in ConvertFlag.__members__:
-            convertion = String.WRAPPER_PASSWD_CONVERTION(
-                ConvertFlag[prop.data_type].value, String.WRAPPER_LIST_GETTER(p_name)
+            convertion = self.__wrap_convertion(
+                prop.data_type, String.WRAPPER_LIST_GETTER(p_name), plain
             )
         elif prop.data_type == "bool":
             convertion = f"bool({String.WRAPPER_LIST_GETTER(p_name)})"
-        elif prop_data := self.__type_in_struct_or_num(
-            prop.data_type, self.structs, self.enums
-        ):
+        elif prop_data := self.__type_in_struct_or_num(prop.data_type):
             data_name = Utils.convert_name_to_available(prop_data.name)
             if isinstance(prop_data, StructTable):
-                convertion = String.WRAPPER_PASSWD_CONVERTION(
-                    f"dump_{Utils.convert_name_to_available(data_name)}",
-                    String.WRAPPER_LIST_GETTER(p_name),
+                convertion = self.__wrap_dump(
+                    data_name, String.WRAPPER_LIST_GETTER(p_name), plain
                 )
 
             elif isinstance(prop_data, EnumType):
                 convertion = String.WRAPPER_ENUM_CONVERTION(
                     data_name,
-                    String.WRAPPER_PASSWD_CONVERTION(
-                        ConvertFlag[prop_data.underlying_type].value,
-                        String.WRAPPER_LIST_GETTER(p_name),
+                    self.__wrap_convertion(
+                        prop_data.underlying_type, String.WRAPPER_LIST_GETTER(p_name), plain
                     ),
                 )
 
@@ -713,52 +1381,69 @@ class CompileToPython:
         if convertion:
             func = String.WRAPPER_LIST_CONVERTION(convertion, p_name)
 
-        if func:
-            func = String.WRAPPER_LIST_KV(p_name, func)
-
         return func
 
-    def __wrap_prop(self, prop: Property, p_name: str) -> str:
+    def __wrap_prop_value(self, prop: Property, p_name: str, plain: bool = False) -> str:
         func = ""
         if prop.data_type in ConvertFlag.__members__:
-            func = String.WRAPPER_PASSWD_CONVERTION(
-                ConvertFlag[prop.data_type].value, String.WRAPPER_GETTER(p_name)
-            )
+            func = self.__wrap_convertion(prop.data_type, String.WRAPPER_GETTER(p_name), plain)
         elif prop.data_type == "bool":
             func = f"bool({String.WRAPPER_GETTER(p_name)})"
-        elif prop_data := self.__type_in_struct_or_num(
-            prop.data_type, self.structs, self.enums
-        ):
+        elif prop_data := self.__type_in_struct_or_num(prop.data_type):
             data_name = Utils.convert_name_to_available(prop_data.name)
             if isinstance(prop_data, StructTable):
-                func = String.WRAPPER_PASSWD_CONVERTION(
-                    f"dump_{Utils.convert_name_to_available(data_name)}",
-                    String.WRAPPER_GETTER(p_name),
-                )
+                func = self.__wrap_dump(data_name, String.WRAPPER_GETTER(p_name), plain)
 
             elif isinstance(prop_data, EnumType):
                 func = String.WRAPPER_ENUM_CONVERTION(
                     data_name,
-                    String.WRAPPER_PASSWD_CONVERTION(
-                        ConvertFlag[prop_data.underlying_type].value,
-                        String.WRAPPER_GETTER(p_name),
+                    self.__wrap_convertion(
+                        prop_data.underlying_type, String.WRAPPER_GETTER(p_name), plain
                     ),
                 )
         elif prop.data_type == "bool":
             func = String.WRAPPER_GETTER(p_name)
 
-        if func:
-            func = String.WRAPPER_PROP_KV(p_name, func)
-
         return func
 
+    def __wrap_column(self, prop: Property, p_name: str) -> str:
+        """Convert one field of every record, batching scalar fields into one call."""
+        if prop.is_list:
+            if func := self.__wrap_numpy_list(prop, p_name):
+                return String.WRAPPER_COLUMN_PER_RECORD(func)
+            func = self.__wrap_list_prop_value(prop, p_name)
+            return String.WRAPPER_COLUMN_PER_RECORD(f"[{func}]") if func else ""
+
+        if prop.data_type == "string":
+            return String.WRAPPER_COLUMN_STRING_CONVERTION(String.WRAPPER_COLUMN_GETTER(p_name))
+
+        if prop.data_type in ConvertFlag.__members__ and prop.data_type != "string":
+            return String.WRAPPER_COLUMN_CONVERTION(
+                String.WRAPPER_COLUMN_GETTER(p_name), prop.data_type
+            )
+
+        prop_data = self.__type_in_struct_or_num(prop.data_type)
+        if isinstance(prop_data, EnumType):
+            return String.WRAPPER_COLUMN_ENUM_CONVERTION(
+                Utils.convert_name_to_available(prop_data.name),
+                String.WRAPPER_COLUMN_CONVERTION(
+                    String.WRAPPER_COLUMN_GETTER(p_name), prop_data.underlying_type
+                ),
+            )
+
+        func = self.__wrap_prop_value(prop, p_name)
+        return String.WRAPPER_COLUMN_PER_RECORD(func) if func else ""
+
     def create_dump_dict_file(self) -> None:
         """Dump excel structure of table to python dict."""
-        file = open(
-            os.path.join(self.extract_dir, f"{self.DUMP_WRAPPER_NAME}.py"),
-            "wt",
-            encoding="utf8",
-        )
+        if not self.__need_package_module(self.DUMP_WRAPPER_NAME):
+            return
+        if self.direct_decoders:
+            self.__write_module(self.DUMP_WRAPPER_NAME, self.__convert_direct_decoders())
+            return
+        file = io.StringIO()
+        if self.record_classes:
+            file.write(String.WRAPPER_RECORD_IMPORT)
         file.write(String.WRAPPER_BASE)
 
         for enum in self.enums:
@@ -782,109 +1467,674 @@ class CompileToPython:
             # if struct.name.endswith("Table"):
             # continue
             struct_name = Utils.convert_name_to_available(struct.name)
-            items = ""
+            items, plain_items = "", ""
             for prop in struct.properties:
                 prop_name = Utils.convert_name_to_available(prop.name)
-                func = ""
+                func = self.__wrap_value(prop, prop_name)
+                plain_func = self.__wrap_value(prop, prop_name, True)
+                if self.record_classes:
+                    items += (String.INDENT * 2 + String.WRAPPER_RECORD_ARG(func)) if func else ""
+                    plain_items += (String.INDENT * 2 + String.WRAPPER_RECORD_ARG(plain_func)) if plain_func else ""
+                else:
+                    items += String.INDENT * 2 + (String.WRAPPER_PROP_KV(prop_name, func) if func else "")
+                    plain_items += String.INDENT * 2 + (String.WRAPPER_PROP_KV(prop_name, plain_func) if plain_func else "")
+            # Database rows are not encrypted, so they are dumped by the plain variant without any key work.
+            if self.record_classes:
+                file.write(String.WRAPPER_RECORD_FUNC(struct_name, struct_name, struct_name, items))
+                file.write(String.WRAPPER_RECORD_PLAIN_FUNC(struct_name, struct_name, struct_name, plain_items))
+            else:
+                file.write(String.WRAPPER_FUNC(struct_name, items))
+                file.write(String.WRAPPER_PLAIN_FUNC(struct_name, plain_items))
+
+            if struct.name.endswith("Excel"):
+                columns, items, names = "", "", []
+                for prop in struct.properties:
+                    prop_name = Utils.convert_name_to_available(prop.name)
+                    if column := self.__wrap_column(prop, prop_name):
+                        columns += String.WRAPPER_COLUMN_ASSIGNMENT(prop_name, column)
+                        items += String.WRAPPER_COLUMN_KV(prop_name, prop_name)
+                        names.append(f"c_{prop_name}")
+                if self.record_classes:
+                    file.write(
+                        String.WRAPPER_RECORD_COLUMNS_FUNC(
+                            struct_name, columns, self.__record_columns(struct_name, names)
+                        )
+                    )
+                else:
+                    file.write(String.WRAPPER_COLUMNS_FUNC(struct_name, columns, items))
 
-                if prop.is_list:
-                    func = self.__wrap_list_prop(prop, prop_name)
+        self.__write_module(self.DUMP_WRAPPER_NAME, file.getvalue())
+        file.close()
 
+    @staticmethod
+    def __record_columns(struct_name: str, columns: list[str]) -> str:
+        """Build the records of a DataList from its converted columns."""
+        if not columns:
+            return String.WRAPPER_RECORD_EACH(struct_name)
+        return String.WRAPPER_RECORD_MAP(struct_name, ", ".join(columns))
+
+    def __convert_direct_decoders(self) -> str:
+        """Create the dump wrapper reading FlatBuffer bytes directly.
+
+        Each table is decoded by a function reading its whole vtable once, and
+        each DataList by one gathering raw columns that are converted like the
+        accessor based wrapper does, so both give the same dicts.
+        """
+        with io.StringIO() as file:
+            if self.record_classes:
+                file.write(String.WRAPPER_RECORD_IMPORT)
+            file.write(String.WRAPPER_DIRECT_BASE)
+
+            for enum in self.enums:
+                names: dict[int, str] = {}
+                for kv in enum.members:
+                    names.setdefault(int(kv.value), Utils.convert_name_to_available(kv.name))
+                file.write(
+                    String.WRAPPER_DIRECT_ENUM_NAMES(
+                        Utils.convert_name_to_available(enum.name),
+                        ", ".join(f'{value}: "{name}"' for value, name in names.items()),
+                    )
+                )
+
+            tables = ""
+            for struct in self.structs:
+                struct_name = Utils.convert_name_to_available(struct.name)
+                offsets = self.__direct_offsets(struct)
+                items, plain_items = "", ""
+                for index, prop in enumerate(struct.properties):
+                    if not (value := self.__direct_value(prop, index)):
+                        continue
+                    plain_value = self.__direct_value(prop, index, True)
+                    if self.record_classes:
+                        items += String.INDENT * 2 + String.WRAPPER_RECORD_ARG(value)
+                        plain_items += String.INDENT * 2 + String.WRAPPER_RECORD_ARG(plain_value)
+                    else:
+                        prop_name = Utils.convert_name_to_available(prop.name)
+                        items += String.INDENT * 2 + String.WRAPPER_PROP_KV(prop_name, value)
+                        plain_items += String.INDENT * 2 + String.WRAPPER_PROP_KV(prop_name, plain_value)
+                if self.record_classes:
+                    file.write(
+                        String.WRAPPER_DIRECT_RECORD_FUNC(
+                            struct_name,
+                            len(struct.properties),
+                            struct_name,
+                            struct_name,
+                            offsets,
+                            struct_name,
+                            struct_name,
+                            items,
+                            struct_name,
+                            struct_name,
+                            struct_name,
+                        )
+                    )
+                    file.write(
+                        String.WRAPPER_DIRECT_RECORD_PLAIN_FUNC(
+                            struct_name,
+                            struct_name,
+                            offsets,
+                            struct_name,
+                            struct_name,
+                            plain_items,
+                            struct_name,
+                            struct_name,
+                            struct_name,
+                        )
+                    )
                 else:
-                    func = self.__wrap_prop(prop, prop_name)
+                    file.write(
+                        String.WRAPPER_DIRECT_FUNC(
+                            struct_name,
+                            len(struct.properties),
+                            struct_name,
+                            offsets,
+                            struct_name,
+                            items,
+                            struct_name,
+                            struct_name,
+                        )
+                    )
+                    file.write(
+                        String.WRAPPER_DIRECT_PLAIN_FUNC(
+                            struct_name, offsets, struct_name, plain_items, struct_name, struct_name
+                        )
+                    )
 
-                items += String.INDENT * 2 + func
-            file.write(String.WRAPPER_FUNC(struct_name, items))
+                if struct.name.endswith("Excel"):
+                    file.write(self.__direct_columns(struct, offsets))
+                    tables += String.WRAPPER_DIRECT_TABLE_ENTRY(
+                        f"{struct_name}Table", struct_name, struct.name.removesuffix("Excel")
+                    )
 
-        file.close()
+            file.write(String.WRAPPER_DIRECT_TABLES(tables))
+            return file.getvalue()
+
+    def __direct_offsets(self, struct: StructTable) -> str:
+        """Unpacking target of the field offsets of a table."""
+        offsets = ", ".join(
+            String.WRAPPER_DIRECT_OFFSET(index) for index in range(len(struct.properties))
+        )
+        return f"({offsets},)" if len(struct.properties) == 1 else offsets
+
+    def __direct_read(self, prop: Property, index: int) -> tuple[str, str]:
+        """Read a non-list field as its raw value, with the type converting it.
+
+        Returns:
+            tuple[str, str]: Read code and the scalar type of the value, which
+            is the underlying type for enums, "string" or "bool". Both are empty
+            for fields the wrapper does not dump.
+        """
+        offset, position = (
+            String.WRAPPER_DIRECT_OFFSET(index),
+            String.WRAPPER_DIRECT_FIELD(index),
+        )
+        data_type = prop.data_type
+        if data_type == "string":
+            return String.WRAPPER_DIRECT_STRING(position, offset), data_type
+        if data_type not in ConvertFlag.__members__ and data_type != "bool":
+            prop_data = self.__type_in_struct_or_num(data_type)
+            if not isinstance(prop_data, EnumType):
+                return "", ""
+            data_type = prop_data.underlying_type
+        default = "False" if data_type == "bool" else "0"
+        return String.WRAPPER_DIRECT_SCALAR(data_type, position, offset, default), data_type
+
+    def __direct_convertion(self, prop: Property, value: str, plain: bool = False) -> str:
+        """Convert one raw value of a field like the accessor based wrapper does."""
+        if prop.data_type in ConvertFlag.__members__:
+            return self.__wrap_convertion(prop.data_type, value, plain)
+        if prop.data_type == "bool":
+            return value
+        prop_data = self.__type_in_struct_or_num(prop.data_type)
+        if isinstance(prop_data, StructTable):
+            decode = String.WRAPPER_DIRECT_PLAIN_DECODE if plain else String.WRAPPER_DIRECT_DECODE
+            return decode(Utils.convert_name_to_available(prop_data.name), value)
+        if isinstance(prop_data, EnumType):
+            return String.WRAPPER_DIRECT_ENUM_CONVERTION(
+                Utils.convert_name_to_available(prop_data.name),
+                self.__wrap_convertion(prop_data.underlying_type, value, plain),
+            )
+        return ""
+
+    def __direct_items(self, prop: Property, index: int) -> tuple[str, str]:
+        """Read the raw items of a dumped list field, with the type converting them.
+
+        Returns:
+            tuple[str, str]: Read code and the scalar type of the items, which is
+            the underlying type for enums, "string", "bool", or empty for tables.
+        """
+        position = String.WRAPPER_DIRECT_FIELD(index)
+        data_type = prop.data_type
+        if data_type == "string":
+            return f"strings(buf, {position})", data_type
+        if data_type not in DataFormat.__members__:
+            prop_data = self.__type_in_struct_or_num(data_type)
+            if isinstance(prop_data, StructTable):
+                return f"tables(buf, {position})", ""
+            data_type = prop_data.underlying_type
+        return f'scalars(buf, {position}, "{DataFormat[data_type].value}")', data_type
+
+    def __direct_value(self, prop: Property, index: int, plain: bool = False) -> str:
+        """Decode and convert a field of one table, or "" if the wrapper does not dump it."""
+        offset = String.WRAPPER_DIRECT_OFFSET(index)
+        if prop.is_list:
+            if not (convertion := self.__direct_convertion(prop, "value", plain)):
+                return ""
+            items, _ = self.__direct_items(prop, index)
+            if convertion == "value":
+                return String.WRAPPER_DIRECT_ITEMS(items, offset)
+            return String.WRAPPER_DIRECT_LIST(convertion, items, offset)
+
+        if plain and prop.data_type == "string":
+            return String.WRAPPER_DIRECT_PLAIN_STRING(String.WRAPPER_DIRECT_FIELD(index), offset)
+        if read := self.__direct_read(prop, index)[0]:
+            return self.__direct_convertion(prop, read, plain)
+        if isinstance(self.__type_in_struct_or_num(prop.data_type), StructTable):
+            return (
+                self.__direct_convertion(prop, String.WRAPPER_DIRECT_TABLE(index, index), plain)
+                + f" if {offset} else None"
+            )
+        return ""
+
+    def __direct_columns(self, struct: StructTable, offsets: str) -> str:
+        """Decode a whole DataList, converting scalar and string fields one column at a time."""
+        struct_name = Utils.convert_name_to_available(struct.name)
+        inits, appends, columns, items, names = "", "", "", "", []
+        for index, prop in enumerate(struct.properties):
+            prop_name = Utils.convert_name_to_available(prop.name)
+            column = f"c_{prop_name}"
+            if not prop.is_list:
+                read, data_type = self.__direct_read(prop, index)
+            elif self.__direct_convertion(prop, "value"):
+                # Items of every record are converted as one column, then split again.
+                read, data_type = self.__direct_items(prop, index)
+                read += f" if {String.WRAPPER_DIRECT_OFFSET(index)} else ()"
+                column = String.WRAPPER_DIRECT_COLUMN_FLATTEN(prop_name)
+            else:
+                continue
+
+            if data_type == "string":
+                convertion = String.WRAPPER_COLUMN_STRING_CONVERTION(column)
+            elif data_type and data_type != "bool":
+                convertion = String.WRAPPER_COLUMN_CONVERTION(column, data_type)
+                if prop.data_type not in ConvertFlag.__members__:
+                    # Enum values are converted as their underlying type first.
+                    convertion = String.WRAPPER_DIRECT_COLUMN_ENUM_CONVERTION(
+                        Utils.convert_name_to_available(prop.data_type), convertion
+                    )
+            elif read := self.__direct_value(prop, index):
+                convertion = ""
+            else:
+                continue
+            if convertion:
+                if prop.is_list:
+                    convertion = String.WRAPPER_DIRECT_COLUMN_SPLIT(convertion, prop_name)
+                columns += String.WRAPPER_COLUMN_ASSIGNMENT(prop_name, convertion)
+            inits += String.WRAPPER_DIRECT_COLUMN_INIT(prop_name)
+            appends += String.WRAPPER_DIRECT_COLUMN_APPEND(prop_name, read)
+            items += String.WRAPPER_COLUMN_KV(prop_name, prop_name)
+            names.append(f"c_{prop_name}")
+        if self.record_classes:
+            return String.WRAPPER_DIRECT_RECORD_COLUMNS_FUNC(
+                struct_name,
+                inits,
+                offsets,
+                struct_name,
+                appends,
+                columns,
+                self.__record_columns(struct_name, names),
+            )
+        return String.WRAPPER_DIRECT_COLUMNS_FUNC(
+            struct_name, inits, offsets, struct_name, appends, columns, items
+        )
 
     def create_repack_dict_file(self) -> None:
-        WRAPPER_PACK_BASE = """import flatbuffers
-from lib.encryption import xor, create_key, convert_short, convert_ushort, convert_int, convert_uint, convert_long, convert_ulong, encrypt_float, encrypt_double, encrypt_string
-from . import *
+        WRAPPER_PACK_BASE = """import sys
+import flatbuffers
+import numpy as np
+from lib.encryption import xor, create_key, convert_short, convert_ushort, convert_int, convert_uint, convert_long, convert_ulong, encrypt_float, encrypt_double, encrypt_string, encrypt_strings, encrypt_column
+
+# Types are taken from the lazily loading package, so only the packed ones get imported.
+flat_data = sys.modules[__package__]
     """
-        self.enums_by_name = {enum.name: enum for enum in self.enums}
-        self.structs_by_name = {struct.name : struct for struct in self.structs}
+        if not self.__need_package_module("repack_wrapper"):
+            return
         os.makedirs(self.extract_dir, exist_ok=True)
-        repack_path = os.path.join(self.extract_dir, "repack_wrapper.py")
-        
-        with open(repack_path, "wt", encoding="utf8") as file:
+
+        with io.StringIO() as file:
             file.write(WRAPPER_PACK_BASE)
             file.write("\n\n")
+            if self.direct_packers:
+                file.write(String.WRAPPER_DIRECT_PACK_BASE + "\n")
+                for enum in self.enums:
+                    file.write(
+                        String.WRAPPER_DIRECT_ENUM_VALUES(
+                            Utils.convert_name_to_available(enum.name),
+                            ", ".join(
+                                f'"{Utils.convert_name_to_available(kv.name)}": {int(kv.value)}'
+                                for kv in enum.members
+                            ),
+                        )
+                    )
+                file.write("\n\n")
 
             for struct in self.structs:
-                struct_name = Utils.convert_name_to_available(struct.name)
-                if struct_name.endswith("ExcelTable"):
-                    record_type = struct_name[:-5]
-                    file.write(f"def pack_{struct_name}(builder: flatbuffers.Builder, dump_list: list, encrypt=True) -> int:\n")
-                    file.write("    offsets = []\n")
-                    file.write("    for record in dump_list:\n")
-                    file.write(f"        offsets.append(pack_{record_type}(builder, record, encrypt))\n")
-                    file.write(f"    {struct_name}.StartDataListVector(builder, len(offsets))\n")
-                    file.write("    for offset in reversed(offsets):\n")
-                    file.write("        builder.PrependUOffsetTRelative(offset)\n")
-                    file.write("    data_list = builder.EndVector(len(offsets))\n")
-                    file.write(f"    {struct_name}.Start(builder)\n")
-                    file.write(f"    {struct_name}.AddDataList(builder, data_list)\n")
-                    file.write(f"    return {struct_name}.End(builder)\n\n")
+                if self.direct_packers and (packer := self.__convert_direct_packer(struct)):
+                    file.write(packer)
+                    # Plain packers, for data stored unencrypted, do no key work at all.
+                    file.write(self.__convert_direct_packer(struct, True))
                     continue
+                file.write(self.__convert_packer(struct))
+                file.write(self.__convert_packer(struct, True))
+
+            self.__write_module("repack_wrapper", file.getvalue())
+
+    def __convert_packer(self, struct: StructTable, plain: bool = False) -> str:
+        """Create the Builder based packer of a struct.
 
+        The plain variant, named pack_<struct_name>_plain, packs data stored
+        unencrypted such as database rows. It lays out the same bytes as the
+        encrypted packer with encrypt=False, without deriving a key or calling
+        any conversion per field.
+        """
+        struct_name = Utils.convert_name_to_available(struct.name)
+        with io.StringIO() as file:
+            if struct_name.endswith("ExcelTable"):
+                record_type = struct_name[:-5]
+                record_struct = self.structs_by_name[struct.properties[0].data_type]
+                if plain:
+                    file.write(f"def pack_{struct_name}_plain(builder: flatbuffers.Builder, dump_list: list) -> int:\n")
+                    file.write(f"    {struct_name} = flat_data.{struct_name}\n")
+                    file.write(f"    offsets = [pack_{record_type}_plain(builder, record) for record in dump_list]\n")
+                else:
+                    column_codes = [
+                        code
+                        for prop in record_struct.properties
+                        if (code := self._get_column_conversion_code(prop))
+                    ]
+                    file.write(f"def pack_{struct_name}(builder: flatbuffers.Builder, dump_list: list, encrypt=True) -> int:\n")
+                    file.write(self.__get_type_bindings(struct_name, record_struct))
+                    file.write("    offsets = []\n")
+                    if column_codes:
+                        # Encrypt every scalar and string field of the DataList in one call per field.
+                        file.write(f'    password = create_key("{record_struct.name[:-5]}") if encrypt else None\n')
+                        file.write("    columns = zip(\n")
+                        for code in column_codes:
+                            file.write(f"        {code},\n")
+                        file.write("    )\n")
+                        file.write("    for record, encrypted in zip(dump_list, columns):\n")
+                        file.write(f"        offsets.append(pack_{record_type}(builder, record, encrypt, encrypted))\n")
+                    else:
+                        file.write("    for record in dump_list:\n")
+                        file.write(f"        offsets.append(pack_{record_type}(builder, record, encrypt))\n")
+                file.write(f"    {struct_name}.StartDataListVector(builder, len(offsets))\n")
+                file.write("    for offset in reversed(offsets):\n")
+                file.write("        builder.PrependUOffsetTRelative(offset)\n")
+                file.write("    data_list = builder.EndVector(len(offsets))\n")
+                file.write(f"    {struct_name}.Start(builder)\n")
+                file.write(f"    {struct_name}.AddDataList(builder, data_list)\n")
+                file.write(f"    return {struct_name}.End(builder)\n\n")
+                return file.getvalue()
+
+            column_fields = [
+                prop
+                for prop in struct.properties
+                if not plain and struct.name.endswith("Excel") and self._get_column_conversion_code(prop)
+            ]
+            if plain:
+                file.write(f"def pack_{struct_name}_plain(builder: flatbuffers.Builder, data: dict) -> int:\n")
+            elif column_fields:
+                file.write(f"def pack_{struct_name}(builder: flatbuffers.Builder, data: dict, encrypt=True, encrypted: tuple | None = None) -> int:\n")
+            else:
                 file.write(f"def pack_{struct_name}(builder: flatbuffers.Builder, data: dict, encrypt=True) -> int:\n")
+            file.write(self.__get_type_bindings(struct_name, struct))
+            if not plain:
                 password_key = struct.name[:-5] if struct.name.endswith("Excel") else struct.name
                 file.write(f'    password = create_key("{password_key}") if encrypt else None\n')
-                
-                # Process all strings first
-                string_fields = [prop for prop in struct.properties if prop.data_type == "string" and not prop.is_list]
-                for prop in string_fields:
-                    file.write(f"    {prop.name}_off = builder.CreateString(encrypt_string(data.get('{prop.name}', ''), password))\n")
-
-                # Process vectors with proper element handling
-                vector_fields = [prop for prop in struct.properties if prop.is_list]
-                for prop in vector_fields:
-                    file.write(f"    {prop.name}_vec = 0\n")
-                    file.write(f"    if '{prop.name}' in data:\n")
-                    file.write(f"        {prop.name}_items = data['{prop.name}']\n")
-                    elem, data_type = self._get_conversion_code(prop, "item")
-                    if data_type == "string":
-                        file.write(f"        {prop.name}_str_offsets = [builder.CreateString(encrypt_string(item, password)) for item in {prop.name}_items]\n")
-                        file.write(f"        {struct_name}.Start{prop.name}Vector(builder, len({prop.name}_str_offsets))\n")
-                        file.write(f"        for offset in reversed({prop.name}_str_offsets):\n")
-                        file.write(f"            builder.PrependUOffsetTRelative(offset)\n")
-                    elif data_type in self.structs_by_name:
-                        elem = f"pack_{data_type}(builder, item, encrypt)"
+
+            column_names = {prop.name for prop in column_fields}
+            if column_fields:
+                # Fields already encrypted by the table packer arrive in property order.
+                file.write("    if encrypted is None:\n")
+                for prop in column_fields:
+                    if prop.data_type == "string":
+                        conv_code = f"encrypt_string(data.get('{prop.name}', ''), password)"
                     else:
-                        if data_type not in DataFlag.__members__:
-                            print(data_type)
-                        file.write(f"        {struct_name}.Start{prop.name}Vector(builder, len({prop.name}_items))\n")
-                        file.write(f"        for item in reversed({prop.name}_items):\n")
-                        file.write(f"            builder.Prepend{DataFlag.__members__.get(data_type, DataFlag.int).value}({elem})\n")
-                    
-                    file.write(f"        {prop.name}_vec = builder.EndVector(len({prop.name}_items))\n")
-
-                # Process scalar values
-                scalar_fields = [prop for prop in struct.properties if not prop.is_list and prop.data_type != "string"]
-                for prop in scalar_fields:
-                    conv_code, _ = self._get_conversion_code(prop, f"data.get('{prop.name}', 0)")
-                    file.write(f"    {prop.name}_val = {conv_code}\n")
-
-                # Build final object
-                file.write(f"    {struct_name}.Start(builder)\n")
-                for prop in struct.properties:
-                    if prop in string_fields:
-                        file.write(f"    {struct_name}.Add{prop.name}(builder, {prop.name}_off)\n")
-                    elif prop in vector_fields:
-                        file.write(f"    {struct_name}.Add{prop.name}(builder, {prop.name}_vec)\n")
+                        conv_code, _ = self._get_conversion_code(prop, f"data.get('{prop.name}', 0)")
+                    file.write(f"        {prop.name}_val = {conv_code}\n")
+                file.write("    else:\n")
+                targets = ", ".join(f"{prop.name}_val" for prop in column_fields)
+                file.write(f"        {targets}{',' if len(column_fields) == 1 else ''} = encrypted\n")
+
+            # Process all strings first
+            string_fields = [prop for prop in struct.properties if prop.data_type == "string" and not prop.is_list]
+            for prop in string_fields:
+                if prop.name in column_names:
+                    file.write(f"    {prop.name}_off = builder.CreateString({prop.name}_val)\n")
+                else:
+                    value = self._get_string_conversion_code(f"data.get('{prop.name}', '')", plain)
+                    file.write(f"    {prop.name}_off = builder.CreateString({value})\n")
+
+            # Process vectors with proper element handling
+            vector_fields = [prop for prop in struct.properties if prop.is_list]
+            for prop in vector_fields:
+                file.write(f"    {prop.name}_vec = 0\n")
+                file.write(f"    if '{prop.name}' in data:\n")
+                file.write(f"        {prop.name}_items = data['{prop.name}']\n")
+                elem, data_type = self._get_conversion_code(prop, "item", plain=plain)
+                if data_type == "string":
+                    file.write(f"        {prop.name}_str_offsets = [builder.CreateString({self._get_string_conversion_code('item', plain)}) for item in {prop.name}_items]\n")
+                    file.write(f"        {struct_name}.Start{prop.name}Vector(builder, len({prop.name}_str_offsets))\n")
+                    file.write(f"        for offset in reversed({prop.name}_str_offsets):\n")
+                    file.write(f"            builder.PrependUOffsetTRelative(offset)\n")
+                elif data_type in self.structs_by_name:
+                    elem = f"pack_{data_type}_plain(builder, item)" if plain else f"pack_{data_type}(builder, item, encrypt)"
+                elif values := self._get_vector_conversion_code(prop, f"{prop.name}_items", plain=plain):
+                    # Scalar lists are encrypted at once and written from an array.
+                    file.write(f'        {prop.name}_vec = builder.CreateNumpyVector(np.array({values}, dtype="<{DataFormat[data_type].value}"))\n')
+                    continue
+                else:
+                    if data_type not in DataFlag.__members__:
+                        print(data_type)
+                    file.write(f"        {struct_name}.Start{prop.name}Vector(builder, len({prop.name}_items))\n")
+                    file.write(f"        for item in reversed({prop.name}_items):\n")
+                    file.write(f"            builder.Prepend{DataFlag.__members__.get(data_type, DataFlag.int).value}({elem})\n")
+
+                file.write(f"        {prop.name}_vec = builder.EndVector(len({prop.name}_items))\n")
+
+            # Process scalar values
+            scalar_fields = [prop for prop in struct.properties if not prop.is_list and prop.data_type != "string"]
+            for prop in scalar_fields:
+                if prop.name in column_names:
+                    continue
+                conv_code, _ = self._get_conversion_code(prop, f"data.get('{prop.name}', 0)", plain=plain)
+                file.write(f"    {prop.name}_val = {conv_code}\n")
+
+            # Build final object
+            file.write(f"    {struct_name}.Start(builder)\n")
+            for prop in struct.properties:
+                if prop.data_type == "string" and not prop.is_list:
+                    file.write(f"    {struct_name}.Add{prop.name}(builder, {prop.name}_off)\n")
+                elif prop.is_list:
+                    file.write(f"    {struct_name}.Add{prop.name}(builder, {prop.name}_vec)\n")
+                else:
+                    file.write(f"    {struct_name}.Add{prop.name}(builder, {prop.name}_val)\n")
+            file.write(f"    return {struct_name}.End(builder)\n\n")
+            return file.getvalue()
+
+    def __direct_pack_type(self, prop: Property) -> str:
+        """Type a field is written as by a direct packer, "offset" for strings and lists, or "" if not supported."""
+        if prop.is_list:
+            if prop.data_type == "string":
+                return "offset"
+            _, data_type = self._get_conversion_code(prop, "item")
+            return "offset" if data_type in DataFormat.__members__ else ""
+        if prop.data_type == "string":
+            return "offset"
+        if prop.data_type in DataFlag.__members__:
+            return prop.data_type
+        prop_data = self.__type_in_struct_or_num(prop.data_type)
+        if isinstance(prop_data, EnumType) and prop.data_type in self.enums_by_name:
+            return prop_data.underlying_type
+        return ""
+
+    def __convert_direct_packer(self, struct: StructTable, plain: bool = False) -> str:
+        """Create the packer of a struct writing its table directly, or "" if a field is not supported.
+
+        Packers are generated like the Builder based ones and lay out the same
+        bytes. The key is derived once per call, and once per table for every
+        record of a DataList. Plain packers write the values as they are.
+        """
+        struct_name = Utils.convert_name_to_available(struct.name)
+        if struct_name.endswith("ExcelTable"):
+            record_struct = self.structs_by_name[struct.properties[0].data_type]
+            if not all(self.__direct_pack_type(prop) for prop in record_struct.properties):
+                return ""
+            return self.__convert_direct_table_packer(struct_name, record_struct, plain)
+        if not all(self.__direct_pack_type(prop) for prop in struct.properties):
+            return ""
+
+        column_fields = [
+            prop
+            for prop in struct.properties
+            if not plain and struct.name.endswith("Excel") and self._get_column_conversion_code(prop)
+        ]
+        column_names = {prop.name for prop in column_fields}
+        password_key = struct.name[:-5] if struct.name.endswith("Excel") else struct.name
+        with io.StringIO() as file:
+            if plain:
+                file.write(f"def pack_{struct_name}_plain(builder: flatbuffers.Builder, data: dict) -> int:\n")
+            elif column_fields:
+                file.write(f"def pack_{struct_name}(builder: flatbuffers.Builder, data: dict, encrypt=True, encrypted: tuple | None = None) -> int:\n")
+                file.write(f'    return _pack_{struct_name}(builder, data, create_key("{password_key}") if encrypt else None, encrypted)\n\n')
+            else:
+                file.write(f"def pack_{struct_name}(builder: flatbuffers.Builder, data: dict, encrypt=True) -> int:\n")
+                file.write(f'    return _pack_{struct_name}(builder, data, create_key("{password_key}") if encrypt else None)\n\n')
+            if not plain:
+                file.write(f"def _pack_{struct_name}(builder: flatbuffers.Builder, data: dict, password: bytes | None, encrypted: tuple | None = None) -> int:\n")
+
+            if column_fields:
+                # Fields already encrypted by the table packer arrive in property order.
+                file.write("    if encrypted is None:\n")
+                for prop in column_fields:
+                    if prop.data_type == "string":
+                        conv_code = f"encrypt_string(data.get('{prop.name}', ''), password)"
                     else:
-                        file.write(f"    {struct_name}.Add{prop.name}(builder, {prop.name}_val)\n")
-                file.write(f"    return {struct_name}.End(builder)\n\n")
+                        conv_code, _ = self._get_conversion_code(prop, f"data.get('{prop.name}', 0)", True)
+                    file.write(f"        {prop.name}_val = {conv_code}\n")
+                file.write("    else:\n")
+                targets = ", ".join(f"{prop.name}_val" for prop in column_fields)
+                file.write(f"        {targets}{',' if len(column_fields) == 1 else ''} = encrypted\n")
+
+            for prop in struct.properties:
+                if prop.data_type == "string" and not prop.is_list:
+                    value = f"{prop.name}_val" if prop.name in column_names else self._get_string_conversion_code(f"data.get('{prop.name}', '')", plain)
+                    file.write(f"    {prop.name}_off = create_string(builder, {value})\n")
 
-    def _get_conversion_code(self, prop, value_var):
-        """Helper to generate type-specific conversion code"""
+            for prop in struct.properties:
+                if not prop.is_list:
+                    continue
+                file.write(f"    {prop.name}_vec = 0\n")
+                file.write(f"    if '{prop.name}' in data:\n")
+                if prop.data_type == "string":
+                    file.write(f"        {prop.name}_vec = create_offsets(builder, [create_string(builder, {self._get_string_conversion_code('item', plain)}) for item in data['{prop.name}']])\n")
+                else:
+                    elem, data_type = self._get_conversion_code(prop, "item", True, plain)
+                    values = self._get_vector_conversion_code(prop, f"data['{prop.name}']", True, plain) or f"[{elem} for item in data['{prop.name}']]"
+                    file.write(f'        {prop.name}_vec = create_vector(builder, "{DataFormat[data_type].value}", {DataSize[data_type].value}, {values})\n')
+
+            for prop in struct.properties:
+                if prop.is_list or prop.data_type == "string" or prop.name in column_names:
+                    continue
+                conv_code, _ = self._get_conversion_code(prop, f"data.get('{prop.name}', 0)", True, plain)
+                file.write(f"    {prop.name}_val = {conv_code}\n")
+
+            fields = []
+            for prop in struct.properties:
+                if prop.is_list:
+                    fields.append((f"{prop.name}_vec", "offset"))
+                elif prop.data_type == "string":
+                    fields.append((f"{prop.name}_off", "offset"))
+                else:
+                    fields.append((f"{prop.name}_val", self.__direct_pack_type(prop)))
+            file.write(self.__direct_table_code(fields))
+            return file.getvalue()
+
+    def __convert_direct_table_packer(self, struct_name: str, record_struct: StructTable, plain: bool = False) -> str:
+        """Create the packer of a DataList table whose records are packed directly."""
+        record_type = Utils.convert_name_to_available(record_struct.name)
+        if plain:
+            with io.StringIO() as file:
+                file.write(f"def pack_{struct_name}_plain(builder: flatbuffers.Builder, dump_list: list) -> int:\n")
+                file.write(f"    offsets = [pack_{record_type}_plain(builder, record) for record in dump_list]\n")
+                file.write("    data_list = create_offsets(builder, offsets)\n")
+                file.write(self.__direct_table_code([("data_list", "offset")]))
+                return file.getvalue()
+        column_codes = [
+            code
+            for prop in record_struct.properties
+            if (code := self._get_column_conversion_code(prop, True))
+        ]
+        with io.StringIO() as file:
+            file.write(f"def pack_{struct_name}(builder: flatbuffers.Builder, dump_list: list, encrypt=True) -> int:\n")
+            file.write(f'    password = create_key("{record_struct.name[:-5]}") if encrypt else None\n')
+            file.write("    offsets = []\n")
+            if column_codes:
+                # Encrypt every scalar and string field of the DataList in one call per field.
+                file.write("    columns = zip(\n")
+                for code in column_codes:
+                    file.write(f"        {code},\n")
+                file.write("    )\n")
+                file.write("    for record, encrypted in zip(dump_list, columns):\n")
+                file.write(f"        offsets.append(_pack_{record_type}(builder, record, password, encrypted))\n")
+            else:
+                file.write("    for record in dump_list:\n")
+                file.write(f"        offsets.append(_pack_{record_type}(builder, record, password))\n")
+            file.write("    data_list = create_offsets(builder, offsets)\n")
+            file.write(self.__direct_table_code([("data_list", "offset")]))
+            return file.getvalue()
+
+    @staticmethod
+    def __direct_table_code(fields: list[tuple[str, str]]) -> str:
+        """Lay out the fields of a table in the order Builder adds them, skipping default values.
+
+        Args:
+            fields (list[tuple[str, str]]): Variable holding each field, and the
+                type it is written as, "offset" for strings and vectors.
+        """
+        slots = [f"s{index}" for index in range(len(fields))]
+        sizes = [
+            DataSize.struct.value if data_type == "offset" else DataSize[data_type].value
+            for _, data_type in fields
+        ]
+        with io.StringIO() as file:
+            file.write(f"    buf, end = reserve(builder, {12 + 2 * len(fields) + 2 * sum(sizes)})\n")
+            file.write("    off = object_end = end - builder.head\n")
+            file.write(f"    {' = '.join(slots)} = 0\n")
+            for (variable, data_type), slot, size in zip(fields, slots, sizes):
+                file.write(f"    if {variable}:\n")
+                if size == 1:
+                    file.write("        off += 1\n")
+                else:
+                    file.write(f"        off = ((off + {size - 1}) & -{size}) + {size}\n")
+                if data_type == "offset":
+                    file.write(f"        write_uoffset(buf, end - off, off - {variable})\n")
+                else:
+                    file.write(f"        write_{data_type}(buf, end - off, {variable})\n")
+                if size == 8:
+                    file.write("        builder.minalign = 8\n")
+                file.write(f"        {slot} = off\n")
+            file.write(f"    return end_object(builder, buf, end, off, object_end, ({', '.join(slots)}{',' if len(slots) == 1 else ''}))\n\n")
+            return file.getvalue()
+
+    def __get_type_bindings(self, struct_name: str, fields_struct: StructTable) -> str:
+        """Bind a packed struct and the enums of its fields to locals, taken from the package."""
+        bindings = f"    {struct_name} = flat_data.{struct_name}\n"
+        for data_type in dict.fromkeys(prop.data_type for prop in fields_struct.properties):
+            if data_type in self.enums_by_name:
+                bindings += f"    {data_type} = flat_data.{Utils.convert_name_to_available(data_type)}\n"
+        return bindings
+
+    def _get_column_conversion_code(self, prop, enum_values=False):
+        """Helper to generate code encrypting one scalar or string field of a whole DataList, or "" if it cannot be batched"""
+        if prop.is_list:
+            return ""
+        if prop.data_type == "string":
+            return f"encrypt_strings([record.get('{prop.name}', '') for record in dump_list], password)"
+        value_var = f"record.get('{prop.name}', 0)"
+        if prop.data_type in self.enums_by_name:
+            return f'encrypt_column([{self.__enum_value_code(prop.data_type, value_var, enum_values)} for record in dump_list], password, "int")'
+        if prop.data_type in ConvertFlag.__members__ and prop.data_type != "string":
+            return f'encrypt_column([{value_var} for record in dump_list], password, "{prop.data_type}")'
+        return ""
+
+    def _get_vector_conversion_code(self, prop, items_var, enum_values=False, plain=False):
+        """Helper to generate code encrypting every item of a scalar list at once, or "" if it cannot be batched"""
+        data_type = prop.data_type
+        if data_type == "bool":
+            return items_var
+        if data_type in self.enums_by_name:
+            values = f'[{self.__enum_value_code(data_type, "item", enum_values)} for item in {items_var}]'
+            return values if plain else f'encrypt_column({values}, password, "int")'
+        if data_type in ConvertFlag.__members__ and data_type != "string":
+            return items_var if plain else f'encrypt_column({items_var}, password, "{data_type}")'
+        return ""
+
+    @staticmethod
+    def _get_string_conversion_code(value_var, plain=False):
+        """Helper to generate code encrypting a string, kept as is by plain packers"""
+        return value_var if plain else f"encrypt_string({value_var}, password)"
+
+    def _get_conversion_code(self, prop, value_var, enum_values=False, plain=False):
+        """Helper to generate type-specific conversion code, the value as is for plain packers"""
         data_type = prop.data_type
         if data_type == "bool":
             return value_var, data_type
         if data_type in self.enums_by_name:
-            return f"convert_int(getattr({data_type}, {value_var}), password)", "int"
+            value = self.__enum_value_code(data_type, value_var, enum_values)
+            return (value if plain else f"convert_int({value}, password)"), "int"
+        if plain:
+            return value_var, data_type
         elif data_type == "float":
             return f"encrypt_float({value_var}, password)", data_type
         elif data_type == "double":
@@ -900,3 +2150,10 @@ from . import *
             }
             func = conversion_map.get(data_type, "convert_int")
             return f"{func}({value_var}, password)", data_type
+
+    @staticmethod
+    def __enum_value_code(enum_name, name_var, enum_values):
+        """Helper to generate code getting the value of an enum member by name"""
+        if enum_values:
+            return f"_VALUES_{Utils.convert_name_to_available(enum_name)}[{name_var}]"
+        return f"getattr({enum_name}, {name_var})"
@@ -1,13 +1,20 @@
 """Main encryption lib for encrypt."""
 
 import hashlib
+import io
 import math
+import mmap
+import os
+import re
 import time
 from base64 import b64decode, b64encode
 from binascii import crc32
+from collections import OrderedDict
 from struct import Struct
-from typing import TypeVar
+from threading import Lock
+from typing import BinaryIO, Iterable, Iterator, TypeVar
 
+import numpy as np
 from Crypto.Cipher import AES
 from Crypto.Protocol.KDF import PBKDF2
 from Crypto.Random import get_random_bytes
@@ -30,6 +37,44 @@ AES_BLOCK_SIZE = 128 // 8
 AES_KEY_SIZE = 128 // 8
 PBKDF2_DERIVATION_ITERATIONS = 1000
 
+KEYSTREAM_CACHE_SIZE = 256 * 1024 * 1024
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+
+KEY_STORE_FILE = "keys.bin"
+KEY_STORE_MAGIC = b"BAKS"
+KEY_STORE_VERSION = 1
+KEY_STORE_HEADER = Struct("<4sII")
+"""Magic, version and entry count of a key store."""
+KEY_STORE_ENTRY = Struct("<QIH")
+"""Offset and length of a keystream prefix, then the length of its UTF-8 name."""
+
+KNOWN_ZIP_NAMES = ("Excel.zip",)
+"""Archives whose passwords are written to every key store."""
+
+COLUMN_DTYPES = {
+    "short": np.dtype("<i2"),
+    "ushort": np.dtype("<u2"),
+    "int": np.dtype("<i4"),
+    "uint": np.dtype("<u4"),
+    "long": np.dtype("<i8"),
+    "ulong": np.dtype("<u8"),
+}
+"""Little-endian integer type of each scalar column."""
+
+FLOAT_COLUMN_DTYPES = {"float": np.dtype("<i4"), "double": np.dtype("<i8")}
+"""Integer type that encrypted float columns are XORed as."""
+
+BASE64_IGNORED = bytes(
+    c for c in range(256) if c not in b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+)
+"""Bytes that non-validating b64decode skips."""
+
+BASE64_DECODABLE = re.compile(
+    rb"(?:=*[A-Za-z0-9+/]=*[A-Za-z0-9+/]=?[A-Za-z0-9+/][A-Za-z0-9+/])*"
+    rb"(?:=*[A-Za-z0-9+/]=*[A-Za-z0-9+/](?:==|=?[A-Za-z0-9+/]=)|=*$)"
+)
+"""Inputs non-validating b64decode accepts once BASE64_IGNORED is removed, including its early stop at padding."""
+
 
 def calculate_hash(name: bytes | str) -> int:
     """Calculate a 32-bit hash using xxhash with UTF-8 encoding if needed."""
@@ -52,8 +97,10 @@ def calculate_crc(path: str) -> int:
     Returns:
         int: Crc checksum.
     """
-    with open(path, "rb") as f:
-        return crc32(f.read()) & 0xFFFFFFFF
+    crc = 0
+    for chunk in read_chunks(path):
+        crc = crc32(chunk, crc)
+    return crc & 0xFFFFFFFF
 
 
 def calculate_md5(path: str) -> str:
@@ -63,8 +110,35 @@ def calculate_md5(path: str) -> str:
     Returns:
         str: MD5 checksum.
     """
-    with open(path, "rb") as f:
-        return hashlib.md5(f.read()).hexdigest()
+    md5 = hashlib.md5()
+    for chunk in read_chunks(path):
+        md5.update(chunk)
+    return md5.hexdigest()
+
+
+def calculate_checksum(path: str, check_type: str) -> str:
+    """Calculate the checksum of a file as catalogs write it.
+    Args:
+        path (str): File path.
+        check_type (str): "crc" or "md5".
+    Returns:
+        str: Decimal crc or hexadecimal md5.
+    """
+    if check_type == "crc":
+        return str(calculate_crc(path))
+    return calculate_md5(path)
+
+
+def read_chunks(path: str, chunk_size: int = CHECKSUM_CHUNK_SIZE) -> Iterator[memoryview]:
+    """Read a file in chunks through one reused buffer, so memory does not grow with the file.
+
+    Each chunk is only valid until the next one is read.
+    """
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while size := f.readinto(buffer):
+            yield view[:size]
 
 
 def zip_password(key: str) -> bytes:
@@ -74,16 +148,89 @@ def zip_password(key: str) -> bytes:
 
 def create_key(name: str, size: int = 8) -> bytes:
     """Create a random key based on a hashed name and a specific size."""
-    seed = calculate_hash(name)
-    return MersenneTwister(seed).next_bytes(size)
+    return KEYSTREAM_CACHE.get(name, size)
+
+
+def create_keys(names: Iterable[str], size: int = 8) -> dict[str, bytes]:
+    """Create keys for many names at once, seeding and tempering them together."""
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+    if size <= 0:
+        return dict.fromkeys(names, b"")
+    seeds = np.fromiter(map(calculate_hash, names), dtype=np.uint32, count=len(names))
+    mt = VectorizedMersenneTwister.seed_states(seeds)
+    word_count = (size + 3) // 4
+    blocks = []
+    for _ in range(0, word_count, VectorizedMersenneTwister.N):
+        VectorizedMersenneTwister.twist(mt)
+        blocks.append(VectorizedMersenneTwister.temper(mt))
+    words = np.concatenate(blocks)[:word_count] >> 1
+    raw = np.ascontiguousarray(words.T, dtype="<u4")
+    return {name: row.tobytes()[:size] for name, row in zip(names, raw)}
+
+
+def preload_keys(names: Iterable[str], size: int = 8) -> None:
+    """Derive keys for many names in one batch and store them in the keystream cache."""
+    KEYSTREAM_CACHE.preload(create_keys(names, (size + 3) // 4 * 4))
+
+
+def preload_struct_keys(struct_names: Iterable[str]) -> None:
+    """Derive the field keys of FlatData structs, which drop the Excel suffix, in one batch."""
+    preload_keys(name.removesuffix("Excel") for name in struct_names)
+
+
+def write_key_store(
+    path: str,
+    struct_names: Iterable[str],
+    zip_names: Iterable[str] = KNOWN_ZIP_NAMES,
+    prefix_sizes: dict[str, int] | None = None,
+) -> None:
+    """Write the keystream prefixes of known names to a key store file.
+
+    Struct field keys and zip passwords are derived in one batch each. Names in
+    prefix_sizes, usually the largest tables, get a prefix of at least that many
+    bytes so their whole-file XOR needs no Mersenne Twister work either.
+    """
+    keys = create_keys((name.removesuffix("Excel") for name in struct_names), 8)
+    keys.update(create_keys(zip_names, 16))
+    for name, size in (prefix_sizes or {}).items():
+        keys[name] = KeystreamCursor(name, 0).read(0, (size + 3) // 4 * 4)
+
+    index = bytearray(KEY_STORE_HEADER.pack(KEY_STORE_MAGIC, KEY_STORE_VERSION, len(keys)))
+    encoded_names = [name.encode("utf8") for name in keys]
+    offset = len(index) + sum(KEY_STORE_ENTRY.size + len(name) for name in encoded_names)
+    for encoded_name, key in zip(encoded_names, keys.values()):
+        index += KEY_STORE_ENTRY.pack(offset, len(key), len(encoded_name)) + encoded_name
+        offset += len(key)
+
+    with open(path, "wb") as file:
+        file.write(index)
+        for key in keys.values():
+            file.write(key)
+
+
+def load_key_store(path: str) -> bool:
+    """Serve keystream prefixes from a key store file, if it exists."""
+    if not os.path.isfile(path):
+        return False
+    KEYSTREAM_CACHE.attach(KeyStore(path))
+    return True
 
 
 def xor_with_key(name: str, data: bytes) -> bytes:
     """XOR the data with a generated key based on the name."""
     if not data:
         return data
-    mask = create_key(name, len(data))
-    return xor(data, mask)
+    buffer = bytearray(data)
+    xor_with_key_into(name, buffer)
+    return bytes(buffer)
+
+
+def xor_with_key_into(name: str, buffer: bytearray | memoryview) -> None:
+    """XOR a writable buffer in place with a generated key based on the name."""
+    if len(buffer):
+        KEYSTREAM_CACHE.xor_into(name, buffer)
 
 
 def xor(value: bytes, key: bytes) -> bytes:
@@ -95,12 +242,27 @@ def xor(value: bytes, key: bytes) -> bytes:
     if len(value) < len(key):
         return strxor(value, key[: len(value)])
     # Handle the case where the value is longer than the key
-    return b"".join(
-        strxor(value[i : i + len(key)], key)
-        for i in range(0, len(value) - len(key) + 1, len(key))
-    ) + strxor(
-        value[len(value) - len(value) % len(key) :], key[: len(value) % len(key)]
-    )
+    buffer = bytearray(value)
+    xor_into(buffer, key)
+    return bytes(buffer)
+
+
+def xor_into(buffer: bytearray | memoryview, key: bytes) -> None:
+    """XOR a writable buffer in place, repeating the key over its whole length."""
+    if not len(buffer):
+        return
+    if not key:
+        raise ValueError("Cannot XOR data with an empty key.")
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    mask = np.frombuffer(key, dtype=np.uint8)
+    if len(mask) >= len(data):
+        data ^= mask[: len(data)]
+        return
+    # Tile the key as rows over the buffer instead of slicing it into chunks.
+    tiled = len(data) - len(data) % len(mask)
+    rows = data[:tiled].reshape(-1, len(mask))
+    rows ^= mask
+    data[tiled:] ^= mask[: len(data) - tiled]
 
 
 def xor_struct(value: T, key: bytes, struct: Struct) -> T:
@@ -181,6 +343,51 @@ def encrypt_double(value: float, key: bytes = b"") -> float:
     return (convert_long(int(value * 100000), key)) if key else value
 
 
+def xor_column(values: np.ndarray, key: bytes) -> np.ndarray:
+    """XOR an integer array with the key reinterpreted as a mask of the same type."""
+    if not key:
+        return values
+    dtype = values.dtype.newbyteorder("<")
+    mask = np.frombuffer(xor(bytes(dtype.itemsize), key), dtype=dtype)[0]
+    return values ^ mask
+
+
+def convert_column(values: Iterable | np.ndarray, key: bytes = b"", data_type: str = "int") -> list:
+    """Convert a whole column of one scalar field, like the matching convert_* function per value."""
+    if not key:
+        return _column_to_list(values)
+    if data_type in FLOAT_COLUMN_DTYPES:
+        ints = _truncate_column(values, 1, FLOAT_COLUMN_DTYPES[data_type])
+        return (xor_column(ints, key).astype(np.float64) * 0.00001).tolist()
+    return xor_column(np.asarray(values, dtype=COLUMN_DTYPES[data_type]), key).tolist()
+
+
+def encrypt_column(values: Iterable | np.ndarray, key: bytes = b"", data_type: str = "int") -> list:
+    """Encrypt a whole column of one scalar field, like convert_* or encrypt_float/encrypt_double per value."""
+    if not key:
+        return _column_to_list(values)
+    if data_type in FLOAT_COLUMN_DTYPES:
+        ints = _truncate_column(values, 100000, FLOAT_COLUMN_DTYPES[data_type])
+        return xor_column(ints, key).tolist()
+    return convert_column(values, key, data_type)
+
+
+def _column_to_list(values: Iterable | np.ndarray) -> list:
+    return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+
+def _truncate_column(values: Iterable | np.ndarray, scale: int, dtype: np.dtype) -> np.ndarray:
+    """Scale floats and truncate them toward zero like int() does, rejecting values int() or pack would."""
+    floats = np.asarray(values, dtype=np.float64)
+    if scale != 1:
+        floats = floats * scale
+    truncated = np.trunc(floats)
+    limit = -float(np.iinfo(dtype).min)
+    if not ((truncated >= -limit) & (truncated < limit)).all():
+        raise ValueError("Column has values out of range for its encrypted type.")
+    return truncated.astype(dtype)
+
+
 def convert_string(value: bytes | str, key: bytes = b"") -> str:
     """Decrypt or decode a base64 string or raw bytes, depending on the input."""
     if not value:
@@ -197,6 +404,8 @@ def convert_string(value: bytes | str, key: bytes = b"") -> str:
             return value.decode("utf8")
 
     return ""
+
+
 def encrypt_string(value: str, key: bytes = b"") -> str:
     """Encrypt a string using XOR and encode it in properly padded Base64."""
     if key is None:
@@ -211,6 +420,102 @@ def encrypt_string(value: str, key: bytes = b"") -> str:
         b64_encoded += "=" * (4 - missing_padding)
 
     return b64_encoded
+
+
+def convert_strings(values: Iterable[bytes | str], key: bytes = b"") -> list[str]:
+    """Decrypt many strings of one key at once, like convert_string per value.
+
+    Decodable values are joined into one buffer and XORed with the key tiled from
+    the start of each value. UTF-16 validity is checked on the whole buffer, and
+    values that convert_string would fall back on are decoded as UTF-8 directly.
+    """
+    values = list(values)
+    if key is None:
+        return [value if value else "" for value in values]
+    results = [""] * len(values)
+    raws: list[bytes] = []
+    indexes: list[int] = []
+    for index, value in enumerate(values):
+        if not value:
+            continue
+        if key and (raw := _b64decode_or_none(value)) and len(raw) % 2 == 0:
+            raws.append(raw)
+            indexes.append(index)
+        else:
+            results[index] = _string_fallback(value)
+    if not raws:
+        return results
+
+    lengths = np.fromiter(map(len, raws), dtype=np.int64, count=len(raws))
+    starts = np.cumsum(lengths) - lengths
+    data = np.frombuffer(bytearray(b"".join(raws)), dtype=np.uint8)
+    data ^= _tiled_key(key, starts, lengths)
+
+    # A value decodes as UTF-16 when every surrogate is paired inside it. A
+    # big-endian BOM switches the codec's byte order for that value.
+    units = data.view("<u2")
+    counts = lengths // 2
+    owner = np.repeat(np.arange(len(raws)), counts)
+    swapped = units[starts // 2] == 0xFFFE
+    units = np.where(swapped[owner], units.byteswap(), units)
+    high = (units & 0xFC00) == 0xD800
+    low = (units & 0xFC00) == 0xDC00
+    paired = (owner[1:] == owner[:-1]) & high[:-1] & low[1:]
+    unpaired = high & ~np.append(paired, False) | low & ~np.insert(paired, 0, False)
+    invalid = np.bincount(owner[unpaired], minlength=len(raws)).astype(bool)
+    # A value holding only a BOM decodes to "", which convert_string also rejects.
+    invalid |= (counts == 1) & np.isin(units[starts // 2], (0xFEFF, 0xFFFE))
+
+    buffer = data.tobytes()
+    for position, index in enumerate(indexes):
+        if invalid[position]:
+            results[index] = _string_fallback(values[index])
+        else:
+            start = starts[position]
+            results[index] = buffer[start : start + lengths[position]].decode("utf16")
+    return results
+
+
+def encrypt_strings(values: Iterable[str], key: bytes = b"") -> list[str]:
+    """Encrypt many strings of one key at once, like encrypt_string per value."""
+    values = list(values)
+    if key is None:
+        return values
+    if not key or not values:
+        return [encrypt_string(value, key) for value in values]
+    raws = [value.encode("utf-16le") for value in values]
+    lengths = np.fromiter(map(len, raws), dtype=np.int64, count=len(raws))
+    starts = np.cumsum(lengths) - lengths
+    data = np.frombuffer(bytearray(b"".join(raws)), dtype=np.uint8)
+    data ^= _tiled_key(key, starts, lengths)
+    buffer = data.tobytes()
+    return [
+        b64encode(buffer[start : start + length]).decode()
+        for start, length in zip(starts.tolist(), lengths.tolist())
+    ]
+
+
+def _tiled_key(key: bytes, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Repeat the key over concatenated values, restarting it at each value."""
+    offsets = np.arange(lengths.sum()) - np.repeat(starts, lengths)
+    return np.frombuffer(key, dtype=np.uint8)[offsets % len(key)]
+
+
+def _b64decode_or_none(value: bytes | str) -> bytes | None:
+    """b64decode a value, or return None where b64decode would raise."""
+    if isinstance(value, str):
+        if not value.isascii():
+            return None
+        value = value.encode("ascii")
+    if not BASE64_DECODABLE.match(value.translate(None, BASE64_IGNORED)):
+        return None
+    return b64decode(value)
+
+
+def _string_fallback(value: bytes | str) -> str:
+    return value.decode("utf8") if isinstance(value, bytes) else ""
+
+
 '''
 def encrypt_string(value: str, key: bytes) -> str | bytes:
     """Encrypt a string using XOR and base64 encoding."""
@@ -374,4 +679,311 @@ class MersenneTwister:
         """Generates a random number with 53-bit resolution."""
         a = self.genrand_int32() >> 5
         b = self.genrand_int32() >> 6
-        return (a * 67108864.0 + b) * (1.0 / 9007199254740992.0)
\ No newline at end of file
+        return (a * 67108864.0 + b) * (1.0 / 9007199254740992.0)
+
+
+class VectorizedMersenneTwister(MersenneTwister):
+    """MersenneTwister producing whole state blocks with NumPy array operations.
+
+    Output is identical to MersenneTwister, but each twist and temper runs over
+    all N words at once, so long keystreams no longer loop per word in Python.
+    """
+
+    def __init__(self, seed: int | None = None) -> None:
+        super().__init__(seed)
+        self.mt = np.array(self.mt, dtype=np.uint32)
+        self.block = np.empty(self.N, dtype=np.uint32)
+
+    @classmethod
+    def seed_states(cls, seeds: np.ndarray) -> np.ndarray:
+        """Initializes one state per seed, laid out as an (N, len(seeds)) array."""
+        mt = np.empty((cls.N, len(seeds)), dtype=np.uint32)
+        mt[0] = seeds
+        for i in range(1, cls.N):
+            mt[i] = np.uint32(1812433253) * (mt[i - 1] ^ (mt[i - 1] >> 30)) + np.uint32(i)
+        return mt
+
+    @classmethod
+    def twist(cls, mt: np.ndarray) -> None:
+        """Twists N words in place along the first axis of mt."""
+        n, m = cls.N, cls.M
+        matrix_a = np.uint32(cls.MATRIX_A)
+        # The twist only depends on words that are already updated at a
+        # distance of N - M, so it can be split into slices of that width.
+        for start in range(0, n - 1, n - m):
+            stop = min(start + n - m, n - 1)
+            y = (mt[start:stop] & cls.UPPER_MASK) | (
+                mt[start + 1 : stop + 1] & cls.LOWER_MASK
+            )
+            if start == 0:
+                source = mt[m : stop + m]
+            else:
+                source = mt[start - (n - m) : stop - (n - m)]
+            mt[start:stop] = source ^ (y >> 1) ^ ((y & 1) * matrix_a)
+        y = (mt[n - 1] & cls.UPPER_MASK) | (mt[0] & cls.LOWER_MASK)
+        mt[n - 1] = mt[m - 1] ^ (y >> 1) ^ ((y & 1) * matrix_a)
+
+    @staticmethod
+    def temper(mt: np.ndarray) -> np.ndarray:
+        """Applies the tempering transformation to a copy of mt."""
+        y = mt.copy()
+        y ^= y >> 11
+        y ^= (y << 7) & np.uint32(0x9D2C5680)
+        y ^= (y << 15) & np.uint32(0xEFC60000)
+        y ^= y >> 18
+        return y
+
+    def _generate_numbers(self) -> None:
+        """Twists the whole state and tempers it into the output block."""
+        self.twist(self.mt)
+        self.block = self.temper(self.mt)
+        self.mti = 0
+
+    def genrand_int32(self) -> int:
+        """Generates a random number on [0, 0xFFFFFFFF]-interval."""
+        if self.mti >= self.N:
+            self._generate_numbers()
+        y = self.block[self.mti]
+        self.mti += 1
+        return int(y)
+
+    def next_words(self, count: int) -> np.ndarray:
+        """Generates count numbers on [0, 0x7FFFFFFF]-interval as an array."""
+        words = np.empty(count, dtype=np.uint32)
+        filled = 0
+        while filled < count:
+            if self.mti >= self.N:
+                self._generate_numbers()
+            take = min(self.N - self.mti, count - filled)
+            words[filled : filled + take] = self.block[self.mti : self.mti + take]
+            self.mti += take
+            filled += take
+        words >>= 1
+        return words
+
+    def next_bytes(self, length: int) -> bytes:
+        """Generates random bytes."""
+        return self.next_words((length + 3) // 4).astype("<u4").tobytes()[:length]
+
+
+class KeystreamCache:
+    """Process-wide LRU cache of keystream prefixes keyed by name.
+
+    Each name keeps its generator alive, so asking for a longer key extends the
+    cached prefix instead of generating the stream from the start again. Names
+    added by preload or read from an attached key store have no generator until
+    a longer key is requested.
+    """
+
+    def __init__(self, max_bytes: int = KEYSTREAM_CACHE_SIZE) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.streams: OrderedDict[
+            str, tuple[VectorizedMersenneTwister | None, bytearray | memoryview]
+        ] = OrderedDict()
+        self.store: KeyStore | None = None
+        self.lock = Lock()
+
+    def get(self, name: str, size: int) -> bytes:
+        """Get the first size bytes of the keystream seeded by name."""
+        with self.lock:
+            self.__extend(name, size)
+            return bytes(self.streams[name][1][:size])
+
+    def xor_into(self, name: str, buffer: bytearray | memoryview) -> None:
+        """XOR a writable buffer in place with the keystream seeded by name."""
+        size = len(buffer)
+        with self.lock:
+            self.__extend(name, size)
+            _, prefix = self.streams[name]
+            data = np.frombuffer(buffer, dtype=np.uint8)
+            # The mask view must be released before the prefix can grow again.
+            mask = np.frombuffer(prefix, dtype=np.uint8, count=size)
+            data ^= mask
+            del data, mask
+
+    def preload(self, keys: dict[str, bytes]) -> None:
+        """Store precomputed whole-word prefixes without keeping their generators."""
+        with self.lock:
+            for name, key in keys.items():
+                if name in self.streams:
+                    continue
+                self.streams[name] = (None, bytearray(key))
+                self.size += len(key)
+            self.__evict()
+
+    def attach(self, store: "KeyStore") -> None:
+        """Look up names missing from the cache in a key store before generating them."""
+        with self.lock:
+            self.store = store
+
+    def clear(self) -> None:
+        """Drop every cached keystream."""
+        with self.lock:
+            self.streams.clear()
+            self.size = 0
+
+    def __extend(self, name: str, size: int) -> None:
+        if name in self.streams:
+            self.streams.move_to_end(name)
+            generator, prefix = self.streams[name]
+        elif self.store is not None and (stored := self.store.get(name)) is not None:
+            generator, prefix = None, stored
+            self.streams[name] = (generator, prefix)
+            self.size += len(prefix)
+        else:
+            generator = VectorizedMersenneTwister(calculate_hash(name))
+            prefix = bytearray()
+            self.streams[name] = (generator, prefix)
+
+        if len(prefix) < size:
+            if generator is None:
+                generator = VectorizedMersenneTwister(calculate_hash(name))
+                generator.next_words(len(prefix) // 4)
+                # Prefixes mapped from a key store are read-only.
+                prefix = bytearray(prefix)
+                self.streams[name] = (generator, prefix)
+            # The prefix always holds whole words, so the stream continues
+            # exactly where the previous request stopped.
+            words = generator.next_words((size - len(prefix) + 3) // 4)
+            prefix += words.astype("<u4").tobytes()
+            self.size += words.nbytes
+            self.__evict()
+
+    def __evict(self) -> None:
+        # Keep the most recently used stream even if it exceeds the cap alone.
+        while self.size > self.max_bytes and len(self.streams) > 1:
+            _, (_, prefix) = self.streams.popitem(last=False)
+            self.size -= len(prefix)
+
+
+class KeyStore:
+    """Read-only memory-mapped file of keystream prefixes written by write_key_store.
+
+    Every process mapping the same file shares its pages, and prefixes are
+    returned as views into the mapping without copying.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = KEY_STORE_HEADER.unpack_from(self.data)
+        if magic != KEY_STORE_MAGIC or version != KEY_STORE_VERSION:
+            raise ValueError(f"{path} is not a key store of version {KEY_STORE_VERSION}.")
+
+        view = memoryview(self.data)
+        self.entries: dict[str, memoryview] = {}
+        position = KEY_STORE_HEADER.size
+        for _ in range(count):
+            offset, length, name_length = KEY_STORE_ENTRY.unpack_from(self.data, position)
+            position += KEY_STORE_ENTRY.size
+            name = self.data[position : position + name_length].decode("utf8")
+            position += name_length
+            self.entries[name] = view[offset : offset + length]
+
+    def get(self, name: str) -> memoryview | None:
+        """Get the stored keystream prefix of a name."""
+        return self.entries.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+
+KEYSTREAM_CACHE = KeystreamCache()
+
+
+class KeystreamCursor:
+    """Random access to the keystream seeded by a name.
+
+    Reading forward twists one block of N words at a time. By default only the
+    seed state is kept, so memory stays constant however long the stream is, but
+    going back to an earlier block twists again from the seed. A positive
+    checkpoint_interval keeps the 2.5 KB twister state before every
+    checkpoint_interval-th block, so backward seeks twist from the nearest
+    checkpoint instead, at the cost of memory growing with the offsets reached.
+    """
+
+    def __init__(self, name: str, checkpoint_interval: int = 0) -> None:
+        generator = VectorizedMersenneTwister(calculate_hash(name))
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints: dict[int, np.ndarray] = {0: generator.mt.copy()}
+        self.mt = generator.mt
+        self.next_block = 0
+        self.block_index = -1
+        self.block = np.empty(0, dtype="<u4")
+
+    def xor_into(self, buffer: bytearray | memoryview, offset: int) -> None:
+        """XOR a writable buffer in place with the keystream starting at offset."""
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        block_size = VectorizedMersenneTwister.N * 4
+        position = 0
+        while position < len(data):
+            index, start = divmod(offset + position, block_size)
+            mask = self.__get_block(index).view(np.uint8)[start:]
+            span = min(len(mask), len(data) - position)
+            data[position : position + span] ^= mask[:span]
+            position += span
+
+    def read(self, offset: int, length: int) -> bytes:
+        """Get length bytes of the keystream starting at offset."""
+        buffer = bytearray(length)
+        self.xor_into(buffer, offset)
+        return bytes(buffer)
+
+    def __get_block(self, index: int) -> np.ndarray:
+        if index == self.block_index:
+            return self.block
+        if index < self.next_block:
+            start = index - index % self.checkpoint_interval if self.checkpoint_interval else 0
+            self.mt = self.checkpoints[start].copy()
+            self.next_block = start
+        while self.next_block <= index:
+            if (
+                self.checkpoint_interval
+                and self.next_block % self.checkpoint_interval == 0
+                and self.next_block not in self.checkpoints
+            ):
+                self.checkpoints[self.next_block] = self.mt.copy()
+            VectorizedMersenneTwister.twist(self.mt)
+            self.next_block += 1
+        self.block = (VectorizedMersenneTwister.temper(self.mt) >> 1).astype("<u4")
+        self.block_index = index
+        return self.block
+
+
+class XorStream(io.RawIOBase):
+    """Readable stream that XORs another binary stream with the keystream of a name.
+
+    Data is decrypted chunk by chunk as it is read, so whole files or zip members
+    never need a full-size mask. Seeking is supported when the source stream is
+    seekable. Pass a checkpoint_interval when it is seeked backward often, see
+    KeystreamCursor.
+    """
+
+    def __init__(
+        self, name: str, stream: BinaryIO, checkpoint_interval: int = 0
+    ) -> None:
+        super().__init__()
+        self.stream = stream
+        self.cursor = KeystreamCursor(name, checkpoint_interval)
+        self.position = stream.tell() if stream.seekable() else 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return self.stream.seekable()
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        view = memoryview(buffer).cast("B")
+        size = self.stream.readinto(view) or 0
+        self.cursor.xor_into(view[:size], self.position)
+        self.position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self.position = self.stream.seek(offset, whence)
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
@@ -0,0 +1,183 @@
+"""Read and write FlatBuffer tables straight in their buffers.
+
+Shared by the direct decoders and packers of the generated wrappers and by
+SchemaCodec. Readers take a buffer and the position of a table or field, like
+the generated accessors do. Writers lay out bytes exactly as flatbuffers.Builder
+does, in the buffer of a Builder, and keep its head, minalign and vtables in
+step so the output is the same and they mix with Builder calls.
+"""
+
+from itertools import chain, islice
+from struct import Struct, pack_into, unpack_from
+
+import flatbuffers
+
+read_uoffset = Struct("<I").unpack_from
+read_soffset = Struct("<i").unpack_from
+read_voffset = Struct("<H").unpack_from
+read_bool = Struct("<?").unpack_from
+read_byte = Struct("<b").unpack_from
+read_sbyte = Struct("<b").unpack_from
+read_ubyte = Struct("<B").unpack_from
+read_short = Struct("<h").unpack_from
+read_ushort = Struct("<H").unpack_from
+read_int = Struct("<i").unpack_from
+read_uint = Struct("<I").unpack_from
+read_long = Struct("<q").unpack_from
+read_ulong = Struct("<Q").unpack_from
+read_float = Struct("<f").unpack_from
+read_double = Struct("<d").unpack_from
+
+write_uoffset = Struct("<I").pack_into
+write_soffset = Struct("<i").pack_into
+write_bool = Struct("<?").pack_into
+write_byte = Struct("<b").pack_into
+write_sbyte = Struct("<b").pack_into
+write_ubyte = Struct("<B").pack_into
+write_short = Struct("<h").pack_into
+write_ushort = Struct("<H").pack_into
+write_int = Struct("<i").pack_into
+write_uint = Struct("<I").pack_into
+write_long = Struct("<q").pack_into
+write_ulong = Struct("<Q").pack_into
+write_float = Struct("<f").pack_into
+write_double = Struct("<d").pack_into
+
+DATA_LIST_FIELDS = Struct("<H")
+"""Field offsets of a table holding only its DataList."""
+
+
+def field_offsets(buf, pos: int, fields: Struct) -> tuple:
+    """Read the offsets of every field of a table from its vtable at once, 0 for absent fields."""
+    vtable = pos - read_soffset(buf, pos)[0]
+    present = (read_voffset(buf, vtable)[0] - 3) // 2
+    count = fields.size // 2
+    if present >= count:
+        return fields.unpack_from(buf, vtable + 4)
+    present = max(present, 0)
+    return unpack_from(f"<{present}H", buf, vtable + 4) + (0,) * (count - present)
+
+
+def vector(buf, pos: int) -> tuple[int, int]:
+    """Get the start and length of the vector referred at pos."""
+    pos += read_uoffset(buf, pos)[0]
+    return pos + 4, read_uoffset(buf, pos)[0]
+
+
+def string(buf, pos: int) -> bytes:
+    start, length = vector(buf, pos)
+    return bytes(buf[start : start + length])
+
+
+def scalars(buf, pos: int, format: str) -> tuple:
+    start, length = vector(buf, pos)
+    return unpack_from(f"<{length}{format}", buf, start)
+
+
+def strings(buf, pos: int) -> list:
+    start, length = vector(buf, pos)
+    return [string(buf, start + 4 * j) for j in range(length)]
+
+
+def tables(buf, pos: int) -> list:
+    start, length = vector(buf, pos)
+    return [
+        start + 4 * j + offset
+        for j, offset in enumerate(unpack_from(f"<{length}I", buf, start))
+    ]
+
+
+def flatten(lists: list) -> list:
+    return list(chain.from_iterable(lists))
+
+
+def split(values: list, lists: list) -> list:
+    """Cut a column of flattened lists back into the list of every record."""
+    values = iter(values)
+    return [list(islice(values, len(items))) for items in lists]
+
+
+# Space below the head of a Builder is still zeroed, so alignment padding is
+# skipped instead of written.
+def reserve(builder: flatbuffers.Builder, size: int) -> tuple[bytearray, int]:
+    """Grow the buffer until size bytes fit below the head."""
+    if builder.head < size:
+        length = len(builder.Bytes)
+        new_length = length * 2 or 1
+        while new_length - length + builder.head < size:
+            new_length *= 2
+        grown = bytearray(new_length)
+        grown[new_length - length :] = builder.Bytes
+        builder.Bytes = grown
+        builder.head += new_length - length
+    return builder.Bytes, len(builder.Bytes)
+
+
+def create_string(builder: flatbuffers.Builder, value: str | bytes) -> int:
+    if isinstance(value, str):
+        value = value.encode()
+    length = len(value)
+    buf, end = reserve(builder, length + 8)
+    off = ((end - builder.head + length + 4) & -4) + 4
+    start = end - off
+    write_uoffset(buf, start, length)
+    buf[start + 4 : start + 4 + length] = value
+    builder.head = start
+    if builder.minalign < 4:
+        builder.minalign = 4
+    return off
+
+
+def create_vector(builder: flatbuffers.Builder, format: str, size: int, values: list) -> int:
+    length = len(values)
+    data_size = size * length
+    buf, end = reserve(builder, data_size + 16)
+    off = end - builder.head
+    off += -(off + data_size) & 3
+    off += (-(off + data_size) & (size - 1)) + data_size
+    pack_into(f"<{length}{format}", buf, end - off, *values)
+    off += 4
+    write_uoffset(buf, end - off, length)
+    builder.head = end - off
+    if builder.minalign < max(size, 4):
+        builder.minalign = max(size, 4)
+    return off
+
+
+def create_offsets(builder: flatbuffers.Builder, offsets: list) -> int:
+    length = len(offsets)
+    buf, end = reserve(builder, 4 * length + 8)
+    off = end - builder.head
+    off += -off & 3
+    values = [off + 4 * (length - j) - offset for j, offset in enumerate(offsets)]
+    off += 4 * length
+    pack_into(f"<{length}I", buf, end - off, *values)
+    off += 4
+    write_uoffset(buf, end - off, length)
+    builder.head = end - off
+    if builder.minalign < 4:
+        builder.minalign = 4
+    return off
+
+
+def end_object(builder: flatbuffers.Builder, buf: bytearray, end: int, off: int, object_end: int, slots: tuple) -> int:
+    """Write the vtable offset and the vtable of a table, unless an equal vtable exists."""
+    object_offset = off = ((off + 3) & -4) + 4
+    count = len(slots)
+    while count and not slots[count - 1]:
+        count -= 1
+    fields = [object_offset - slot if slot else 0 for slot in slots[:count]]
+    key = (*reversed(fields), object_offset - object_end)
+    vtable = builder.vtables.get(key)
+    if vtable is None:
+        off += 4 + 2 * count
+        pack_into(f"<{count + 2}H", buf, end - off, 4 + 2 * count, object_offset - object_end, *fields)
+        write_soffset(buf, end - object_offset, off - object_offset)
+        builder.vtables[key] = off
+    else:
+        off = object_offset
+        write_soffset(buf, end - object_offset, vtable - object_offset)
+    builder.head = end - off
+    if builder.minalign < 4:
+        builder.minalign = 4
+    return object_offset
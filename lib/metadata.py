@@ -0,0 +1,270 @@
+"""Read FlatData types straight from il2cpp global-metadata.dat."""
+
+import mmap
+from struct import Struct
+
+from lib.compiler import CSParser
+from lib.console import notice
+from lib.structure import EnumMember, EnumType, Property, StructTable
+
+METADATA_SANITY = 0xFAB11BAF
+SUPPORTED_VERSIONS = (27, 29, 31)
+
+HEADER = Struct("<Ii40i")
+"""Sanity, version, then the offset and size of every section up to type definitions."""
+STRING_SECTION = 2
+PROPERTY_SECTION = 4
+METHOD_SECTION = 5
+FIELD_DEFAULT_VALUE_SECTION = 7
+DEFAULT_VALUE_DATA_SECTION = 8
+PARAMETER_SECTION = 10
+FIELD_SECTION = 11
+INTERFACE_SECTION = 16
+TYPE_DEFINITION_SECTION = 19
+
+TYPE_DEFINITION = Struct("<7iI8i8H2I")
+"""Name, namespace, byval type, declaring type, parent, element type, generic
+container, flags, first field, method, event, property, nested type,
+interface, vtable and interface offset, their counts, bitfield and token."""
+METHOD_DEFINITIONS = {
+    27: Struct("<5iI4H"),
+    29: Struct("<5iI4H"),
+    31: Struct("<3iI2iI4H"),
+}
+"""Name, declaring type, return type, (return parameter token,) first parameter,
+generic container, token, flags, iflags, slot and parameter count of a method."""
+PROPERTY_DEFINITION = Struct("<3i2I")
+"""Name, getter, setter, attributes and token of a property."""
+FIELD_DEFINITION = Struct("<2iI")
+"""Name, type and token of a field."""
+FIELD_DEFAULT_VALUE = Struct("<3i")
+"""Field, type and data index of the constant value of a field."""
+PARAMETER_DEFINITION = Struct("<iIi")
+"""Name, token and type of a parameter."""
+TYPE_INDEX = Struct("<i")
+
+VALUETYPE_FLAG = 0x1
+ENUMTYPE_FLAG = 0x2
+
+PRIMITIVE_NAMES = {
+    "Boolean": "bool",
+    "SByte": "sbyte",
+    "Byte": "byte",
+    "Int16": "short",
+    "UInt16": "ushort",
+    "Int32": "int",
+    "UInt32": "uint",
+    "Int64": "long",
+    "UInt64": "ulong",
+    "Single": "float",
+    "Double": "double",
+    "String": "string",
+}
+"""C# keyword of each System type, as a dump.cs names it."""
+
+CONSTANT_FORMATS = {
+    "sbyte": Struct("<b"),
+    "byte": Struct("<B"),
+    "short": Struct("<h"),
+    "ushort": Struct("<H"),
+    "int": Struct("<i"),
+    "uint": Struct("<I"),
+    "long": Struct("<q"),
+    "ulong": Struct("<Q"),
+}
+
+UNRESOLVED_TYPE = "Nullable"
+"""Type of properties whose type is a generic instance, only described by the il2cpp binary."""
+
+
+def is_metadata(file_path: str) -> bool:
+    """Whether a file is an unencrypted il2cpp global-metadata.dat."""
+    with open(file_path, "rb") as file:
+        header = file.read(4)
+    return len(header) == 4 and int.from_bytes(header, "little") == METADATA_SANITY
+
+
+class MetadataParser(CSParser):
+    """Parse the FlatData types of an il2cpp global-metadata.dat file.
+
+    Types, properties in declaration order and enum constants are read from the
+    metadata alone, giving the same types as parsing the dump.cs Il2CppInspector
+    writes from it. Property types are named by matching the type index of their
+    getter against the types the metadata defines, which covers primitives,
+    strings, enums and FlatData structs. Generic instances such as the
+    Nullable<T> of a nested table only exist in the il2cpp binary, so those
+    properties get UNRESOLVED_TYPE, which the wrappers skip like other unknown
+    types. They are listed in unresolved and reported, as the schema then
+    differs from the one of a dump.cs.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        """Args:
+            file_path (str): Path of global-metadata.dat.
+        """
+        self.enums: list[EnumType] = []
+        self.structs: list[StructTable] = []
+        self.unresolved: list[str] = []
+        with open(file_path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        sanity, self.version, *sections = HEADER.unpack_from(self.data)
+        if sanity != METADATA_SANITY:
+            raise ValueError(f"{file_path} is not an il2cpp metadata file, or it is encrypted.")
+        if self.version not in SUPPORTED_VERSIONS:
+            raise ValueError(f"Unsupported il2cpp metadata version {self.version}.")
+        self.sections = [(sections[i], sections[i + 1]) for i in range(0, len(sections), 2)]
+        self.method_definition = METHOD_DEFINITIONS[self.version]
+
+        definitions = list(self.__read_table(TYPE_DEFINITION_SECTION, TYPE_DEFINITION))
+        self.type_names: dict[int, str] = {}
+        flatbuffer_object = None
+        for definition in definitions:
+            name, namespace = self.__string(definition[0]), self.__string(definition[1])
+            if namespace == "System" and name in PRIMITIVE_NAMES:
+                self.type_names[definition[2]] = PRIMITIVE_NAMES[name]
+            elif namespace == "FlatData":
+                self.type_names.setdefault(definition[2], name)
+            elif namespace == "FlatBuffers" and name == "IFlatbufferObject":
+                flatbuffer_object = definition[2]
+
+        self.default_values = {
+            field_index: (type_index, data_index)
+            for field_index, type_index, data_index in self.__read_table(
+                FIELD_DEFAULT_VALUE_SECTION, FIELD_DEFAULT_VALUE
+            )
+        }
+        for definition in definitions:
+            # Nested types are named Outer.Inner by a dump, and skipped like there.
+            if definition[3] != -1 or self.__string(definition[1]) != "FlatData":
+                continue
+            bitfield = definition[24]
+            if bitfield & ENUMTYPE_FLAG:
+                self.__parse_enum(definition)
+            elif bitfield & VALUETYPE_FLAG and flatbuffer_object in self.__interfaces(definition):
+                self.__parse_struct(definition)
+
+        if self.unresolved:
+            notice(
+                f"{len(self.unresolved)} properties have generic types only the il2cpp binary describes, "
+                f"such as nested tables, and will not be dumped: {', '.join(self.unresolved[:10])}"
+                + (", ..." if len(self.unresolved) > 10 else "")
+            )
+
+    def __read_table(self, section: int, entry: Struct, start: int = 0, count: int | None = None):
+        offset, size = self.sections[section]
+        if count is None:
+            count = size // entry.size - start
+        return entry.iter_unpack(
+            self.data[offset + start * entry.size : offset + (start + count) * entry.size]
+        )
+
+    def __read_entry(self, section: int, entry: Struct, index: int) -> tuple:
+        return entry.unpack_from(self.data, self.sections[section][0] + index * entry.size)
+
+    def __string(self, index: int) -> str:
+        start = self.sections[STRING_SECTION][0] + index
+        return self.data[start : self.data.find(b"\0", start)].decode("utf8")
+
+    def __interfaces(self, definition: tuple) -> list[int]:
+        return [
+            type_index
+            for (type_index,) in self.__read_table(
+                INTERFACE_SECTION, TYPE_INDEX, definition[13], definition[22]
+            )
+        ]
+
+    def __read_compressed_uint(self, position: int) -> int:
+        read = self.data[position]
+        if not read & 0x80:
+            return read
+        if read & 0xC0 == 0x80:
+            return (read & 0x3F) << 8 | self.data[position + 1]
+        if read & 0xE0 == 0xC0:
+            return int.from_bytes(self.data[position : position + 4], "big") & 0x3FFFFFFF
+        if read == 0xF0:
+            return int.from_bytes(self.data[position + 1 : position + 5], "little")
+        if read == 0xFE:
+            return 0xFFFFFFFE
+        if read == 0xFF:
+            return 0xFFFFFFFF
+        raise ValueError(f"Invalid compressed integer at {position}.")
+
+    def __read_constant(self, data_index: int, data_type: str) -> int:
+        """Read the constant of an enum member, compressed for 32 bits types since version 29."""
+        position = self.sections[DEFAULT_VALUE_DATA_SECTION][0] + data_index
+        if self.version >= 29 and data_type in ("int", "uint"):
+            value = self.__read_compressed_uint(position)
+            if data_type == "uint":
+                return value
+            if value == 0xFFFFFFFF:
+                return -(2**31)
+            return -(value >> 1) - 1 if value & 1 else value >> 1
+        return CONSTANT_FORMATS[data_type].unpack_from(self.data, position)[0]
+
+    def __parse_enum(self, definition: tuple) -> None:
+        enum_name = self.__string(definition[0])
+        field_start, field_count = definition[8], definition[18]
+        underlying_type = "int"
+        enum_members = []
+        for index, (name_index, type_index, _) in enumerate(
+            self.__read_table(FIELD_SECTION, FIELD_DEFINITION, field_start, field_count),
+            field_start,
+        ):
+            name = self.__string(name_index)
+            if name == "value__":
+                underlying_type = self.type_names.get(type_index, underlying_type)
+                continue
+            if (default := self.default_values.get(index)) is None:
+                continue
+            data_type = self.type_names.get(default[0], underlying_type)
+            if data_type not in CONSTANT_FORMATS:
+                data_type = underlying_type
+            enum_members.append(EnumMember(name, str(self.__read_constant(default[1], data_type))))
+
+        # Like a dump.cs parsed by CSParser, every enum is read as an int enum.
+        self.enums.append(EnumType(enum_name, "int", enum_members))
+
+    def __parse_struct(self, definition: tuple) -> None:
+        method_start, property_start = definition[9], definition[11]
+        method_count, property_count = definition[16], definition[17]
+        methods = list(
+            self.__read_table(METHOD_SECTION, self.method_definition, method_start, method_count)
+        )
+        parameter_start = 4 if self.version >= 31 else 3
+
+        # Element type of every list accessor, taking a single "j" parameter.
+        list_types: dict[str, str] = {}
+        for method in methods:
+            if method[-1] != 1:
+                continue
+            parameter = self.__read_entry(
+                PARAMETER_SECTION, PARAMETER_DEFINITION, method[parameter_start]
+            )
+            if self.__string(parameter[0]) == "j":
+                list_types.setdefault(self.__string(method[0]), self.__type_name(method[2]))
+
+        struct_properties = []
+        for name_index, getter, _, _, _ in self.__read_table(
+            PROPERTY_SECTION, PROPERTY_DEFINITION, property_start, property_count
+        ):
+            prop_name = self.__string(name_index)
+            if "ByteBuffer" in prop_name or getter < 0:
+                continue
+            if len(prop_name) > 6 and prop_name.endswith("Length"):
+                if list_type := list_types.get(prop_name.removesuffix("Length")):
+                    struct_properties.append(Property(list_type, prop_name.removesuffix("Length"), True))
+                    continue
+            struct_properties.append(Property(self.__type_name(methods[getter][2]), prop_name, False))
+
+        struct_name = self.__string(definition[0])
+        # parse_struct rebuilds the DataList of ExcelTable structs from their Excel names.
+        if not struct_name.endswith("ExcelTable"):
+            self.unresolved.extend(
+                f"{struct_name}.{prop.name}" for prop in struct_properties if prop.data_type == UNRESOLVED_TYPE
+            )
+        if struct_properties:
+            self.structs.append(StructTable(struct_name, struct_properties))
+
+    def __type_name(self, type_index: int) -> str:
+        return self.type_names.get(type_index, UNRESOLVED_TYPE)
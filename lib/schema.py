@@ -0,0 +1,630 @@
+"""Schema IR of FlatData, and a codec reading and writing tables from it without generated code."""
+
+import io
+import json
+import os
+from itertools import chain
+from json.encoder import encode_basestring
+from struct import Struct, calcsize, unpack_from
+from typing import Any, Callable, TextIO
+
+import flatbuffers
+
+from lib import encryption
+from lib.compiler import ConvertFlag, DataFlag, DataFormat
+from lib.encryption import (
+    convert_column,
+    convert_int,
+    convert_strings,
+    create_key,
+    encrypt_column,
+    encrypt_double,
+    encrypt_float,
+    encrypt_string,
+    encrypt_strings,
+)
+from lib.layout import (
+    DATA_LIST_FIELDS,
+    create_offsets,
+    create_string,
+    create_vector,
+    end_object,
+    field_offsets,
+    read_uoffset,
+    reserve,
+    split,
+    string,
+    strings,
+    tables,
+    vector,
+    write_uoffset,
+)
+from lib.structure import EnumMember, EnumType, Property, StructTable
+from utils.util import Utils
+
+SCHEMA_FILE = "schema.json"
+SCHEMA_VERSION = 1
+JSON_BATCH_SIZE = 4096
+"""Records converted and written as JSON at once, bounding the memory of large tables."""
+
+_READERS = {name: Struct(f"<{fmt.value}").unpack_from for name, fmt in DataFormat.__members__.items()}
+_WRITERS = {name: Struct(f"<{fmt.value}").pack_into for name, fmt in DataFormat.__members__.items()}
+
+Decoder = Callable[[memoryview, int, bytes], dict]
+"""Decode the table at a position of a buffer with a password."""
+FieldDecoder = Callable[[memoryview, int, int, bytes], Any]
+"""Decode a field from the table position, the field offset and a password."""
+Packer = Callable[[flatbuffers.Builder, Any, bytes | None], int]
+"""Pack a dumped dict, or the dumped list of a DataList, with a password."""
+JsonWriter = Callable[[memoryview, list, bytes], list]
+"""Give the JSON text of the tables at positions of a buffer with a password."""
+
+# Text of values as json.dumps(..., indent=4, ensure_ascii=False) writes them
+# in a list of dicts: records are indented once, fields twice and list items
+# three times.
+_RECORD_INDENT = " " * 4
+_FIELD_INDENT = _RECORD_INDENT * 2
+_ITEM_INDENT = _RECORD_INDENT * 3
+_BOOL_JSON = {True: "true", False: "false"}
+_INFINITY = float("inf")
+
+
+def write_schema(path: str, enums: list[EnumType], structs: list[StructTable]) -> None:
+    """Serialize parsed types to a compact schema IR file.
+
+    Enums are stored as [name, underlying type, [[member, value], ...]] and
+    structs as [name, [[field, type, is list], ...]]. The index of a field in
+    its struct is its position in the list, which is also its vtable slot.
+    """
+    schema = {
+        "version": SCHEMA_VERSION,
+        "enums": [
+            [enum.name, enum.underlying_type, [[kv.name, int(kv.value)] for kv in enum.members]]
+            for enum in enums
+        ],
+        "structs": [
+            [struct.name, [[prop.name, prop.data_type, int(prop.is_list)] for prop in struct.properties]]
+            for struct in structs
+        ],
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wt", encoding="utf8") as file:
+        json.dump(schema, file, ensure_ascii=False, separators=(",", ":"))
+
+
+def read_schema(path: str) -> tuple[list[EnumType], list[StructTable]]:
+    """Load the types serialized by write_schema."""
+    with open(path, "rt", encoding="utf8") as file:
+        schema = json.load(file)
+    if schema.get("version") != SCHEMA_VERSION:
+        raise ValueError(f"Unsupported schema version {schema.get('version')} in {path}.")
+    enums = [
+        EnumType(name, underlying_type, [EnumMember(member, str(value)) for member, value in members])
+        for name, underlying_type, members in schema["enums"]
+    ]
+    structs = [
+        StructTable(name, [Property(data_type, prop, bool(is_list)) for prop, data_type, is_list in props])
+        for name, props in schema["structs"]
+    ]
+    return enums, structs
+
+
+def _float_json(value: float | int) -> str:
+    """Text of a float field, or of the int 0 read for an absent one, as json.dumps writes it."""
+    if type(value) is int:
+        return int.__repr__(value)
+    if value != value:
+        return "NaN"
+    if value == _INFINITY:
+        return "Infinity"
+    if value == -_INFINITY:
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+def _field_json(value: Any) -> str:
+    """Text of any field value, with the lines of nested tables indented under their field."""
+    return json.dumps(value, indent=4, ensure_ascii=False).replace("\n", "\n" + _FIELD_INDENT)
+
+
+def _list_json(items: list, encode: Callable[[Any], str]) -> str:
+    if not items:
+        return "[]"
+    separator = ",\n" + _ITEM_INDENT
+    return f"[\n{_ITEM_INDENT}{separator.join(map(encode, items))}\n{_FIELD_INDENT}]"
+
+
+def _write_json_list(file: TextIO, write: JsonWriter, buf: memoryview, records: list, password: bytes) -> None:
+    """Write the JSON list of the tables at positions of a buffer, one batch of records at a time."""
+    if not records:
+        file.write("[]")
+        return
+    file.write("[\n")
+    for start in range(0, len(records), JSON_BATCH_SIZE):
+        if start:
+            file.write(",\n")
+        file.write(",\n".join(write(buf, records[start : start + JSON_BATCH_SIZE], password)))
+    file.write("\n]")
+
+
+def _create_table(builder: flatbuffers.Builder, layout: list, values: list, size: int) -> int:
+    """Write the fields of a table in slot order, skipping default values, then its vtable.
+
+    Args:
+        layout (list): Writer, size and whether the value is an offset, of each slot.
+        values (list): Value of each slot, 0 for absent ones.
+        size (int): Upper bound of the bytes the table takes.
+    """
+    buf, end = reserve(builder, size)
+    off = object_end = end - builder.head
+    slots = [0] * len(layout)
+    for index, (write, size, is_offset) in enumerate(layout):
+        if value := values[index]:
+            off = ((off + size - 1) & -size) + size
+            write(buf, end - off, off - value if is_offset else value)
+            if size == 8:
+                builder.minalign = 8
+            slots[index] = off
+
+    return end_object(builder, buf, end, off, object_end, tuple(slots))
+
+
+class SchemaCodec:
+    """Dump and pack FlatData tables from a schema, without generated code.
+
+    Dicts and bytes are the same as the ones of the generated dump and repack
+    wrappers. Field plans of a struct are compiled into closures when it is
+    first used, so a codec of a whole schema is cheap to load, and codecs of
+    several schema versions can be kept in one process.
+    """
+
+    def __init__(self, enums: list[EnumType], structs: list[StructTable]) -> None:
+        self.enums = enums
+        self.structs = structs
+        self.structs_by_name = {struct.name: struct for struct in structs}
+        self.symbols: dict[str, StructTable | EnumType] = {}
+        for struct in structs:
+            self.symbols.setdefault(struct.name, struct)
+        enum_symbols: dict[str, EnumType] = {}
+        for enum in enums:
+            if enum.underlying_type in DataFlag.__members__:
+                enum_symbols.setdefault(enum.name, enum)
+        self.symbols.update(enum_symbols)
+
+        self.enum_names: dict[str, dict[int, str]] = {}
+        self.enum_values: dict[str, dict[str, int]] = {}
+        for enum in enums:
+            names: dict[int, str] = {}
+            for kv in enum.members:
+                names.setdefault(int(kv.value), Utils.convert_name_to_available(kv.name))
+            self.enum_names[Utils.convert_name_to_available(enum.name)] = names
+            self.enum_values[enum.name] = {
+                Utils.convert_name_to_available(kv.name): int(kv.value) for kv in enum.members
+            }
+
+        self.__decoders: dict[str, Decoder] = {}
+        self.__column_decoders: dict[str, Callable] = {}
+        self.__json_writers: dict[str, JsonWriter] = {}
+        self.__packers: dict[str, Packer] = {}
+
+    @classmethod
+    def from_file(cls, path: str) -> "SchemaCodec":
+        return cls(*read_schema(path))
+
+    def dump(self, struct_name: str, data: bytes | bytearray | memoryview, password: bytes = b"") -> dict:
+        """Dump the root table of a FlatBuffer like dump_<struct_name> does."""
+        buf = memoryview(data)
+        return self.__decoder(struct_name)(buf, read_uoffset(buf, 0)[0], password)
+
+    def dump_table(self, table_name: str, data: bytes | bytearray | memoryview) -> list:
+        """Dump every record of a decrypted DataList table like dump_table does."""
+        excel_name = table_name.removesuffix("Table")
+        dump_columns = self.__columns_decoder(excel_name)
+        buf = memoryview(data)
+        pos = read_uoffset(buf, 0)[0]
+        (offset,) = field_offsets(buf, pos, DATA_LIST_FIELDS)
+        records = tables(buf, pos + offset) if offset else []
+        return dump_columns(buf, records, create_key(excel_name.removesuffix("Excel")))
+
+    def dump_table_json(self, table_name: str, data: bytes | bytearray | memoryview) -> bytes:
+        """Dump a decrypted DataList table straight to the JSON the extractor writes for dump_table.
+
+        The text is the one of json.dumps(rows, indent=4, ensure_ascii=False),
+        written from converted columns without building the dict of any record.
+        """
+        with io.StringIO() as file:
+            self.write_table_json(table_name, data, file)
+            return file.getvalue().encode("utf8")
+
+    def write_table_json(self, table_name: str, data: bytes | bytearray | memoryview, file: TextIO) -> None:
+        """Write a decrypted DataList table to a text file as dump_table_json gives it."""
+        excel_name = table_name.removesuffix("Table")
+        if not excel_name.endswith("Excel"):
+            raise KeyError(f"{excel_name} is not the record of a DataList table.")
+        write = self.__json_writer(excel_name)
+        buf = memoryview(data)
+        pos = read_uoffset(buf, 0)[0]
+        (offset,) = field_offsets(buf, pos, DATA_LIST_FIELDS)
+        records = tables(buf, pos + offset) if offset else []
+        _write_json_list(file, write, buf, records, create_key(excel_name.removesuffix("Excel")))
+
+    def write_rows_json(self, struct_name: str, rows: list[bytes], file: TextIO, password: bytes = b"") -> None:
+        """Write separate FlatBuffers of one struct, such as the Bytes of a database table, as one JSON list.
+
+        The text is the one of json.dumps of [dump(struct_name, row, password) for row in rows].
+        """
+        write = self.__json_writer(struct_name)
+        # Offsets in a FlatBuffer are relative, so the rows are read from one buffer joining them.
+        buf = memoryview(b"".join(rows))
+        records, start = [], 0
+        for row in rows:
+            records.append(start + read_uoffset(buf, start)[0])
+            start += len(row)
+        _write_json_list(file, write, buf, records, password)
+
+    def pack(self, builder: flatbuffers.Builder, struct_name: str, data: dict | list, encrypt: bool = True) -> int:
+        """Pack a dumped dict, or the dumped list of a DataList table, like pack_<struct_name> does."""
+        if struct_name.endswith("ExcelTable"):
+            record_name = self.__struct(struct_name).properties[0].data_type
+            password = create_key(record_name[:-5]) if encrypt else None
+        else:
+            password_key = struct_name[:-5] if struct_name.endswith("Excel") else struct_name
+            password = create_key(password_key) if encrypt else None
+        return self.__packer(struct_name)(builder, data, password)
+
+    def __struct(self, struct_name: str) -> StructTable:
+        if (struct := self.structs_by_name.get(struct_name)) is None:
+            raise KeyError(f"Struct {struct_name} is not in the schema.")
+        return struct
+
+    def __enum(self, data_type: str) -> EnumType | None:
+        prop_data = self.symbols.get(data_type)
+        if isinstance(prop_data, EnumType) and prop_data.underlying_type in ConvertFlag.__members__:
+            return prop_data
+        return None
+
+    # Dump
+    def __decoder(self, struct_name: str) -> Decoder:
+        if (decoder := self.__decoders.get(struct_name)) is None:
+            decoder = self.__decoders[struct_name] = self.__compile_decoder(self.__struct(struct_name))
+        return decoder
+
+    def __compile_decoder(self, struct: StructTable) -> Decoder:
+        fields = Struct(f"<{len(struct.properties)}H")
+        plan = [
+            (Utils.convert_name_to_available(prop.name), index, decode)
+            for index, prop in enumerate(struct.properties)
+            if (decode := self.__field_decoder(prop))
+        ]
+
+        def decode(buf, pos: int, password: bytes) -> dict:
+            offsets = field_offsets(buf, pos, fields)
+            return {name: decode_field(buf, pos, offsets[index], password) for name, index, decode_field in plan}
+
+        return decode
+
+    def __raw_reader(self, prop: Property) -> tuple[FieldDecoder | None, str]:
+        """Reader of the raw value of a field, with the scalar type converting it.
+
+        The type is the underlying one for enums, "string", "bool", or empty for
+        tables. The reader is None for fields that are not dumped.
+        """
+        data_type = prop.data_type
+        if prop.is_list:
+            if data_type == "string":
+                return (lambda buf, pos, offset, password: strings(buf, pos + offset) if offset else ()), data_type
+            if data_type not in DataFormat.__members__:
+                if enum := self.__enum(data_type):
+                    data_type = enum.underlying_type
+                elif isinstance(self.symbols.get(data_type), StructTable):
+                    return (lambda buf, pos, offset, password: tables(buf, pos + offset) if offset else ()), ""
+                else:
+                    return None, ""
+            format = DataFormat[data_type].value
+
+            def read_items(buf, pos: int, offset: int, password: bytes) -> tuple:
+                if not offset:
+                    return ()
+                start, length = vector(buf, pos + offset)
+                return unpack_from(f"<{length}{format}", buf, start)
+
+            return read_items, data_type
+
+        if data_type == "string":
+            return (lambda buf, pos, offset, password: string(buf, pos + offset) if offset else None), data_type
+        if data_type not in ConvertFlag.__members__ and data_type != "bool":
+            if not (enum := self.__enum(data_type)):
+                return None, ""
+            data_type = enum.underlying_type
+        read, default = _READERS[data_type], False if data_type == "bool" else 0
+        return (lambda buf, pos, offset, password: read(buf, pos + offset)[0] if offset else default), data_type
+
+    def __value_converter(self, prop: Property) -> Callable[[Any, bytes], Any] | None:
+        """Convert one raw value of a field like the accessor based wrapper does."""
+        data_type = prop.data_type
+        if data_type in ConvertFlag.__members__:
+            return getattr(encryption, ConvertFlag[data_type].value)
+        if data_type == "bool":
+            return lambda value, password: value
+        if enum := self.__enum(data_type):
+            names = self.enum_names[Utils.convert_name_to_available(enum.name)]
+            convert = getattr(encryption, ConvertFlag[enum.underlying_type].value)
+            return lambda value, password: names[convert(value, password)]
+        return None
+
+    def __field_decoder(self, prop: Property) -> FieldDecoder | None:
+        """Decode and convert a field of one table, or None if the wrappers do not dump it."""
+        read, _ = self.__raw_reader(prop)
+        prop_data = self.symbols.get(prop.data_type)
+        if isinstance(prop_data, StructTable):
+            struct_name = prop_data.name
+            if prop.is_list:
+                return lambda buf, pos, offset, password: [
+                    self.__decoder(struct_name)(buf, item, password) for item in read(buf, pos, offset, password)
+                ]
+            return lambda buf, pos, offset, password: (
+                self.__decoder(struct_name)(buf, pos + offset + read_uoffset(buf, pos + offset)[0], password)
+                if offset
+                else None
+            )
+
+        if read is None or (convert := self.__value_converter(prop)) is None:
+            return None
+        if prop.is_list:
+            return lambda buf, pos, offset, password: [
+                convert(value, password) for value in read(buf, pos, offset, password)
+            ]
+        return lambda buf, pos, offset, password: convert(read(buf, pos, offset, password), password)
+
+    def __columns_decoder(self, struct_name: str) -> Callable:
+        if (decoder := self.__column_decoders.get(struct_name)) is None:
+            if not struct_name.endswith("Excel"):
+                raise KeyError(f"{struct_name} is not the record of a DataList table.")
+            decoder = self.__column_decoders[struct_name] = self.__compile_columns(self.__struct(struct_name))
+        return decoder
+
+    def __column_converter(self, prop: Property, data_type: str) -> Callable[[list, bytes], list] | None:
+        """Convert a whole column of raw values at once, or None to keep the decoded values."""
+        if data_type == "string":
+            convert = convert_strings
+        elif data_type and data_type != "bool":
+            if prop.data_type in ConvertFlag.__members__:
+                convert = lambda column, password: convert_column(column, password, data_type)
+            else:
+                # Enum values are converted as their underlying type first.
+                names = self.enum_names[Utils.convert_name_to_available(self.__enum(prop.data_type).name)]
+                convert = lambda column, password: [names[value] for value in convert_column(column, password, data_type)]
+        else:
+            return None
+        if prop.is_list:
+            # Items of every record are converted as one column, then split again.
+            return lambda column, password: split(convert(list(chain.from_iterable(column)), password), column)
+        return convert
+
+    def __compile_column_reader(self, struct: StructTable) -> tuple[list[Property], Callable[[memoryview, list, bytes], list]]:
+        """Read the dumped fields of many tables of a struct as converted columns.
+
+        Returns:
+            tuple: Dumped properties, and a function giving their columns in the same order.
+        """
+        fields = Struct(f"<{len(struct.properties)}H")
+        plan = []
+        for index, prop in enumerate(struct.properties):
+            read, data_type = self.__raw_reader(prop)
+            convert = self.__column_converter(prop, data_type) if read else None
+            if convert is None:
+                if not (read := self.__field_decoder(prop)):
+                    continue
+            plan.append((prop, index, read, convert))
+
+        def read_columns(buf, records: list, password: bytes) -> list:
+            columns = [[] for _ in plan]
+            for pos in records:
+                offsets = field_offsets(buf, pos, fields)
+                for column, (_, index, read, _) in zip(columns, plan):
+                    column.append(read(buf, pos, offsets[index], password))
+            return [
+                convert(column, password) if convert else column
+                for column, (_, _, _, convert) in zip(columns, plan)
+            ]
+
+        return [prop for prop, _, _, _ in plan], read_columns
+
+    def __compile_columns(self, struct: StructTable) -> Callable:
+        """Decode a whole DataList, converting scalar and string fields one column at a time."""
+        props, read_columns = self.__compile_column_reader(struct)
+        names = [Utils.convert_name_to_available(prop.name) for prop in props]
+
+        def dump_columns(buf, records: list, password: bytes) -> list:
+            if not names:
+                return [{} for _ in records]
+            return [dict(zip(names, values)) for values in zip(*read_columns(buf, records, password))]
+
+        return dump_columns
+
+    def __json_writer(self, struct_name: str) -> JsonWriter:
+        if (writer := self.__json_writers.get(struct_name)) is None:
+            writer = self.__json_writers[struct_name] = self.__compile_json_writer(self.__struct(struct_name))
+        return writer
+
+    def __json_encoder(self, prop: Property) -> Callable[[Any], str] | None:
+        """Text of one converted value of a field, or None for tables and other values."""
+        data_type = prop.data_type
+        if data_type == "string" or self.__enum(data_type):
+            return encode_basestring
+        if data_type == "bool":
+            return _BOOL_JSON.__getitem__
+        if data_type in ("float", "double"):
+            return _float_json
+        if data_type in ConvertFlag.__members__:
+            return int.__repr__
+        return None
+
+    def __compile_json_writer(self, struct: StructTable) -> JsonWriter:
+        """Write records of a struct as JSON text, encoding their converted fields one column at a time."""
+        props, read_columns = self.__compile_column_reader(struct)
+        if not props:
+            return lambda buf, records, password: [_RECORD_INDENT + "{}"] * len(records)
+
+        encoders = []
+        for prop in props:
+            if (encode := self.__json_encoder(prop)) is None:
+                encoders.append(lambda column: [_field_json(value) for value in column])
+            elif prop.is_list:
+                encoders.append(lambda column, encode=encode: [_list_json(items, encode) for items in column])
+            else:
+                encoders.append(lambda column, encode=encode: list(map(encode, column)))
+        keys = [encode_basestring(Utils.convert_name_to_available(prop.name)).replace("%", "%%") for prop in props]
+        record = (
+            f"{_RECORD_INDENT}{{\n"
+            + ",\n".join(f"{_FIELD_INDENT}{key}: %s" for key in keys)
+            + f"\n{_RECORD_INDENT}}}"
+        )
+
+        def write(buf, records: list, password: bytes) -> list:
+            columns = [
+                encode(column) for encode, column in zip(encoders, read_columns(buf, records, password))
+            ]
+            return [record % values for values in zip(*columns)]
+
+        return write
+
+    # Pack
+    def __packer(self, struct_name: str) -> Packer:
+        if (packer := self.__packers.get(struct_name)) is None:
+            struct = self.__struct(struct_name)
+            if struct_name.endswith("ExcelTable"):
+                packer = self.__compile_table_packer(self.__struct(struct.properties[0].data_type))
+            else:
+                packer = self.__compile_packer(struct)
+            self.__packers[struct_name] = packer
+        return packer
+
+    def __pack_converter(self, prop: Property) -> tuple[Callable[[Any, bytes | None], Any], str]:
+        """Encrypt one value of a field, with the type of the encrypted value."""
+        data_type = prop.data_type
+        if data_type == "bool":
+            return (lambda value, password: value), data_type
+        if data_type in self.enum_values:
+            values = self.enum_values[data_type]
+            return (lambda value, password: convert_int(values[value], password)), "int"
+        if data_type == "float":
+            return encrypt_float, data_type
+        if data_type == "double":
+            return encrypt_double, data_type
+        if data_type in ConvertFlag.__members__ and data_type != "string":
+            return getattr(encryption, ConvertFlag[data_type].value), data_type
+        return convert_int, data_type
+
+    def __column_encoder(self, prop: Property) -> Callable[[list, bytes | None], list] | None:
+        """Encrypt one scalar or string field of a whole DataList, or None if it cannot be batched."""
+        name = prop.name
+        if prop.is_list:
+            return None
+        if prop.data_type == "string":
+            return lambda dump_list, password: encrypt_strings([record.get(name, "") for record in dump_list], password)
+        if prop.data_type in self.enum_values:
+            values = self.enum_values[prop.data_type]
+            return lambda dump_list, password: encrypt_column(
+                [values[record.get(name, 0)] for record in dump_list], password, "int"
+            )
+        if prop.data_type in ConvertFlag.__members__:
+            data_type = prop.data_type
+            return lambda dump_list, password: encrypt_column(
+                [record.get(name, 0) for record in dump_list], password, data_type
+            )
+        return None
+
+    def __pack_type(self, prop: Property) -> str:
+        """Type a field is written as, "offset" for strings and lists."""
+        if prop.is_list:
+            if prop.data_type == "string":
+                return "offset"
+            _, data_type = self.__pack_converter(prop)
+            if data_type in DataFormat.__members__:
+                return "offset"
+        elif prop.data_type == "string":
+            return "offset"
+        elif prop.data_type in DataFlag.__members__:
+            return prop.data_type
+        elif prop.data_type in self.enum_values and (enum := self.__enum(prop.data_type)):
+            return enum.underlying_type
+        raise ValueError(f"Field {prop.name} of type {prop.data_type} cannot be packed.")
+
+    def __compile_packer(self, struct: StructTable) -> Callable:
+        columns = struct.name.endswith("Excel")
+        layout, string_fields, vectors, scalars = [], [], [], []
+        column = 0
+        for index, prop in enumerate(struct.properties):
+            pack_type = self.__pack_type(prop)
+            size = 4 if pack_type == "offset" else calcsize(DataFormat[pack_type].value)
+            layout.append((write_uoffset if pack_type == "offset" else _WRITERS[pack_type], size, pack_type == "offset"))
+            # Fields encrypted by the table packer arrive in property order.
+            column_index = column if columns and self.__column_encoder(prop) else None
+            column += column_index is not None
+
+            if prop.is_list:
+                vectors.append((index, prop.name, self.__vector_creator(prop)))
+            elif prop.data_type == "string":
+                string_fields.append((index, prop.name, column_index))
+            else:
+                convert, _ = self.__pack_converter(prop)
+                scalars.append((index, prop.name, convert, column_index))
+        table_size = 12 + 2 * len(layout) + 2 * sum(size for _, size, _ in layout)
+
+        def pack(builder: flatbuffers.Builder, data: dict, password: bytes | None, encrypted: tuple | None = None) -> int:
+            values = [0] * len(layout)
+            for index, name, column in string_fields:
+                value = encrypt_string(data.get(name, ""), password) if column is None or encrypted is None else encrypted[column]
+                values[index] = create_string(builder, value)
+            for index, name, create in vectors:
+                if name in data:
+                    values[index] = create(builder, data[name], password)
+            for index, name, convert, column in scalars:
+                values[index] = convert(data.get(name, 0), password) if column is None or encrypted is None else encrypted[column]
+            return _create_table(builder, layout, values, table_size)
+
+        return pack
+
+    def __vector_creator(self, prop: Property) -> Callable[[flatbuffers.Builder, list, bytes | None], int]:
+        if prop.data_type == "string":
+            return lambda builder, items, password: create_offsets(
+                builder, [create_string(builder, encrypt_string(item, password)) for item in items]
+            )
+        convert, data_type = self.__pack_converter(prop)
+        format = DataFormat[data_type].value
+        size = calcsize(format)
+        if prop.data_type == "bool":
+            return lambda builder, items, password: create_vector(builder, format, size, items)
+        if prop.data_type in self.enum_values:
+            # Scalar lists are encrypted at once, like a column.
+            values = self.enum_values[prop.data_type]
+            return lambda builder, items, password: create_vector(
+                builder, format, size, encrypt_column([values[item] for item in items], password, "int")
+            )
+        if prop.data_type in ConvertFlag.__members__:
+            return lambda builder, items, password: create_vector(
+                builder, format, size, encrypt_column(items, password, data_type)
+            )
+        return lambda builder, items, password: create_vector(
+            builder, format, size, [convert(item, password) for item in items]
+        )
+
+    def __compile_table_packer(self, record_struct: StructTable) -> Packer:
+        pack_record = self.__compile_packer(record_struct)
+        encoders = [encode for prop in record_struct.properties if (encode := self.__column_encoder(prop))]
+        layout = [(write_uoffset, 4, True)]
+
+        def pack(builder: flatbuffers.Builder, dump_list: list, password: bytes | None) -> int:
+            if encoders:
+                # Encrypt every scalar and string field of the DataList in one call per field.
+                columns = zip(*(encode(dump_list, password) for encode in encoders))
+                offsets = [
+                    pack_record(builder, record, password, encrypted)
+                    for record, encrypted in zip(dump_list, columns)
+                ]
+            else:
+                offsets = [pack_record(builder, record, password) for record in dump_list]
+            return _create_table(builder, layout, [create_offsets(builder, offsets)], 22)
+
+        return pack
@@ -1,10 +1,19 @@
 """Store some structures."""
 
-from dataclasses import dataclass
+import os
+from collections.abc import Mapping, MutableMapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from enum import Enum
+from types import ModuleType
 from typing import Any, Iterator, Literal, overload
 from urllib.parse import urljoin
 
+from lib.encryption import calculate_checksum
+
+VERIFY_BATCH_SIZE = 64 * 1024 * 1024
+"""Bytes of small files hashed by one worker task when verifying a catalog."""
+
 
 # Database
 @dataclass
@@ -57,6 +66,121 @@ class EnumType:
     members: list[EnumMember]
 
 
+# FlatData
+class FlatDataTypes(Mapping):
+    """Case-insensitive view of the types of a generated FlatData package.
+
+    Names come from the package registry, and a type module is only imported
+    when that type is looked up. Packages generated before the registry import
+    every type in their __init__, so their FlatBuffer types are found there.
+    """
+
+    def __init__(self, package: ModuleType) -> None:
+        self.package = package
+        if hasattr(package, "TYPES"):
+            self.names = {name.lower(): name for name in package.TYPES}
+            self.structs: tuple[str, ...] = tuple(package.STRUCTS)
+        else:
+            self.structs = tuple(
+                t_name for t_name, t_class in vars(package).items() if hasattr(t_class, "GetRootAs")
+            )
+            self.names = {name.lower(): name for name in self.structs}
+
+    def __getitem__(self, name: str) -> type:
+        return getattr(self.package, self.names[name.lower()])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class Record(MutableMapping):
+    """Base of the slotted record classes generated for FlatData structs.
+
+    A record holds the fields of one decoded table in slots instead of a dict,
+    named and ordered like the keys of the dict a dump gives. It is read and
+    written like that dict, so replacements and packers take either. A field
+    never set is absent, like a key missing from a dict loaded from JSON.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "Record":
+        """Record of the fields of a dict, raising KeyError for a key that is not one of them."""
+        record = cls.__new__(cls)
+        for name, value in data.items():
+            record[name] = value
+        return record
+
+    def to_dict(self) -> dict:
+        """Convert the record, and the records in its fields, to the dicts a dump gives."""
+        return {name: _record_to_plain(value) for name, value in self.items()}
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return getattr(self, name, default) if name in self.__slots__ else default
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.__slots__ and hasattr(self, name)  # type: ignore[arg-type]
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self.__slots__:
+            try:
+                return getattr(self, name)
+            except AttributeError:
+                pass
+        raise KeyError(name)
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        if name not in self.__slots__:
+            raise KeyError(name)
+        setattr(self, name, value)
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        delattr(self, name)
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name in self.__slots__ if hasattr(self, name))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.to_dict()!r})"
+
+
+def _record_to_plain(value: Any) -> Any:
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_record_to_plain(item) for item in value]
+    return value
+
+
+def record_to_json(value: Any) -> dict:
+    """Default of json.dump and json.dumps writing records like the dicts they replace."""
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+def to_records(rows: list, record_type: type[Record]) -> list:
+    """Replace the dicts of a table loaded from JSON by records, one at a time.
+
+    A dict with keys the struct does not have stays a dict, so these keys are
+    kept like they are without records.
+    """
+    fields = frozenset(record_type.__slots__)
+    for index, row in enumerate(rows):
+        if isinstance(row, Mapping) and row.keys() <= fields:
+            rows[index] = record_type.from_dict(row)
+    return rows
+
+
 class ResourceType(Enum):
     table = 0
     media = 1
@@ -74,6 +198,25 @@ class ResourceItem:
     addition: dict
 
 
+@dataclass
+class ResourceVerification:
+    missing: list[ResourceItem] = field(default_factory=list)
+    wrong_size: list[ResourceItem] = field(default_factory=list)
+    wrong_checksum: list[ResourceItem] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.missing or self.wrong_size or self.wrong_checksum)
+
+
+def _find_wrong_checksums(batch: list[tuple[int, str, str, str]]) -> list[int]:
+    """Hash files of a batch and return the index of those not matching."""
+    return [
+        index
+        for index, path, checksum, check_type in batch
+        if calculate_checksum(path, check_type) != checksum
+    ]
+
+
 class Resource:
     def __init__(self) -> None:
         self.resources: list[ResourceItem] = []
@@ -156,6 +299,54 @@ class Resource:
         """
         self.resources.sort(key=lambda x: x.size, reverse=descending)
 
+    def verify(
+        self, base_dir: str, max_workers: int | None = None
+    ) -> ResourceVerification:
+        """Check local files against the catalog.
+
+        Sizes are checked first, then files are hashed in chunks across a process
+        pool. Files larger than VERIFY_BATCH_SIZE get a task each and smaller ones
+        are batched up to that size, largest first, so workers stay evenly loaded.
+
+        Args:
+            base_dir (str): Directory the item paths are relative to.
+            max_workers (int | None, optional): Number of processes. Defaults to the CPU count.
+
+        Returns:
+            ResourceVerification: Items missing, with wrong size or with wrong checksum.
+        """
+        result = ResourceVerification()
+        to_hash: list[tuple[int, str]] = []
+        for index, item in enumerate(self.resources):
+            file_path = os.path.join(base_dir, item.path)
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                result.missing.append(item)
+                continue
+            if size != item.size:
+                result.wrong_size.append(item)
+            else:
+                to_hash.append((index, file_path))
+
+        to_hash.sort(key=lambda x: self.resources[x[0]].size, reverse=True)
+        batches: list[list[tuple[int, str, str, str]]] = []
+        batch_size = VERIFY_BATCH_SIZE
+        for index, file_path in to_hash:
+            item = self.resources[index]
+            if batch_size + item.size > VERIFY_BATCH_SIZE:
+                batches.append([])
+                batch_size = 0
+            batches[-1].append(
+                (index, file_path, str(item.checksum).lower(), item.check_type)
+            )
+            batch_size += item.size
+
+        with ProcessPoolExecutor(max_workers) as executor:
+            for wrong in executor.map(_find_wrong_checksums, batches):
+                result.wrong_checksum.extend(self.resources[index] for index in wrong)
+        return result
+
 
 class CNResource:
     def __init__(self) -> None:
@@ -1,43 +1,72 @@
 import os
 import importlib
+import importlib.util
 from lib.console import notice
 from pathlib import Path
 import json
 import flatbuffers
-from lib.encryption import xor_with_key, create_key
+from lib.encryption import xor_with_key_into, create_key, preload_struct_keys, load_key_store, KEY_STORE_FILE
+from lib.structure import FlatDataTypes, Record, to_records
 from utils.config import Config
 import sqlite3
 
 class TableRepackerImpl:
     def __init__(self, flat_data_module_name):
+        self.records_lib = None
         try:
             self.flat_data_lib = importlib.import_module(flat_data_module_name)
             self.repack_wrapper_lib = importlib.import_module(
                 f"{flat_data_module_name}.repack_wrapper"
             )
+            if not load_key_store(os.path.join(os.path.dirname(self.flat_data_lib.__file__), KEY_STORE_FILE)):
+                preload_struct_keys(FlatDataTypes(self.flat_data_lib).structs)
+            # Only generated with record classes enabled.
+            if importlib.util.find_spec(f"{flat_data_module_name}.records"):
+                self.records_lib = importlib.import_module(f"{flat_data_module_name}.records")
         except Exception as e:
             notice(
                 f"Cannot import FlatData module. Make sure FlatData is available in Extracted folder. {e}",
                 "error",
             )
-            
+
+    def record_type(self, table_type: str) -> type[Record] | None:
+        """Record class of the rows of a table, if the FlatData package has record classes."""
+        if self.records_lib is None:
+            return None
+        return getattr(self.records_lib, table_type.removesuffix("Table"), None)
+
+    def load_json(self, json_path: Path):
+        """Load a dumped table, holding its rows as records when the package has record classes."""
+        with open(json_path, 'r', encoding='utf-8') as f:
+            json_data = json.load(f)
+        if isinstance(json_data, list) and (record_type := self.record_type(json_path.stem)):
+            to_records(json_data, record_type)
+        return json_data
+
+    def pack_function(self, table_type: str, encrypt: bool = True):
+        """Packer of a table type taking (builder, data), the plain variant when not encrypting."""
+        if not encrypt and (pack_plain := getattr(self.repack_wrapper_lib, f"pack_{table_type}_plain", None)):
+            return pack_plain
+        if not (pack_func := getattr(self.repack_wrapper_lib, f"pack_{table_type}", None)):
+            return None
+        return lambda builder, data: pack_func(builder, data, encrypt)
+
     def repackExcelZipJson(self, json_path: Path):
         table_type = json_path.stem
         if not table_type:
             raise ValueError("JSON data must include a 'table' key indicating the table type.")
-        pack_func_name = f"pack_{table_type}"
-        pack_func = getattr(self.repack_wrapper_lib, pack_func_name, None)
+        # Excel.zip tables have their fields encrypted
+        pack_func = self.pack_function(table_type)
         if not pack_func:
             raise ValueError(f"No pack function found for table type: {table_type}.")
-        with open(json_path, 'r', encoding = 'utf-8') as f:
-            json_data = json.loads(f.read())
-            builder = flatbuffers.Builder(4096)
-            offset = pack_func(builder, json_data)
-            builder.Finish(offset)
-            bytes_output = bytes(builder.Output())
-            if not Config.is_cn: # CN does not encrypt its Excel.zip (but does encrypt tables in sqlite3 databases such as ExcelDB.db)
-                bytes_output = xor_with_key(table_type, bytes_output)
-            return bytes_output
+        json_data = self.load_json(json_path)
+        builder = flatbuffers.Builder(4096)
+        offset = pack_func(builder, json_data)
+        builder.Finish(offset)
+        bytes_output = builder.Output()
+        if not Config.is_cn: # CN does not encrypt its Excel.zip (but does encrypt tables in sqlite3 databases such as ExcelDB.db)
+            xor_with_key_into(table_type, bytes_output)
+        return bytes(bytes_output)
     def repackjson2db(self, json_path: Path, db_path: Path) -> None:
         table_type = json_path.stem
         table_name = table_type.replace("Excel", "DBSchema")
@@ -56,8 +85,7 @@ class TableRepackerImpl:
         columns = [col[1] for col in columns_info]
 
         # Read JSON data
-        with open(json_path, 'r', encoding='utf-8') as f:
-            json_data = json.load(f)
+        json_data = self.load_json(json_path)
 
         # Clear existing data (MATCH C# BEHAVIOR)
         cursor.execute(f"DELETE FROM {table_name};")
@@ -69,22 +97,24 @@ class TableRepackerImpl:
         # Start transaction (MATCH C# BEHAVIOR)
         #cursor.execute("BEGIN TRANSACTION;")
 
+        # Rows are stored unencrypted
+        pack_func = self.pack_function(table_type, encrypt=False)
+
         try:
             # Process each entry
             for entry in json_data:
                 # Serialize FlatBuffers (MATCH C# IMPLEMENTATION)
                 builder = flatbuffers.Builder(4096)
                 
-                pack_func = getattr(self.repack_wrapper_lib, f"pack_{table_type}", None)
                 if not pack_func:
                     raise ValueError(f"Pack function for {table_type} not found")
                 
                 # Pack data
                 #print(entry['Path'])
-                offset = pack_func(builder, entry, False)
+                offset = pack_func(builder, entry)
                 builder.Finish(offset)
                 bytes_output = bytes(builder.Output())
-                flatbuffer_class = self.flat_data_lib.__dict__[table_type]
+                flatbuffer_class = getattr(self.flat_data_lib, table_type)
                 flatbuffer_obj = getattr(flatbuffer_class, "GetRootAs")(bytes_output)
                 #bytes_output = xor_with_key(table_type, bytes_output)
 
@@ -1,10 +1,15 @@
 from os import path
 EXTRACT_DIR = "Extracted"
 DUMP_PATH = "Dumps"
+# Read FlatData types straight from global-metadata.dat instead of dumping il2cpp.
+# Faster and needs no external binary, but fields holding nested tables have
+# Nullable<T> types only the il2cpp binary describes, so they are not dumped.
+USE_METADATA = False
 if not path.exists(path.join(EXTRACT_DIR, "FlatData")):
     import setup_apk
     from lib.dumper import IL2CppDumper
     from lib.console import notice
+    from lib.metadata import is_metadata
     from utils.util import FileUtils
     from extractor import compile_python
     IL2CPP_NAME = "libil2cpp.so"
@@ -13,27 +18,36 @@ if not path.exists(path.join(EXTRACT_DIR, "FlatData")):
     TEMP_DIR = "Temp"
 
     save_path = TEMP_DIR
-    dumper = IL2CppDumper()
-    dumper.get_il2cpp_dumper(save_path)
-
-    il2cpp_path = FileUtils.find_files(TEMP_DIR, [IL2CPP_NAME], True)
     metadata_path = FileUtils.find_files(
         TEMP_DIR, [METADATA_NAME], True
     )
 
-    if not (il2cpp_path and metadata_path):
+    if not metadata_path:
         raise FileNotFoundError(
-            "Cannot find il2cpp binary file or global-metadata file. Make sure exist."
+            "Cannot find global-metadata file. Make sure exist."
         )
-    abs_il2cpp_path = path.abspath(il2cpp_path[0])
     abs_metadata_path = path.abspath(metadata_path[0])
 
-    extract_path = path.abspath(path.join(EXTRACT_DIR, DUMP_PATH))
+    if USE_METADATA and is_metadata(abs_metadata_path):
+        # FlatData types are read from the metadata itself, without dumping il2cpp.
+        compile_python(abs_metadata_path, EXTRACT_DIR)
+    else:
+        dumper = IL2CppDumper()
+        dumper.get_il2cpp_dumper(save_path)
 
-    print("Try to dump il2cpp...")
-    dumper.dump_il2cpp(
-        extract_path, abs_il2cpp_path, abs_metadata_path, 5
-    )
-    notice("Dump il2cpp binary file successfully.")
-    compile_python(path.join(extract_path, "dump.cs"), EXTRACT_DIR)
-    notice("Generated FlatData to dir: " + EXTRACT_DIR)
\ No newline at end of file
+        il2cpp_path = FileUtils.find_files(TEMP_DIR, [IL2CPP_NAME], True)
+        if not il2cpp_path:
+            raise FileNotFoundError(
+                "Cannot find il2cpp binary file or global-metadata file. Make sure exist."
+            )
+        abs_il2cpp_path = path.abspath(il2cpp_path[0])
+
+        extract_path = path.abspath(path.join(EXTRACT_DIR, DUMP_PATH))
+
+        print("Try to dump il2cpp...")
+        dumper.dump_il2cpp(
+            extract_path, abs_il2cpp_path, abs_metadata_path, 5
+        )
+        notice("Dump il2cpp binary file successfully.")
+        compile_python(path.join(extract_path, "dump.cs"), EXTRACT_DIR)
+    notice("Generated FlatData to dir: " + EXTRACT_DIR)
@@ -0,0 +1,137 @@
+"""Vectorized keystreams and batch string conversion against the per-word and per-item originals."""
+
+import random
+import unittest
+from base64 import b64encode
+from itertools import cycle
+
+from lib.encryption import (
+    MersenneTwister,
+    VectorizedMersenneTwister,
+    calculate_hash,
+    convert_string,
+    convert_strings,
+    create_key,
+    create_keys,
+    encrypt_string,
+    encrypt_strings,
+    xor,
+    xor_into,
+    xor_with_key,
+)
+
+SEEDS = (0, 1, 5489, 0x7FFFFFFF, 0xFFFFFFFF, calculate_hash("LocalizeExcel"))
+NAMES = ("", "Localize", "LocalizeExcelTable", "Excel.zip", "名前")
+SIZES = (0, 1, 2, 3, 4, 5, 623, 624, 625, 2495, 2496, 2497, 2500, 4993)
+"""Byte lengths around word and twist block (624 words, 2496 bytes) boundaries."""
+
+
+def baseline_key(name: str, size: int) -> bytes:
+    return MersenneTwister(calculate_hash(name)).next_bytes(size)
+
+
+def baseline_xor(value: bytes, key: bytes) -> bytes:
+    return bytes(v ^ k for v, k in zip(value, cycle(key)))
+
+
+class KeystreamTest(unittest.TestCase):
+    def test_twister_words(self) -> None:
+        for seed in SEEDS:
+            with self.subTest(seed=seed):
+                baseline, vectorized = MersenneTwister(seed), VectorizedMersenneTwister(seed)
+                self.assertEqual(
+                    [vectorized.genrand_int32() for _ in range(1300)],
+                    [baseline.genrand_int32() for _ in range(1300)],
+                )
+
+    def test_twister_bytes(self) -> None:
+        for seed in SEEDS:
+            for size in SIZES:
+                with self.subTest(seed=seed, size=size):
+                    self.assertEqual(
+                        VectorizedMersenneTwister(seed).next_bytes(size), MersenneTwister(seed).next_bytes(size)
+                    )
+
+    def test_create_keys(self) -> None:
+        for size in SIZES:
+            with self.subTest(size=size):
+                expected = {name: baseline_key(name, size) for name in NAMES}
+                self.assertEqual(create_keys(NAMES, size), expected)
+                self.assertEqual({name: create_key(name, size) for name in NAMES}, expected)
+
+    def test_xor(self) -> None:
+        rnd = random.Random(1)
+        for key_size in (1, 3, 8, 16, 2497):
+            key = rnd.randbytes(key_size)
+            for size in SIZES:
+                with self.subTest(key_size=key_size, size=size):
+                    value = rnd.randbytes(size)
+                    expected = baseline_xor(value, key)
+                    self.assertEqual(xor(value, key), expected)
+                    buffer = bytearray(value)
+                    xor_into(buffer, key)
+                    self.assertEqual(buffer, expected)
+
+    def test_xor_with_key(self) -> None:
+        rnd = random.Random(2)
+        for size in SIZES:
+            with self.subTest(size=size):
+                value = rnd.randbytes(size)
+                self.assertEqual(
+                    xor_with_key("ScenarioExcelTable", value),
+                    baseline_xor(value, baseline_key("ScenarioExcelTable", size)),
+                )
+
+
+class StringBatchTest(unittest.TestCase):
+    KEYS = (None, b"", create_key("Localize"), b"\x01\x02\x03")
+
+    def encrypted(self, raw: bytes, key: bytes) -> str:
+        return b64encode(xor(raw, key) if key else raw).decode()
+
+    def test_convert_strings(self) -> None:
+        rnd = random.Random(3)
+        for key in self.KEYS:
+            values = [
+                None, "", b"", "名前", "hello world!", b"plain utf8 \xe5\x90\x8d", "QU\nJD", " QUJD ", "QUJD====",
+                "abc", "ab=c", "====", "a===", "ab==cd", "QQ", "QQ=", "QQ==", "QUI=QUI=",
+            ]
+            if key:
+                values += [
+                    self.encrypted(raw, key)
+                    for raw in (
+                        "😀 surrogate pair".encode("utf-16le"),
+                        b"\x00\xd8",  # Lone high surrogate.
+                        b"\x00\xdc",  # Lone low surrogate.
+                        b"\x00\xdc\x00\xd8",  # Pair in the wrong order.
+                        b"A\x00\x00\xd8",
+                        b"\xff\xfe",  # Only a BOM.
+                        b"\xfe\xff",
+                        b"\xfe\xff\x00A\xd8\x3d\xde\x00",  # Big-endian BOM, then text.
+                        b"\xff\xfeA\x00",
+                        b"A\x00B",  # Odd length.
+                        b"\x00\x00",
+                    )
+                ]
+                values += [encrypt_string(text, key) for text in ("", "a", "名前テキスト" * 50, "\n\"'")]
+                values += [self.encrypted(rnd.randbytes(rnd.randint(0, 12)), key) for _ in range(500)]
+            values += [item.encode() for item in values if isinstance(item, str) and item.isascii()]
+            with self.subTest(key=key):
+                self.assertEqual(convert_strings(values, key), [convert_string(value, key) for value in values])
+
+    def test_encrypt_strings(self) -> None:
+        values = ["", "a", "😀", "名前テキスト" * 50, "\n\"'", "ab"]
+        for key in self.KEYS:
+            with self.subTest(key=key):
+                if key == b"":
+                    # Nothing to encrypt with, like the original xor.
+                    self.assertRaises(ValueError, encrypt_string, "a", key)
+                    self.assertRaises(ValueError, encrypt_strings, values, key)
+                    continue
+                self.assertEqual(encrypt_strings(values, key), [encrypt_string(value, key) for value in values])
+                self.assertEqual(encrypt_strings([], key), [])
+                self.assertEqual(convert_strings(encrypt_strings(values, key), key), values)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Lazily loading FlatData package, with types looked up after nested tables are read."""
+
+import contextlib
+import importlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+import flatbuffers
+
+from extractor import compile_python
+from lib.encryption import create_key
+from lib.structure import FlatDataTypes
+
+DUMP_CS = """namespace FlatData
+{
+	public struct RewardExcel : IFlatbufferObject // TypeDefIndex: 200
+	{
+		private Table __p; // 0x10
+		public ByteBuffer ByteBuffer { get; }
+		public long Id { get; }
+		public string Name { get; }
+	}
+
+	public struct RewardExcelTable : IFlatbufferObject // TypeDefIndex: 201
+	{
+		private Table __p; // 0x10
+		public ByteBuffer ByteBuffer { get; }
+		public int DataListLength { get; }
+		public FlatData.RewardExcel? DataList(int j) => default;
+	}
+}
+"""
+
+ROWS = [{"Id": 1, "Name": "名前"}, {"Id": 2, "Name": ""}]
+
+
+def unload_package(package: str) -> None:
+    for name in [name for name in sys.modules if name.partition(".")[0] == package]:
+        del sys.modules[name]
+
+
+class LazyPackageTest(unittest.TestCase):
+    PACKAGE = "LazyFlatData"
+    TYPES_PER_MODULE = 1
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.folder = tempfile.TemporaryDirectory()
+        dump_path = os.path.join(cls.folder.name, "dump.cs")
+        with open(dump_path, "w", encoding="utf8") as file:
+            file.write(DUMP_CS)
+        with contextlib.redirect_stdout(io.StringIO()):
+            compile_python(dump_path, os.path.join(cls.folder.name, cls.PACKAGE), TYPES_PER_MODULE=cls.TYPES_PER_MODULE)
+        sys.path.insert(0, cls.folder.name)
+        repack_wrapper = importlib.import_module(f"{cls.PACKAGE}.FlatData.repack_wrapper")
+        builder = flatbuffers.Builder(0)
+        builder.Finish(repack_wrapper.pack_RewardExcelTable(builder, ROWS))
+        cls.table_bytes = bytes(builder.Output())
+        builder = flatbuffers.Builder(0)
+        builder.Finish(repack_wrapper.pack_RewardExcel_plain(builder, ROWS[0]))
+        cls.row_bytes = bytes(builder.Output())
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        sys.path.remove(cls.folder.name)
+        unload_package(cls.PACKAGE)
+        cls.folder.cleanup()
+
+    def setUp(self) -> None:
+        # Every test starts with no type imported yet.
+        unload_package(self.PACKAGE)
+        self.flat_data = importlib.import_module(f"{self.PACKAGE}.FlatData")
+        self.dump_wrapper = importlib.import_module(f"{self.PACKAGE}.FlatData.dump_wrapper")
+        self.repack_wrapper = importlib.import_module(f"{self.PACKAGE}.FlatData.repack_wrapper")
+
+    def test_lookup_and_pack_after_dump(self) -> None:
+        table = self.flat_data.RewardExcelTable.GetRootAs(self.table_bytes)
+        self.assertEqual(self.dump_wrapper.dump_RewardExcelTable(table, create_key("Reward")), {"DataList": ROWS})
+
+        row = FlatDataTypes(self.flat_data)["rewardexcel"].GetRootAs(self.row_bytes)
+        self.assertEqual(self.dump_wrapper.dump_RewardExcel_plain(row), ROWS[0])
+        builder = flatbuffers.Builder(0)
+        builder.Finish(self.repack_wrapper.pack_RewardExcelTable(builder, ROWS))
+        self.assertEqual(bytes(builder.Output()), self.table_bytes)
+
+    def test_nested_table_before_type_lookup(self) -> None:
+        table = self.flat_data.RewardExcelTable.GetRootAs(self.table_bytes)
+        self.assertEqual(self.dump_wrapper.dump_RewardExcel(table.DataList(0), create_key("Reward")), ROWS[0])
+        self.assertIsInstance(table.DataList(1), self.flat_data.RewardExcel)
+        self.assertEqual(self.flat_data.RewardExcel.GetRootAs(self.row_bytes).Id(), 1)
+
+
+class ConsolidatedPackageTest(LazyPackageTest):
+    PACKAGE = "ConsolidatedFlatData"
+    TYPES_PER_MODULE = 2
+
+
+if __name__ == "__main__":
+    unittest.main()
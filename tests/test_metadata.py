@@ -0,0 +1,230 @@
+"""MetadataParser against synthetic global-metadata.dat fixtures and the dump.cs of the same types."""
+
+import os
+import struct
+import tempfile
+import unittest
+
+from lib.compiler import CSParser
+from lib.metadata import METADATA_SANITY, UNRESOLVED_TYPE, MetadataParser, is_metadata
+
+PRIMITIVES = {
+    "Int32": ("int", 10),
+    "Int64": ("long", 11),
+    "UInt32": ("uint", 12),
+    "Single": ("float", 13),
+    "Boolean": ("bool", 14),
+}
+STRING, FLATBUFFER_OBJECT, BYTE_BUFFER = 15, 16, 17
+NULLABLE_OUTER, NULLABLE_INNER = 98, 99
+"""Type indices of Nullable<FlatData.OuterExcel> and Nullable<FlatData.Inner>, generic instances only the il2cpp binary defines."""
+
+DUMP_CS = """namespace FlatData
+{
+	public enum Nation // TypeDefIndex: 100
+	{
+		public int value__; // 0x00
+		None = 0,
+		JP = 1,
+		Neg = -1,
+	}
+
+	public struct Inner : IFlatbufferObject // TypeDefIndex: 200
+	{
+		private Table __p; // 0x10
+		public ByteBuffer ByteBuffer { get; }
+		public int A { get; }
+		public string S { get; }
+	}
+
+	public struct OuterExcel : IFlatbufferObject // TypeDefIndex: 201
+	{
+		private Table __p; // 0x10
+		public ByteBuffer ByteBuffer { get; }
+		public long Id { get; }
+		public FlatData.Nation Where { get; }
+		public FlatData.Inner? Single { get; }
+		public int InnerListLength { get; }
+		public int RateLength { get; }
+		public float Scale { get; }
+		public bool Ok { get; }
+		public FlatData.Inner? InnerList(int j) => default;
+		public float Rate(int j) => default;
+	}
+
+	public struct OuterExcelTable : IFlatbufferObject // TypeDefIndex: 202
+	{
+		private Table __p; // 0x10
+		public ByteBuffer ByteBuffer { get; }
+		public int DataListLength { get; }
+		public FlatData.OuterExcel? DataList(int j) => default;
+	}
+}
+"""
+
+
+class MetadataWriter:
+    """Lay out the sections of a global-metadata.dat the parser reads."""
+
+    def __init__(self, version: int) -> None:
+        self.version = version
+        self.strings = bytearray()
+        self.data = bytearray()
+        self.types: list[bytes] = []
+        self.methods: list[bytes] = []
+        self.properties: list[bytes] = []
+        self.fields: list[bytes] = []
+        self.defaults: list[bytes] = []
+        self.parameters: list[bytes] = []
+        self.interfaces: list[int] = []
+
+    def string(self, text: str) -> int:
+        index = len(self.strings)
+        self.strings += text.encode() + b"\0"
+        return index
+
+    def constant(self, value: int) -> bytes:
+        if self.version < 29:
+            return struct.pack("<i", value)
+        # Compressed, zigzag encoded int32.
+        value = (-value - 1) << 1 | 1 if value < 0 else value << 1
+        if value < 0x80:
+            return bytes([value])
+        if value < 0x4000:
+            return bytes([0x80 | value >> 8, value & 0xFF])
+        return b"\xf0" + value.to_bytes(4, "little")
+
+    def type(self, namespace: str, name: str, byval: int, bitfield: int, declaring: int = -1,
+             interfaces: tuple = (), fields: tuple = (0, 0), methods: tuple = (0, 0), properties: tuple = (0, 0)) -> None:
+        interface_start = len(self.interfaces)
+        self.interfaces.extend(interfaces)
+        self.types.append(struct.pack(
+            "<7iI8i8H2I", self.string(name), self.string(namespace), byval, declaring, -1, -1, -1, 0,
+            fields[0], methods[0], 0, properties[0], 0, interface_start, 0, 0,
+            methods[1], properties[1], fields[1], 0, 0, 0, len(interfaces), 0, bitfield, 0,
+        ))
+
+    def enum(self, name: str, byval: int, members: list[tuple[str, int]]) -> None:
+        start = len(self.fields)
+        self.fields.append(struct.pack("<2iI", self.string("value__"), PRIMITIVES["Int32"][1], 0))
+        for member, value in members:
+            self.defaults.append(struct.pack("<3i", len(self.fields), PRIMITIVES["Int32"][1], len(self.data)))
+            self.data += self.constant(value)
+            self.fields.append(struct.pack("<2iI", self.string(member), byval, 0))
+        self.type("FlatData", name, byval, 0x3, fields=(start, len(self.fields) - start))
+
+    def method(self, name: str, return_type: int, parameters: tuple = ()) -> None:
+        start = len(self.parameters)
+        for parameter in parameters:
+            self.parameters.append(struct.pack("<iIi", self.string(parameter), 0, PRIMITIVES["Int32"][1]))
+        if self.version >= 31:
+            self.methods.append(struct.pack("<3iI2iI4H", self.string(name), 0, return_type, 0, start, -1, 0, 0, 0, 0, len(parameters)))
+        else:
+            self.methods.append(struct.pack("<5iI4H", self.string(name), 0, return_type, start, -1, 0, 0, 0, 0, len(parameters)))
+
+    def struct(self, namespace: str, name: str, byval: int, properties: list[tuple[str, int]], lists: list[tuple[str, int]] = ()) -> None:
+        method_start, property_start = len(self.methods), len(self.properties)
+        for prop, prop_type in [("ByteBuffer", BYTE_BUFFER)] + properties:
+            self.properties.append(struct.pack("<3i2I", self.string(prop), len(self.methods) - method_start, -1, 0, 0))
+            self.method(f"get_{prop}", prop_type)
+        self.method(f"GetRootAs{name}", byval, ("_bb",))
+        for item, item_type in lists:
+            self.method(item, item_type, ("j",))
+        self.type(
+            namespace, name, byval, 0x1, interfaces=(FLATBUFFER_OBJECT,),
+            methods=(method_start, len(self.methods) - method_start),
+            properties=(property_start, len(self.properties) - property_start),
+        )
+
+    def write(self, path: str) -> None:
+        sections = [b""] * 20
+        sections[2] = bytes(self.strings)
+        sections[4] = b"".join(self.properties)
+        sections[5] = b"".join(self.methods)
+        sections[7] = b"".join(self.defaults)
+        sections[8] = bytes(self.data)
+        sections[10] = b"".join(self.parameters)
+        sections[11] = b"".join(self.fields)
+        sections[16] = struct.pack(f"<{len(self.interfaces)}i", *self.interfaces)
+        sections[19] = b"".join(self.types)
+        offset, header = 8 + 8 * len(sections), []
+        for section in sections:
+            header += [offset, len(section)]
+            offset += len(section)
+        with open(path, "wb") as file:
+            file.write(struct.pack("<Ii40i", METADATA_SANITY, self.version, *header))
+            file.write(b"".join(sections))
+
+
+def write_fixture(path: str, version: int) -> None:
+    """Write the types of DUMP_CS as the metadata describes them."""
+    writer = MetadataWriter(version)
+    for name, (_, index) in PRIMITIVES.items():
+        writer.type("System", name, index, 0x1)
+    writer.type("System", "String", STRING, 0)
+    writer.type("FlatBuffers", "IFlatbufferObject", FLATBUFFER_OBJECT, 0)
+    writer.type("FlatBuffers", "ByteBuffer", BYTE_BUFFER, 0)
+    # Implements IFlatbufferObject outside of FlatData, so it is skipped.
+    writer.struct("System", "NotFlat", 50, [("Junk", PRIMITIVES["Int32"][1])])
+
+    int_type, float_type = PRIMITIVES["Int32"][1], PRIMITIVES["Single"][1]
+    writer.enum("Nation", 30, [("None", 0), ("JP", 1), ("Neg", -1)])
+    writer.struct("FlatData", "Inner", 40, [("A", int_type), ("S", STRING)])
+    writer.struct(
+        "FlatData", "OuterExcel", 41,
+        [("Id", PRIMITIVES["Int64"][1]), ("Where", 30), ("Single", NULLABLE_INNER), ("InnerListLength", int_type),
+         ("RateLength", int_type), ("Scale", float_type), ("Ok", PRIMITIVES["Boolean"][1])],
+        [("InnerList", NULLABLE_INNER), ("Rate", float_type)],
+    )
+    writer.struct("FlatData", "OuterExcelTable", 42, [("DataListLength", int_type)], [("DataList", NULLABLE_OUTER)])
+    # A type nested in another one, which a dump names Outer.Inner and skips.
+    start = len(writer.fields)
+    writer.fields.append(struct.pack("<2iI", writer.string("value__"), int_type, 0))
+    writer.type("FlatData", "Hidden", 60, 0x3, declaring=41, fields=(start, 1))
+    writer.write(path)
+
+
+class MetadataParserTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()
+        dump_path = os.path.join(self.folder.name, "dump.cs")
+        with open(dump_path, "w", encoding="utf8") as file:
+            file.write(DUMP_CS)
+        dump = CSParser(dump_path)
+        self.dump_enums, self.dump_structs = dump.parse_enum(), dump.parse_struct()
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+    def parse(self, version: int) -> MetadataParser:
+        path = os.path.join(self.folder.name, f"global-metadata-{version}.dat")
+        write_fixture(path, version)
+        self.assertTrue(is_metadata(path))
+        return MetadataParser(path)
+
+    def test_same_types_as_dump(self) -> None:
+        for version in (27, 29, 31):
+            with self.subTest(version=version):
+                parser = self.parse(version)
+                self.assertEqual(parser.parse_enum(), self.dump_enums)
+                self.assertEqual(
+                    [struct.name for struct in parser.parse_struct()],
+                    [struct.name for struct in self.dump_structs],
+                )
+
+    def test_nested_tables_are_unresolved(self) -> None:
+        """Nested table fields keep their place and name, but only a dump.cs knows their type."""
+        parser = self.parse(29)
+        self.assertEqual(parser.unresolved, ["OuterExcel.Single", "OuterExcel.InnerList"])
+        for struct, dump_struct in zip(parser.parse_struct(), self.dump_structs):
+            for prop, dump_prop in zip(struct.properties, dump_struct.properties, strict=True):
+                self.assertEqual((prop.name, prop.is_list), (dump_prop.name, dump_prop.is_list))
+                if f"{struct.name}.{prop.name}" in parser.unresolved:
+                    self.assertEqual(prop.data_type, UNRESOLVED_TYPE)
+                    self.assertEqual(dump_prop.data_type, "Inner")
+                else:
+                    self.assertEqual(prop.data_type, dump_prop.data_type)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""SchemaCodec JSON text against json.dumps of the generated plain dumpers."""
+
+import contextlib
+import importlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+import flatbuffers
+
+from extractor import compile_python
+from lib.schema import SCHEMA_FILE, SchemaCodec
+
+PACKAGE = "SchemaParity"
+
+DUMP_CS = """namespace FlatData
+{
+	public enum ParcelType // TypeDefIndex: 100
+	{
+		public int value__; // 0x00
+		None = 0,
+		Item = 1,
+	}
+
+	public struct RewardExcel : IFlatbufferObject // TypeDefIndex: 200
+	{
+		private Table __p; // 0x10
+		public ByteBuffer ByteBuffer { get; }
+		public long Id { get; }
+		public FlatData.ParcelType RewardType { get; }
+		public int RateLength { get; }
+		public float Scale { get; }
+		public double Ratio { get; }
+		public bool IsOpen { get; }
+		public string Name { get; }
+		public float Rate(int j) => default;
+	}
+
+	public struct RewardExcelTable : IFlatbufferObject // TypeDefIndex: 201
+	{
+		private Table __p; // 0x10
+		public ByteBuffer ByteBuffer { get; }
+		public int DataListLength { get; }
+		public FlatData.RewardExcel? DataList(int j) => default;
+	}
+}
+"""
+
+ROWS = [
+    {"Id": 1, "RewardType": "Item", "Rate": [0.5, -2.25], "Scale": 1.5, "Ratio": -0.125, "IsOpen": True, "Name": "名前"},
+    # Packing skips zeros, so these floats are absent and read as the int 0.
+    {"Id": 2, "RewardType": "None_", "Rate": [], "Scale": 0.0, "Ratio": 0.0, "IsOpen": False, "Name": ""},
+    {"Id": 3, "RewardType": "Item", "Name": "\"quoted\"\n"},
+    {"RewardType": "None_"},
+]
+
+
+class WriteRowsJsonTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.folder = tempfile.TemporaryDirectory()
+        dump_path = os.path.join(cls.folder.name, "dump.cs")
+        with open(dump_path, "w", encoding="utf8") as file:
+            file.write(DUMP_CS)
+        with contextlib.redirect_stdout(io.StringIO()):
+            compile_python(dump_path, os.path.join(cls.folder.name, PACKAGE))
+        sys.path.insert(0, cls.folder.name)
+        cls.flat_data = importlib.import_module(f"{PACKAGE}.FlatData")
+        cls.dump_wrapper = importlib.import_module(f"{PACKAGE}.FlatData.dump_wrapper")
+        cls.repack_wrapper = importlib.import_module(f"{PACKAGE}.FlatData.repack_wrapper")
+        cls.codec = SchemaCodec.from_file(os.path.join(cls.folder.name, PACKAGE, "FlatData", SCHEMA_FILE))
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        sys.path.remove(cls.folder.name)
+        for name in [name for name in sys.modules if name.partition(".")[0] == PACKAGE]:
+            del sys.modules[name]
+        cls.folder.cleanup()
+
+    def pack(self, data: dict) -> bytes:
+        builder = flatbuffers.Builder(0)
+        builder.Finish(self.repack_wrapper.pack_RewardExcel_plain(builder, data))
+        return bytes(builder.Output())
+
+    def test_same_text_as_plain_dump(self) -> None:
+        rows = [self.pack(data) for data in ROWS]
+        expected = json.dumps(
+            [self.dump_wrapper.dump_RewardExcel_plain(self.flat_data.RewardExcel.GetRootAs(row, 0)) for row in rows],
+            indent=4,
+            ensure_ascii=False,
+        )
+        file = io.StringIO()
+        self.codec.write_rows_json("RewardExcel", rows, file)
+        self.assertEqual(file.getvalue(), expected)
+
+    def test_empty_rows(self) -> None:
+        file = io.StringIO()
+        self.codec.write_rows_json("RewardExcel", [], file)
+        self.assertEqual(file.getvalue(), json.dumps([], indent=4))
+
+
+if __name__ == "__main__":
+    unittest.main()
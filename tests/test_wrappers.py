@@ -0,0 +1,324 @@
+"""Generated dump and repack wrappers with and without direct decoders and packers, on the same tables."""
+
+import contextlib
+import importlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+import flatbuffers
+import numpy as np
+
+from extractor import compile_python
+from lib.encryption import convert_int, convert_long, create_key, encrypt_column, encrypt_double, encrypt_float, encrypt_string
+from lib.schema import SCHEMA_FILE, SchemaCodec
+
+PACKAGE, DIRECT_PACKAGE = "BuilderWrappers", "DirectWrappers"
+
+DUMP_CS = """namespace FlatData
+{
+	public enum Nation // TypeDefIndex: 100
+	{
+		public int value__; // 0x00
+		None = 0,
+		JP = 1,
+		Neg = -1,
+	}
+
+	public struct Inner : IFlatbufferObject // TypeDefIndex: 200
+	{
+		private Table __p; // 0x10
+		public ByteBuffer ByteBuffer { get; }
+		public int A { get; }
+		public string S { get; }
+	}
+
+	public struct OuterExcel : IFlatbufferObject // TypeDefIndex: 201
+	{
+		private Table __p; // 0x10
+		public ByteBuffer ByteBuffer { get; }
+		public long Id { get; }
+		public FlatData.Nation Where { get; }
+		public FlatData.Inner? Single { get; }
+		public string Name { get; }
+		public int InnerListLength { get; }
+		public int RateLength { get; }
+		public int WheresLength { get; }
+		public int TagsLength { get; }
+		public float Scale { get; }
+		public double Ratio { get; }
+		public bool Ok { get; }
+		public FlatData.Inner? InnerList(int j) => default;
+		public float Rate(int j) => default;
+		public FlatData.Nation Wheres(int j) => default;
+		public string Tags(int j) => default;
+	}
+
+	public struct OuterExcelTable : IFlatbufferObject // TypeDefIndex: 202
+	{
+		private Table __p; // 0x10
+		public ByteBuffer ByteBuffer { get; }
+		public int DataListLength { get; }
+		public FlatData.OuterExcel? DataList(int j) => default;
+	}
+
+	public struct RewardExcel : IFlatbufferObject // TypeDefIndex: 203
+	{
+		private Table __p; // 0x10
+		public ByteBuffer ByteBuffer { get; }
+		public long Id { get; }
+		public FlatData.Nation Where { get; }
+		public string Name { get; }
+		public int RateLength { get; }
+		public int WheresLength { get; }
+		public int TagsLength { get; }
+		public float Scale { get; }
+		public double Ratio { get; }
+		public bool Ok { get; }
+		public float Rate(int j) => default;
+		public FlatData.Nation Wheres(int j) => default;
+		public string Tags(int j) => default;
+	}
+
+	public struct RewardExcelTable : IFlatbufferObject // TypeDefIndex: 204
+	{
+		private Table __p; // 0x10
+		public ByteBuffer ByteBuffer { get; }
+		public int DataListLength { get; }
+		public FlatData.RewardExcel? DataList(int j) => default;
+	}
+
+	public struct Small : IFlatbufferObject // TypeDefIndex: 205
+	{
+		private Table __p; // 0x10
+		public ByteBuffer ByteBuffer { get; }
+		public sbyte Value { get; }
+		public int ValuesLength { get; }
+		public sbyte Values(int j) => default;
+	}
+}
+"""
+
+NATION = {"None_": 0, "JP": 1, "Neg": -1}
+
+ROWS = [
+    {
+        "Id": 1,
+        "Where": "JP",
+        "Single": {"A": 3, "S": "内"},
+        "Name": "名前",
+        "InnerList": [{"A": 1, "S": "a"}, {"A": -2, "S": ""}],
+        "Rate": [0.5, -2.25],
+        "Wheres": ["JP", "Neg"],
+        "Tags": ["x", "ｙ"],
+        "Scale": 1.5,
+        "Ratio": -0.125,
+        "Ok": True,
+    },
+    # Absent strings and scalars, and empty vectors.
+    {"Id": 2, "Where": "Neg", "Single": {}, "InnerList": [], "Rate": [], "Wheres": [], "Tags": []},
+]
+
+PLAIN_ROWS = ROWS + [
+    # Every field but the nested table absent, which only an unencrypted table reads as defaults.
+    {"Single": {"A": -1}},
+]
+
+REWARD_ROWS = [
+    {
+        "Id": 1,
+        "Where": "JP",
+        "Name": "名前",
+        "Rate": [0.5, -2.25],
+        "Wheres": ["JP", "Neg"],
+        "Tags": ["x", "ｙ"],
+        "Scale": 1.5,
+        "Ratio": -0.125,
+        "Ok": True,
+    },
+    {"Id": 2, "Where": "Neg", "Name": "", "Rate": [], "Wheres": [], "Tags": [], "Scale": 0.0, "Ok": False},
+    {"Where": "None_"},
+]
+
+
+def build_inner(fd, builder: flatbuffers.Builder, data: dict, password: bytes | None) -> int:
+    s = builder.CreateString(encrypt_string(data["S"], password) if password else data["S"]) if "S" in data else 0
+    fd.Inner.Start(builder)
+    if "A" in data:
+        fd.Inner.AddA(builder, convert_int(data["A"], password) if password else data["A"])
+    if s:
+        fd.Inner.AddS(builder, s)
+    return fd.Inner.End(builder)
+
+
+def build_outer(fd, builder: flatbuffers.Builder, data: dict, password: bytes | None) -> int:
+    """Lay out a record by hand, leaving out the fields data does not have."""
+    offsets = {}
+    if "Name" in data:
+        offsets["Name"] = builder.CreateString(encrypt_string(data["Name"], password) if password else data["Name"])
+    if "Single" in data:
+        offsets["Single"] = build_inner(fd, builder, data["Single"], password)
+    if "InnerList" in data:
+        items = [build_inner(fd, builder, item, password) for item in data["InnerList"]]
+        fd.OuterExcel.StartInnerListVector(builder, len(items))
+        for item in reversed(items):
+            builder.PrependUOffsetTRelative(item)
+        offsets["InnerList"] = builder.EndVector()
+    if "Tags" in data:
+        items = [builder.CreateString(encrypt_string(item, password) if password else item) for item in data["Tags"]]
+        fd.OuterExcel.StartTagsVector(builder, len(items))
+        for item in reversed(items):
+            builder.PrependUOffsetTRelative(item)
+        offsets["Tags"] = builder.EndVector()
+    if "Rate" in data:
+        rate = encrypt_column(data["Rate"], password, "float") if password else data["Rate"]
+        offsets["Rate"] = builder.CreateNumpyVector(np.array(rate, dtype="<f"))
+    if "Wheres" in data:
+        wheres = [NATION[item] for item in data["Wheres"]]
+        wheres = encrypt_column(wheres, password, "int") if password else wheres
+        offsets["Wheres"] = builder.CreateNumpyVector(np.array(wheres, dtype="<i"))
+
+    fd.OuterExcel.Start(builder)
+    if "Id" in data:
+        fd.OuterExcel.AddId(builder, convert_long(data["Id"], password) if password else data["Id"])
+    if "Where" in data:
+        where = NATION[data["Where"]]
+        fd.OuterExcel.AddWhere(builder, convert_int(where, password) if password else where)
+    for name, offset in offsets.items():
+        getattr(fd.OuterExcel, f"Add{name}")(builder, offset)
+    if "Scale" in data:
+        fd.OuterExcel.AddScale(builder, encrypt_float(data["Scale"], password) if password else data["Scale"])
+    if "Ratio" in data:
+        fd.OuterExcel.AddRatio(builder, encrypt_double(data["Ratio"], password) if password else data["Ratio"])
+    if "Ok" in data:
+        fd.OuterExcel.AddOk(builder, data["Ok"])
+    return fd.OuterExcel.End(builder)
+
+
+def setUpModule() -> None:
+    global folder
+    folder = tempfile.TemporaryDirectory()
+    dump_path = os.path.join(folder.name, "dump.cs")
+    with open(dump_path, "w", encoding="utf8") as file:
+        file.write(DUMP_CS)
+    with contextlib.redirect_stdout(io.StringIO()):
+        compile_python(dump_path, os.path.join(folder.name, PACKAGE))
+        compile_python(dump_path, os.path.join(folder.name, DIRECT_PACKAGE), DIRECT_DECODERS=True, DIRECT_PACKERS=True)
+    sys.path.insert(0, folder.name)
+
+
+def tearDownModule() -> None:
+    sys.path.remove(folder.name)
+    for name in [name for name in sys.modules if name.partition(".")[0] in (PACKAGE, DIRECT_PACKAGE)]:
+        del sys.modules[name]
+    folder.cleanup()
+
+
+class DirectDecoderTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.flat_data = importlib.import_module(f"{PACKAGE}.FlatData")
+        cls.dump_wrapper = importlib.import_module(f"{PACKAGE}.FlatData.dump_wrapper")
+        cls.direct_dump_wrapper = importlib.import_module(f"{DIRECT_PACKAGE}.FlatData.dump_wrapper")
+        cls.password = create_key("Outer")
+
+    def record(self, data: dict, password: bytes | None):
+        builder = flatbuffers.Builder(0)
+        builder.Finish(build_outer(self.flat_data, builder, data, password))
+        return self.flat_data.OuterExcel.GetRootAs(bytes(builder.Output()))
+
+    def table(self, rows: list, password: bytes | None):
+        builder = flatbuffers.Builder(0)
+        records = [build_outer(self.flat_data, builder, data, password) for data in rows]
+        self.flat_data.OuterExcelTable.StartDataListVector(builder, len(records))
+        for record in reversed(records):
+            builder.PrependUOffsetTRelative(record)
+        data_list = builder.EndVector()
+        self.flat_data.OuterExcelTable.Start(builder)
+        self.flat_data.OuterExcelTable.AddDataList(builder, data_list)
+        builder.Finish(self.flat_data.OuterExcelTable.End(builder))
+        return self.flat_data.OuterExcelTable.GetRootAs(bytes(builder.Output()))
+
+    def test_plain_records(self) -> None:
+        self.assertEqual(self.dump_wrapper.dump_OuterExcel_plain(self.record(ROWS[0], None)), ROWS[0])
+        for data in PLAIN_ROWS:
+            with self.subTest(data=data):
+                record = self.record(data, None)
+                self.assertEqual(
+                    self.direct_dump_wrapper.dump_OuterExcel_plain(record),
+                    self.dump_wrapper.dump_OuterExcel_plain(record),
+                )
+
+    def test_encrypted_records(self) -> None:
+        for data in ROWS:
+            with self.subTest(data=data):
+                record = self.record(data, self.password)
+                self.assertEqual(
+                    self.direct_dump_wrapper.dump_OuterExcel(record, self.password),
+                    self.dump_wrapper.dump_OuterExcel(record, self.password),
+                )
+
+    def test_tables(self) -> None:
+        plain = self.table(PLAIN_ROWS, None)
+        self.assertEqual(
+            self.direct_dump_wrapper.dump_OuterExcelTable_plain(plain),
+            self.dump_wrapper.dump_OuterExcelTable_plain(plain),
+        )
+        encrypted = self.table(ROWS, self.password)
+        self.assertEqual(
+            self.direct_dump_wrapper.dump_table(encrypted),
+            self.dump_wrapper.dump_table(encrypted),
+        )
+        empty = self.table([], self.password)
+        self.assertEqual(self.direct_dump_wrapper.dump_table(empty), self.dump_wrapper.dump_table(empty))
+
+
+class DirectPackerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.flat_data = importlib.import_module(f"{PACKAGE}.FlatData")
+        cls.repack_wrapper = importlib.import_module(f"{PACKAGE}.FlatData.repack_wrapper")
+        cls.direct_repack_wrapper = importlib.import_module(f"{DIRECT_PACKAGE}.FlatData.repack_wrapper")
+        cls.codec = SchemaCodec.from_file(os.path.join(folder.name, DIRECT_PACKAGE, "FlatData", SCHEMA_FILE))
+
+    def assertSameOutput(self, pack_name: str, *args) -> bytes:
+        """Pack with both wrappers, and check they give the same bytes."""
+        outputs = []
+        for wrapper in (self.repack_wrapper, self.direct_repack_wrapper):
+            builder = flatbuffers.Builder(0)
+            builder.Finish(getattr(wrapper, pack_name)(builder, *args))
+            outputs.append(bytes(builder.Output()))
+        self.assertEqual(outputs[1], outputs[0])
+        return outputs[0]
+
+    def test_records(self) -> None:
+        for data in REWARD_ROWS:
+            with self.subTest(data=data):
+                self.assertSameOutput("pack_RewardExcel", data)
+                self.assertSameOutput("pack_RewardExcel_plain", data)
+
+    def test_tables(self) -> None:
+        for rows in (REWARD_ROWS, REWARD_ROWS[:1], []):
+            with self.subTest(rows=rows):
+                self.assertSameOutput("pack_RewardExcelTable", rows)
+                self.assertSameOutput("pack_RewardExcelTable_plain", rows)
+
+    def test_schema_codec(self) -> None:
+        for struct_name, data in [("RewardExcel", REWARD_ROWS[0]), ("RewardExcelTable", REWARD_ROWS)]:
+            with self.subTest(struct_name=struct_name):
+                output = self.assertSameOutput(f"pack_{struct_name}", data)
+                builder = flatbuffers.Builder(0)
+                builder.Finish(self.codec.pack(builder, struct_name, data))
+                self.assertEqual(bytes(builder.Output()), output)
+
+    def test_sbyte_fields(self) -> None:
+        output = self.assertSameOutput("pack_Small_plain", {"Value": -3, "Values": [1, -2, 127, -128]})
+        small = self.flat_data.Small.GetRootAs(output)
+        self.assertEqual(small.Value(), -3)
+        self.assertEqual(small.ValuesAsNumpy().tolist(), [1, -2, 127, -128])
+
+
+if __name__ == "__main__":
+    unittest.main()
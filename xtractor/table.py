@@ -3,18 +3,23 @@ import json
 import os
 from os import path
 from types import ModuleType
-from typing import Any
+from typing import Any, Container
 from zipfile import ZipFile
 
 from lib.console import notice, print
-from lib.encryption import xor_with_key, zip_password
-from lib.structure import DBTable, SQLiteDataType
+from lib.encryption import KEY_STORE_FILE, load_key_store, preload_struct_keys, xor_with_key_into, zip_password
+from lib.schema import SCHEMA_FILE, SchemaCodec
+from lib.structure import DBTable, FlatDataTypes, SQLiteDataType, record_to_json
 from utils.database import TableDatabase
 from utils.config import Config
 
 class TableExtractor:
     def __init__(
-        self, table_file_folder: str, extract_folder: str, flat_data_module_name: str
+        self,
+        table_file_folder: str,
+        extract_folder: str,
+        flat_data_module_name: str,
+        stream_json: bool = False,
     ) -> None:
         """Extract files in table folder.
 
@@ -22,13 +27,18 @@ class TableExtractor:
             table_file_folder (str): Folder own table files.
             extract_folder (str): Folder to store the extracted data.
             flat_data_module_name (str): Name path to import flat data module. Most like "Extracted.FlatData".
+            stream_json (bool, optional): Write DataList tables and database tables straight to JSON
+                text from the schema of the FlatData package, without building their dicts. The JSON
+                is the same. Defaults to False.
         """
         self.table_file_folder = table_file_folder
         self.extract_folder = extract_folder
         self.flat_data_module_name = flat_data_module_name
+        self.stream_json = stream_json
 
-        self.lower_fb_name_modules: dict[str, type] = {}
+        self.lower_fb_name_modules: FlatDataTypes
         self.dump_wrapper_lib: ModuleType
+        self.json_codec: SchemaCodec | None = None
 
         self.__import_modules()
 
@@ -38,10 +48,12 @@ class TableExtractor:
             self.dump_wrapper_lib = importlib.import_module(
                 f"{self.flat_data_module_name}.dump_wrapper"
             )
-            self.lower_fb_name_modules = {
-            t_name.lower(): t_class
-            for t_name, t_class in flat_data_lib.__dict__.items()
-            }
+            self.lower_fb_name_modules = FlatDataTypes(flat_data_lib)
+            if not load_key_store(path.join(path.dirname(flat_data_lib.__file__), KEY_STORE_FILE)):
+                preload_struct_keys(self.lower_fb_name_modules.structs)
+            schema_path = path.join(path.dirname(flat_data_lib.__file__), SCHEMA_FILE)
+            if self.stream_json and path.isfile(schema_path):
+                self.json_codec = SchemaCodec.from_file(schema_path)
         except Exception as e:
             notice(
                 f"Cannot import FlatData module. Make sure FlatData is available in Extracted folder. {e}",
@@ -72,7 +84,8 @@ class TableExtractor:
             if flatbuffer_class.__name__.endswith("Table"):
                 try:
                     if not file_name.endswith(".bytes") or not Config.is_cn: # CN does not encrypt its Excel.zip (but does encrypt tables in sqlite3 databases such as ExcelDB.db)
-                        data = xor_with_key(flatbuffer_class.__name__, data)
+                        data = bytearray(data)
+                        xor_with_key_into(flatbuffer_class.__name__, data)
                     flat_buffer = getattr(flatbuffer_class, "GetRootAs")(data)
                     obj = getattr(self.dump_wrapper_lib, "dump_table")(flat_buffer)
                 except:
@@ -80,8 +93,10 @@ class TableExtractor:
 
             if not obj:
                 flat_buffer = getattr(flatbuffer_class, "GetRootAs")(data)
-                obj = getattr(
-                    self.dump_wrapper_lib, f"dump_{flatbuffer_class.__name__}"
+                # Dumped without password, so by the plain variant when the wrapper has one.
+                obj = (
+                    getattr(self.dump_wrapper_lib, f"dump_{flatbuffer_class.__name__}_plain", None)
+                    or getattr(self.dump_wrapper_lib, f"dump_{flatbuffer_class.__name__}")
                 )(flat_buffer)
             return (obj, f"{flatbuffer_class.__name__}.json")
         except:
@@ -89,6 +104,32 @@ class TableExtractor:
             #     return json.loads(json_data), f"{file_name}.json"
             return {}, ""
 
+    def _process_bytes_file_json(self, file_name: str, data: bytes) -> tuple[bytes, str]:
+        """Extract a DataList table file straight to the JSON text of its dumped records.
+
+        Args:
+            file_name (str): Schema name of data.
+            data (bytes): Flatbuffer data to extract.
+
+        Returns:
+            tuple[bytes, str]: JSON data and file name. Both are empty if the file is not a
+            DataList table the schema can dump, to extract it through dicts instead.
+        """
+        table_name = self.lower_fb_name_modules.names.get(file_name.removesuffix(".bytes").lower(), "")
+        if not (self.json_codec and table_name.endswith("Table")):
+            return bytes(), ""
+        try:
+            if not file_name.endswith(".bytes") or not Config.is_cn: # CN does not encrypt its Excel.zip (but does encrypt tables in sqlite3 databases such as ExcelDB.db)
+                data = bytearray(data)
+                xor_with_key_into(table_name, data)
+            json_data = self.json_codec.dump_table_json(table_name, data)
+        except Exception:
+            return bytes(), ""
+        # An empty DataList is extracted as its table by the dict path.
+        if json_data == b"[]":
+            return bytes(), ""
+        return json_data, f"{table_name}.json"
+
     def _process_json_file(self, data: bytes) -> bytes:
         """Extract json file in zip.
 
@@ -105,12 +146,13 @@ class TableExtractor:
         except:
             return bytes()
 
-    def _process_db_file(self, file_path: str, table_name: str = "") -> list[DBTable]:
+    def _process_db_file(self, file_path: str, table_name: str = "", skip_tables: Container[str] = ()) -> list[DBTable]:
         """Extract sqlite database file.
 
         Args:
             file_path (str): Database path.
             table_name (str): Specify table to extract.
+            skip_tables (Container[str], optional): Tables not to extract. Defaults to none.
 
         Returns:
             list[DBTable]: A list of DBTables.
@@ -119,6 +161,7 @@ class TableExtractor:
             tables = []
 
             table_list = [table_name] if table_name else db.get_table_list()
+            table_list = [table for table in table_list if table not in skip_tables]
 
             for table in table_list:
                 columns = db.get_table_column_structure(table)
@@ -142,6 +185,47 @@ class TableExtractor:
                 tables.append(DBTable(table, columns, table_data))
             return tables
 
+    def _stream_db_file(self, file_path: str, extract_folder: str) -> set[str]:
+        """Write the tables of a sqlite database holding FlatBuffer rows straight to JSON text.
+
+        Args:
+            file_path (str): Database path.
+            extract_folder (str): Folder to store the JSON files.
+
+        Returns:
+            set[str]: Tables written. The others are left to _process_db_file.
+        """
+        streamed: set[str] = set()
+        with TableDatabase(file_path) as db:
+            for table in db.get_table_list():
+                struct_name = self.lower_fb_name_modules.names.get(
+                    table.replace("DBSchema", "Excel").lower(), ""
+                )
+                if not struct_name or struct_name.endswith("Table") or not any(
+                    col.name == "Bytes" and col.data_type == "BLOB"
+                    for col in db.get_table_column_structure(table)
+                ):
+                    continue
+                column_names, rows = db.get_table_data(table)
+                index = column_names.index("Bytes")
+                blobs = [row[index] for row in rows]
+                if not all(isinstance(blob, bytes) for blob in blobs):
+                    continue
+
+                os.makedirs(extract_folder, exist_ok=True)
+                with open(
+                    path.join(extract_folder, f"{table.replace('DBSchema', 'Excel')}.json"),
+                    "wt",
+                    encoding="utf8",
+                ) as f:
+                    try:
+                        self.json_codec.write_rows_json(struct_name, blobs, f)
+                    except Exception:
+                        # Rewritten through dicts, which also dump rows that cannot be decoded.
+                        continue
+                streamed.add(table)
+        return streamed
+
     def _process_zip_file(
         self,
         file_name: str,
@@ -155,11 +239,14 @@ class TableExtractor:
             return data, "", True
 
         if detect_type or file_name.endswith(".bytes"):
+            json_data, json_name = self._process_bytes_file_json(file_name, file_data)
+            if json_name:
+                return json_data, json_name, True
             b_data = self._process_bytes_file(file_name, file_data)
             file_dict, file_name = b_data
             if file_name:
                 return (
-                    json.dumps(file_dict, indent=4, ensure_ascii=False).encode("utf8"),
+                    json.dumps(file_dict, indent=4, ensure_ascii=False, default=record_to_json).encode("utf8"),
                     file_name,
                     True,
                 )
@@ -168,12 +255,11 @@ class TableExtractor:
     def extract_db_file(self, file_path: str) -> bool:
         """Extract db file."""
         try:
-            if db_tables := self._process_db_file(
-                path.join(self.table_file_folder, file_path)
-            ):
-                db_name = file_path.removesuffix(".db")
+            db_path = path.join(self.table_file_folder, file_path)
+            db_extract_folder = path.join(self.extract_folder, file_path.removesuffix(".db"))
+            streamed = self._stream_db_file(db_path, db_extract_folder) if self.json_codec else set()
+            if (db_tables := self._process_db_file(db_path, skip_tables=streamed)) or streamed:
                 for table in db_tables:
-                    db_extract_folder = path.join(self.extract_folder, db_name)
                     os.makedirs(db_extract_folder, exist_ok=True)
                     with open(
                         path.join(db_extract_folder, f"{table.name.replace('DBSchema', 'Excel')}.json"),
@@ -185,6 +271,7 @@ class TableExtractor:
                             f,
                             indent=4,
                             ensure_ascii=False,
+                            default=record_to_json,
                         )
                 return True
             return False